@@ -0,0 +1,51 @@
+"""
+Benchmark: rank 50k synthetic candidates for one job with the skill-bitset
+ranker (in memory; the Mongo sync is not measured).
+
+Run from the backend folder:
+    python -m benchmarks.bench_candidate_ranker [candidates] [k]
+"""
+import random
+import sys
+import time
+
+from services.candidate_ranker import CandidateRanker, JobIndex
+from services.skill_matcher import get_matcher
+
+
+def main(n: int = 50_000, k: int = 50, rounds: int = 20):
+    rng = random.Random(3)
+    skills = get_matcher().skills + [f"custom skill {i}" for i in range(300)]
+    ranker = CandidateRanker()
+    index = ranker.jobs["bench"] = JobIndex()
+
+    start = time.perf_counter()
+    for i in range(n):
+        index.upsert(f"cand{i}", ranker.vocab.encode(rng.sample(skills, rng.randint(3, 25))))
+    build_s = time.perf_counter() - start
+
+    job_bits = ranker.vocab.encode(rng.sample(skills, 8))
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        top = ranker.score(index, job_bits, k)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    # naive baseline: set intersection per candidate
+    sets = [set(ranker.vocab.decode(b)) for b in index.bits]
+    wanted = set(ranker.vocab.decode(job_bits))
+    start = time.perf_counter()
+    sorted(range(n), key=lambda i: len(sets[i] & wanted), reverse=True)[:k]
+    naive_s = time.perf_counter() - start
+
+    print(f"candidates: {n:,}  vocabulary: {len(ranker.vocab.names)} skills  k={k}")
+    print(f"index build:        {build_s * 1000:8.1f} ms ({n / build_s:,.0f} candidates/s)")
+    print(f"rank (bitsets):     {timings[len(timings) // 2] * 1000:8.1f} ms median, {timings[-1] * 1000:.1f} ms max")
+    print(f"rank (set + sort):  {naive_s * 1000:8.1f} ms")
+    print(f"best match: {top[0][1]}/{job_bits.bit_count()} job skills")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000, int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,53 @@
+"""
+Benchmark: in-process candidate search over synthetic candidates.
+
+Run from the backend folder:
+    python -m benchmarks.bench_candidate_search [candidates]
+"""
+import random
+import sys
+import time
+
+from services.candidate_search import CandidateSearchIndex
+from services.skill_matcher import get_matcher
+
+FIRST = ["ayesha", "ali", "fatima", "hamza", "sara", "omar", "zainab", "bilal", "maryam", "usman", "hina", "ahmed"]
+LAST = ["khan", "malik", "sheikh", "qureshi", "butt", "raza", "chaudhry", "iqbal", "siddiqui", "farooq"]
+ROLES = ["Backend Engineer", "Data Scientist", "ML Engineer", "DevOps Engineer", "Product Designer"]
+QUERIES = ["ayesha", "ay", "khan py", "react", "data sci", "gmail", "devops kub", "zainab siddiqui", "c++"]
+
+
+def main(n: int = 50_000, rounds: int = 200):
+    rng = random.Random(5)
+    skills = get_matcher().skills
+    index = CandidateSearchIndex()
+
+    start = time.perf_counter()
+    for i in range(n):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        index.upsert(f"cand{i}", {
+            "full_name": f"{first.title()} {last.title()}",
+            "email": f"{first}.{last}{i}@{rng.choice(['gmail.com', 'lums.edu.pk', 'outlook.com'])}",
+            "skills": rng.sample(skills, rng.randint(3, 15)),
+            "domain": rng.choice(["Software Engineering", "Data Science / ML", "DevOps", "Design"]),
+            "job_role": rng.choice(ROLES),
+            "job_id": f"job{i % 40}",
+        })
+    build_s = time.perf_counter() - start
+    print(f"indexed {n:,} candidates in {build_s:.2f}s, {len(index.terms):,} terms")
+
+    for q in QUERIES:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            hits = index.search(q, 20)
+        per_query = (time.perf_counter() - start) / rounds
+        print(f"  {q!r:<18} {per_query * 1000:7.3f} ms  ({len(hits)} shown)")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        index.update(f"cand{rng.randrange(n)}", {"email": "changed@example.com"})
+    print(f"incremental update: {(time.perf_counter() - start) / rounds * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,78 @@
+"""
+Benchmark: Clerk account provisioning for a bulk resume upload, against a
+local fake of Clerk's Backend API (POST/PATCH /v1/users) that adds a fixed
+latency to every call. The real clerk_backend_api SDK talks to the fake.
+
+  inline  create_clerk_user per resume in a thread, 4 at a time (the old
+          provision_stage)
+  pool    claim a pre-created account from the pool; names are set in
+          the background
+
+The clerk_account_pool collection is replaced by an in-memory one; both
+fakes are in tests/fakes.py, and fallback, refill and concurrency checks
+against them live in tests/test_clerk_pool.py.
+
+Run from the backend folder:
+    python -m benchmarks.bench_clerk_pool [latency_ms] [resumes]
+"""
+import asyncio
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from clerk_backend_api import Clerk
+
+import utils
+from services.clerk_pool import ClerkAccountPool
+from tests.fakes import CLERK, FakeClerk, MemoryPool
+
+
+def pct(samples, p):
+    return sorted(samples)[max(int(len(samples) * p) - 1, 0)] * 1000
+
+
+async def main(latency_ms: float = 200, resumes: int = 50):
+    CLERK["latency"] = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeClerk)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    utils.clerk = Clerk(bearer_auth="fake", server_url=f"http://127.0.0.1:{server.server_port}/v1")
+    names = [f"Candidate Number{i}" for i in range(resumes)]
+    print(f"fake Clerk latency {latency_ms:.0f} ms per call, {resumes} resumes")
+
+    slots = asyncio.Semaphore(4)
+
+    async def inline(name):
+        async with slots:
+            start = time.perf_counter()
+            await asyncio.to_thread(utils.create_clerk_user, full_name=name)
+            return time.perf_counter() - start
+
+    start = time.perf_counter()
+    waits = await asyncio.gather(*(inline(n) for n in names))
+    total = time.perf_counter() - start
+    print(f"  inline  {total * 1000:8.1f} ms total  per resume p50 {pct(waits, 0.5):7.2f} ms  p99 {pct(waits, 0.99):7.2f} ms")
+
+    pool = ClerkAccountPool(MemoryPool(), low_water=resumes, target=resumes + 10)
+    start = time.perf_counter()
+    await pool.top_up()
+    print(f"  pool filled with {len(pool.collection.docs)} accounts in {time.perf_counter() - start:.2f}s (background)")
+
+    async def claimed(name):
+        start = time.perf_counter()
+        await pool.claim(name)
+        return time.perf_counter() - start
+
+    CLERK["created"] = CLERK["renamed"] = 0
+    start = time.perf_counter()
+    waits = await asyncio.gather(*(claimed(n) for n in names))
+    total = time.perf_counter() - start
+    print(f"  pool    {total * 1000:8.1f} ms total  per resume p50 {pct(waits, 0.5):7.2f} ms  p99 {pct(waits, 0.99):7.2f} ms")
+    await asyncio.gather(*pool.renames)
+    print(f"  renamed {CLERK['renamed']} accounts in the background")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(float(a) for a in sys.argv[1:2]), *(int(a) for a in sys.argv[2:3])))
@@ -0,0 +1,68 @@
+"""
+Benchmark: delivering invite emails through a local stub of SendGrid's
+v3 mail/send endpoint that adds a fixed latency to every call.
+
+  legacy  new SendGridAPIClient per email, one recipient per call, each
+          in a thread (the old send_email_background)
+  outbox  EmailOutbox draining the queue with one pooled client, up to
+          1000 recipients per call as personalizations
+
+The email_outbox collection is replaced by an in-memory one; both fakes are
+in tests/fakes.py, and retry and rejected-batch checks against them live in
+tests/test_email_outbox.py.
+
+Run from the backend folder:
+    python -m benchmarks.bench_email_outbox [latency_ms] [emails]
+"""
+import asyncio
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from sendgrid import SendGridAPIClient
+from sendgrid.helpers.mail import Mail
+
+from emailer import render
+from services.email_outbox import EmailOutbox, SendGridSender
+from tests.fakes import SENDGRID, MemoryOutbox, StubSendGrid, invite
+
+
+def legacy_send(host: str, to: str, subject: str, html: str):
+    """The old send_sync_email, pointed at the stub."""
+    message = Mail(from_email="hr@careerpilot.test", to_emails=to, subject=subject, html_content=html)
+    SendGridAPIClient("stub-key", host=host).send(message)
+
+
+async def main(latency_ms: float = 30, emails: int = 200):
+    SENDGRID["latency"] = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSendGrid)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{server.server_port}"
+    messages = [invite(i) for i in range(emails)]
+    print(f"stub latency {latency_ms:.0f} ms per call, {emails} invites")
+
+    SENDGRID["calls"] = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        asyncio.to_thread(legacy_send, host, m["to"], m["subject"], render(m["template"], m["context"]))
+        for m in messages
+    ))
+    legacy_s = time.perf_counter() - start
+    print(f"  legacy  {legacy_s * 1000:8.1f} ms  {SENDGRID['calls']:4d} calls  {emails / legacy_s:8.0f} emails/s")
+
+    outbox = EmailOutbox(MemoryOutbox(), SendGridSender(api_key="stub-key", host=host, from_email="hr@careerpilot.test"))
+    await outbox.enqueue_many([dict(m) for m in messages])
+    SENDGRID["calls"] = SENDGRID["recipients"] = 0
+    start = time.perf_counter()
+    while await outbox.drain_once():
+        pass
+    outbox_s = time.perf_counter() - start
+    print(f"  outbox  {outbox_s * 1000:8.1f} ms  {SENDGRID['calls']:4d} calls  {emails / outbox_s:8.0f} emails/s "
+          f"({legacy_s / outbox_s:.0f}x)")
+    await outbox.sender.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(float(a) for a in sys.argv[1:2]), *(int(a) for a in sys.argv[2:3])))
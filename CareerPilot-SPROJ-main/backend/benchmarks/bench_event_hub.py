@@ -0,0 +1,77 @@
+"""
+Benchmark: activity fan-out through the in-process event hub, fed by an
+in-memory event source instead of Mongo writes / change streams. Reports
+publish throughput and delivery latency. Ordering, job filtering and SSE
+framing are checked in tests/test_event_hub.py.
+
+Run from the backend folder:
+    python -m benchmarks.bench_event_hub [events] [subscribers]
+"""
+import asyncio
+import sys
+import time
+
+from bson import ObjectId
+
+from services.event_hub import EventHub
+
+JOBS = [f"job{i}" for i in range(8)]
+BURST = 64  # events published back-to-back before the loop gets to run readers
+
+
+def fake_event(i: int) -> dict:
+    return {
+        "id": str(ObjectId()),
+        "type": "completed" if i % 3 == 0 else "upload",
+        "job_id": JOBS[i % len(JOBS)],
+        "email": f"cand{i}@example.com",
+        "score": 80.0 if i % 3 == 0 else None,
+        "seq": i,
+        "sent_at": time.perf_counter(),
+    }
+
+
+async def drain(sub, expected: int, latencies: list):
+    for _ in range(expected):
+        event = await sub.get(timeout=5)
+        if event is None:
+            raise RuntimeError("subscriber stalled")
+        latencies.append(time.perf_counter() - event["sent_at"])
+
+
+async def fan_out(events: int, subscribers: int):
+    local = EventHub()
+    all_subs = [local.subscribe() for _ in range(subscribers // 2)]
+    job_subs = [local.subscribe(JOBS[i % len(JOBS)]) for i in range(subscribers - len(all_subs))]
+    per_job = {job: sum(1 for i in range(events) if JOBS[i % len(JOBS)] == job) for job in JOBS}
+
+    latencies = []
+    readers = [asyncio.create_task(drain(s, events, latencies)) for s in all_subs]
+    readers += [asyncio.create_task(drain(s, per_job[s.topics[0][4:]], latencies)) for s in job_subs]
+
+    subs = all_subs + job_subs
+    publish_s = 0.0
+    for burst in range(0, events, BURST):
+        start = time.perf_counter()
+        for i in range(burst, min(burst + BURST, events)):
+            local.publish(fake_event(i))
+        publish_s += time.perf_counter() - start
+        while any(not s.queue.empty() for s in subs):
+            await asyncio.sleep(0)
+    await asyncio.gather(*readers)
+
+    latencies.sort()
+    deliveries = len(latencies)
+    print(f"{events:,} events -> {subscribers} subscribers ({deliveries:,} deliveries)")
+    print(f"  publish: {events / publish_s:,.0f} events/s")
+    print(f"  latency: p50 {latencies[deliveries // 2] * 1e6:.0f} us, p99 {latencies[int(deliveries * 0.99)] * 1e6:.0f} us")
+
+
+async def main(events: int, subscribers: int):
+    await fan_out(events, subscribers)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    s = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(main(n, s))
@@ -0,0 +1,66 @@
+"""
+Benchmark: spaced-repetition scheduler with many simulated users (in memory,
+no Mongo writes).
+
+Run from the backend folder:
+    python -m benchmarks.bench_flashcard_scheduler [users] [reviews_per_user]
+"""
+import asyncio
+import random
+import resource
+import sys
+import time
+
+from services import flashcard_scheduler
+from services.flashcard_scheduler import FlashcardDeck, FlashcardScheduler, now_minutes
+
+
+def legacy_draw(deck, limit=20):
+    """The original endpoint: filter, shuffle the whole deck, slice."""
+    cards = list(deck.cards)
+    random.shuffle(cards)
+    return cards[:limit]
+
+
+async def run(users: int, reviews_per_user: int):
+    flashcard_scheduler.MAX_LOADED_USERS = users
+    flashcard_scheduler.FLUSH_BATCH_SIZE = users * reviews_per_user + 1
+    deck = FlashcardDeck.from_file()
+    scheduler = FlashcardScheduler(deck, collection=None)
+    card_ids = list(deck.index_of)
+    rng = random.Random(1)
+    now = now_minutes()
+
+    start = time.perf_counter()
+    for u in range(users):
+        user_id = f"user{u}"
+        for card_id in rng.sample(card_ids, reviews_per_user):
+            # Spread the reviews over the past month so some are already due again
+            await scheduler.record_review(user_id, card_id, rng.randint(0, 5), now - rng.randint(0, 30 * 24 * 60))
+    review_s = time.perf_counter() - start
+    total_reviews = users * reviews_per_user
+
+    start = time.perf_counter()
+    due_total = 0
+    for u in range(users):
+        due_total += len(await scheduler.next_due(f"user{u}", 20, now=now))
+    due_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(users):
+        legacy_draw(deck)
+    legacy_s = time.perf_counter() - start
+
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"users: {users:,}  reviews/user: {reviews_per_user}  deck: {len(deck.cards)} cards")
+    print(f"record_review:      {total_reviews / review_s:12,.0f} reviews/s")
+    print(f"next_due(k=20):     {users / due_s:12,.0f} calls/s  ({due_s / users * 1e6:.1f} us/call, {due_total / users:.1f} cards)")
+    print(f"legacy shuffle:     {users / legacy_s:12,.0f} calls/s  ({legacy_s / users * 1e6:.1f} us/call)")
+    print(f"pending writes:     {scheduler.pending:,} (flushed as one bulk_write per batch)")
+    print(f"peak RSS:           {rss_mb:,.0f} MB")
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    reviews = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(run(users, reviews))
@@ -0,0 +1,74 @@
+"""
+Benchmark: GitHub summary for one resume against a local stub of the GitHub
+API that adds a fixed latency to every call.
+
+  legacy  blocking requests.get: profile, repo list, then per repo the
+          README metadata and the README body, one after another
+  async   pooled httpx client: profile + repo list together, then the
+          READMEs concurrently in one call each (empty cache)
+  cached  same username again: within the TTL (no calls), after the TTL
+          (conditional requests answered 304), and with GitHub down
+          (stale copy served)
+
+The Mongo cache collection is replaced by an in-memory one; both fakes are
+in tests/fakes.py, and correctness checks against them live in
+tests/test_github_client.py.
+
+Run from the backend folder:
+    python -m benchmarks.bench_github_client [latency_ms] [rounds]
+"""
+import asyncio
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from routes import github_analysis
+from services.github_cache import GitHubCache
+from services.github_client import GitHubClient
+from tests.fakes import GITHUB, MemoryGitHubCache, StubGitHub, legacy_github_summary
+
+
+async def main(latency_ms: float = 50, rounds: int = 5):
+    GITHUB["latency"] = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    client = GitHubClient(base_url=base, token=None)
+    cache = github_analysis.github_cache = GitHubCache(client, MemoryGitHubCache(), ttl=3600)
+
+    print(f"stub latency {latency_ms:.0f} ms per call, {rounds} resumes")
+    GITHUB["calls"] = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        legacy_github_summary(base, "demo")
+    legacy_ms = (time.perf_counter() - start) / rounds * 1000
+    print(f"  legacy  {legacy_ms:7.1f} ms/resume  {GITHUB['calls'] // rounds} calls")
+
+    async def timed(label: str, users: list):
+        GITHUB["calls"] = 0
+        start = time.perf_counter()
+        for user in users:
+            await github_analysis.build_github_summary(f"https://github.com/{user}")
+        ms = (time.perf_counter() - start) / len(users) * 1000
+        print(f"  {label:<22} {ms:7.1f} ms/resume  {GITHUB['calls'] / len(users):4.1f} calls")
+        return ms
+
+    async_ms = await timed("async, cold cache", [f"user{i}" for i in range(rounds)])
+    print(f"  ({legacy_ms / async_ms:.1f}x faster than legacy)")
+
+    await timed("cached, within TTL", [f"user{i}" for i in range(rounds)])
+    cache.ttl = 0
+    await timed("cached, revalidated", [f"user{i}" for i in range(rounds)])
+    GITHUB["down"] = True
+    await timed("cached, GitHub down", [f"user{i}" for i in range(rounds)])
+    GITHUB["down"] = False
+    print(f"  cache stats: {cache.stats()}")
+
+    await client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(float(a) for a in sys.argv[1:2]), *(int(a) for a in sys.argv[2:3])))
@@ -0,0 +1,109 @@
+"""
+Benchmark: what GitHub costs the resume upload request.
+
+  inline    upload awaits build_github_summary (the old route)
+  enqueued  upload hands the URL to the background enricher
+
+Then checks the enricher itself: uploads sharing a username cost one
+fetch, a fetch that fails twice still ends "ready", and one that keeps
+failing ends "failed". GitHub is replaced by a coroutine with a fixed
+latency and the resumes collection by an in-memory one.
+
+Run from the backend folder:
+    python -m benchmarks.bench_github_enrichment [latency_ms] [uploads]
+"""
+import asyncio
+import sys
+import time
+
+from services import github_enrichment
+from services.github_client import GitHubError
+from services.github_enrichment import GitHubEnricher, PENDING
+
+STATE = {"latency": 0.3, "fetches": 0, "fail": {}}
+
+
+async def fake_summary(url: str) -> dict:
+    STATE["fetches"] += 1
+    await asyncio.sleep(STATE["latency"])
+    username = url.rsplit("/", 1)[-1]
+    if STATE["fail"].get(username, 0) > 0:
+        STATE["fail"][username] -= 1
+        raise GitHubError("502 Bad Gateway")
+    return {"username": username, "top_repos": []}
+
+
+class MemoryResumes:
+    """Just enough of the resumes collection for GitHubEnricher."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def add(self, user_id, username: str):
+        self.docs[user_id] = {"user_id": user_id, "github_username": username, "github_status": PENDING}
+
+    async def update_many(self, query, update):
+        for uid in query["user_id"]["$in"]:
+            doc = self.docs[uid]
+            if doc["github_username"] == query["github_username"] and doc["github_status"] == PENDING:
+                doc.update(update["$set"])
+
+
+def pct(samples, p):
+    return sorted(samples)[int(len(samples) * p) - 1] * 1000
+
+
+async def wait_until_done(resumes: MemoryResumes):
+    while any(d["github_status"] == PENDING for d in resumes.docs.values()):
+        await asyncio.sleep(0.01)
+
+
+async def main(latency_ms: float = 300, uploads: int = 100):
+    STATE["latency"] = latency_ms / 1000
+    github_enrichment.build_github_summary = fake_summary
+    github_enrichment.RETRY_DELAY = 0.05
+    print(f"GitHub latency {latency_ms:.0f} ms, {uploads} uploads from {uploads // 10} GitHub users")
+
+    inline = []
+    for i in range(10):
+        start = time.perf_counter()
+        await fake_summary(f"https://github.com/user{i}")
+        inline.append(time.perf_counter() - start)
+    print(f"  inline    p50 {pct(inline, 0.5):8.2f} ms  p99 {pct(inline, 0.99):8.2f} ms  (GitHub part of upload)")
+
+    resumes = MemoryResumes()
+    enricher = GitHubEnricher(resumes)
+    enricher.start()
+    STATE["fetches"] = 0
+    enqueued = []
+    start_all = time.perf_counter()
+    for i in range(uploads):
+        username = f"user{i % (uploads // 10)}"
+        resumes.add(i, username)
+        start = time.perf_counter()
+        enricher.enqueue(i, f"https://github.com/{username}")
+        enqueued.append(time.perf_counter() - start)
+    print(f"  enqueued  p50 {pct(enqueued, 0.5):8.4f} ms  p99 {pct(enqueued, 0.99):8.4f} ms")
+
+    await wait_until_done(resumes)
+    ready = sum(d["github_status"] == "ready" for d in resumes.docs.values())
+    print(f"  all {ready} resumes ready after {time.perf_counter() - start_all:.2f}s "
+          f"with {STATE['fetches']} fetches ({enricher.workers} workers)")
+    assert ready == uploads and STATE["fetches"] == uploads // 10
+
+    # flaky: two failures then success; broken: never succeeds
+    STATE["fail"] = {"flaky": 2, "broken": 99}
+    resumes.add("a", "flaky")
+    resumes.add("b", "broken")
+    enricher.enqueue("a", "https://github.com/flaky")
+    enricher.enqueue("b", "https://github.com/broken")
+    await wait_until_done(resumes)
+    print(f"  flaky -> {resumes.docs['a']['github_status']}, broken -> {resumes.docs['b']['github_status']} "
+          f"({resumes.docs['b']['github_error']})")
+    assert resumes.docs["a"]["github_status"] == "ready" and resumes.docs["b"]["github_status"] == "failed"
+    print(f"  stats: {enricher.stats()}")
+    enricher.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(float(a) for a in sys.argv[1:2]), *(int(a) for a in sys.argv[2:3])))
@@ -0,0 +1,69 @@
+"""
+Benchmark: resume extract + parse throughput on the ingestion process pool
+with 1, 4 and all cores, against the old inline loop. Clerk and Mongo are
+not involved; this measures the CPU stage that used to block the event loop.
+
+Run from the backend folder:
+    python -m benchmarks.bench_ingestion [copies]
+"""
+import asyncio
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import UPLOAD_FOLDER
+from services.ingestion import extract_and_parse
+
+
+def _quiet():
+    # extract_email_from_text prints the raw resume text
+    sys.stdout = open(os.devnull, "w")
+
+
+async def run_pool(paths, workers: int) -> float:
+    with ProcessPoolExecutor(max_workers=workers, initializer=_quiet) as pool:
+        loop = asyncio.get_running_loop()
+        # warm the workers up so process start-up isn't measured
+        await asyncio.gather(*(loop.run_in_executor(pool, extract_and_parse, paths[0]) for _ in range(workers)))
+
+        slots = asyncio.Semaphore(workers)
+
+        async def one(path):
+            async with slots:
+                return await loop.run_in_executor(pool, extract_and_parse, path)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(p) for p in paths))
+        return time.perf_counter() - start
+
+
+def run_inline(paths) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for p in paths:
+            extract_and_parse(p)
+    return time.perf_counter() - start
+
+
+def main(copies: int = 10):
+    pdfs = sorted(glob.glob(os.path.join(UPLOAD_FOLDER, "*.pdf")))
+    if not pdfs:
+        print(f"No PDFs found in {UPLOAD_FOLDER}")
+        return
+    paths = pdfs * copies
+    cores = os.cpu_count() or 1
+
+    inline = run_inline(paths)
+    print(f"{len(paths)} resumes ({len(pdfs)} unique PDFs x {copies})")
+    print(f"inline (old loop):   {len(paths) / inline:8.1f} resumes/s")
+    for workers in sorted({1, 4, cores}):
+        elapsed = asyncio.run(run_pool(paths, workers))
+        print(f"pool, {workers:>2} process(es): {len(paths) / elapsed:8.1f} resumes/s  ({inline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,52 @@
+"""
+Benchmark: PDF text extraction backends over the resumes in UPLOAD_FOLDER.
+Each backend runs in a fresh process so its peak RSS is reported separately.
+
+Run from the backend folder:
+    python -m benchmarks.bench_pdf_extract [rounds]
+"""
+import glob
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+from config import UPLOAD_FOLDER
+from services.pdf_extract import BACKENDS, extract_pages
+
+
+def measure(backend: str, paths, rounds: int, queue):
+    blobs = [open(p, "rb").read() for p in paths]
+    base_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    pages = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for blob in blobs:
+            pages += len(extract_pages(blob, backend=backend, max_pages=None, time_limit=None))
+    elapsed = time.perf_counter() - start
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((pages, elapsed, rss_mb, rss_mb - base_mb))
+
+
+def main(rounds: int = 5):
+    paths = sorted(glob.glob(os.path.join(UPLOAD_FOLDER, "*.pdf")))
+    if not paths:
+        print(f"No PDFs found in {UPLOAD_FOLDER}")
+        return
+    print(f"{len(paths)} PDFs x {rounds} rounds")
+    print(f"{'backend':<12} {'pages/s':>9} {'docs/s':>9} {'peak RSS':>10} {'growth':>8}")
+
+    ctx = multiprocessing.get_context("spawn")
+    for backend in BACKENDS:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=measure, args=(backend, paths, rounds, queue))
+        proc.start()
+        pages, elapsed, rss_mb, growth_mb = queue.get()
+        proc.join()
+        docs = len(paths) * rounds
+        print(f"{backend:<12} {pages / elapsed:9.1f} {docs / elapsed:9.1f} {rss_mb:7.0f} MB {growth_mb:5.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,70 @@
+"""
+Benchmark: practice question endpoint, per-request JSON load vs in-memory bank.
+
+Run from the backend folder:
+    python -m benchmarks.bench_question_bank
+"""
+import json
+import random
+import time
+
+from services.question_bank import DATA_PATH, QuestionBank
+
+QUERIES = [
+    (["all"], "all", 1),
+    (["easy", "medium", "hard"], "all", 1),
+    (["easy", "medium", "hard"], "all", 3),
+    (["medium"], "Array", 1),
+    (["easy", "hard"], "Dynamic Programming", 2),
+]
+
+
+def legacy_page(difficulty, topic, page, limit=20):
+    """The original get_software_questions body."""
+    with open(DATA_PATH, "r") as f:
+        all_questions = json.load(f)
+    difficulty = [d.lower() for d in difficulty]
+    if "all" in difficulty:
+        filtered = all_questions
+    else:
+        filtered = [q for q in all_questions if q["difficulty"].lower() in difficulty]
+    if topic != "all":
+        filtered = [q for q in filtered if topic in q.get("topics", [])]
+    total_count = len(filtered)
+    random.shuffle(filtered)
+    start = (page - 1) * limit
+    return {"questions": filtered[start:start + limit], "totalCount": total_count}
+
+
+def timeit(fn, rounds):
+    start = time.perf_counter()
+    for i in range(rounds):
+        difficulty, topic, page = QUERIES[i % len(QUERIES)]
+        fn(difficulty, topic, page)
+    return (time.perf_counter() - start) / rounds
+
+
+def main(rounds: int = 500):
+    start = time.perf_counter()
+    bank = QuestionBank.from_file()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    # Sanity check: same filters give the same totals, pages don't overlap.
+    for difficulty, topic, _ in QUERIES:
+        assert bank.page(difficulty, topic)["totalCount"] == legacy_page(difficulty, topic, 1)["totalCount"]
+    first = bank.page(["all"], "all", 1, seed=42)["questions"]
+    second = bank.page(["all"], "all", 2, seed=42)["questions"]
+    assert not {q["titleSlug"] for q in first} & {q["titleSlug"] for q in second}
+
+    legacy = timeit(legacy_page, rounds)
+    cold = timeit(lambda d, t, p: bank.page(d, t, p, seed=random.random()), rounds)
+    warm = timeit(lambda d, t, p: bank.page(d, t, p, seed=7), rounds)
+
+    print(f"questions loaded:          {len(bank.questions)} in {load_ms:.1f} ms (once, at startup)")
+    print(f"legacy (load + shuffle):   {legacy * 1e6:9.1f} us/request")
+    print(f"bank, new seed per call:   {cold * 1e6:9.1f} us/request  ({legacy / cold:.0f}x)")
+    print(f"bank, cached permutation:  {warm * 1e6:9.1f} us/request  ({legacy / warm:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
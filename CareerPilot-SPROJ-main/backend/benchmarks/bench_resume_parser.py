@@ -0,0 +1,36 @@
+"""
+Benchmark: single-pass resume tokenizer vs the old per-section scans over
+every sample resume in UPLOAD_FOLDER (with both PDF backends). That both
+parse to the same output is checked in tests/test_resume_tokenizer.py.
+
+Run from the backend folder:
+    python -m benchmarks.bench_resume_parser [rounds]
+"""
+import glob
+import os
+import sys
+import time
+
+from config import UPLOAD_FOLDER
+from routes.resume import parse_resume_regex
+from services.pdf_extract import BACKENDS, extract_text
+from tests.legacy_resume_parser import SYNTHETIC, legacy_parse
+
+
+def main(rounds: int = 200):
+    texts = [SYNTHETIC]
+    for path in sorted(glob.glob(os.path.join(UPLOAD_FOLDER, "*.pdf"))):
+        for backend in BACKENDS:
+            texts.append(extract_text(path, backend=backend))
+
+    for label, fn in (("legacy scans", legacy_parse), ("tokenizer", parse_resume_regex)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for text in texts:
+                fn(text)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<14} {elapsed / (rounds * len(texts)) * 1e6:8.1f} us/resume")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
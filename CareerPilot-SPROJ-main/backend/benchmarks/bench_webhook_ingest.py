@@ -0,0 +1,326 @@
+"""
+Benchmark: interview-completion webhooks for a burst of finished
+interviews, against in-memory collections that add a fixed round trip to
+every operation.
+
+  per-event  the old handler: find_one_and_update, counter bump, rollup
+             write and activity insert for every callback
+  ingest     WebhookIngest.accept() per request (one insert_many + one
+             report insert), applied by the worker in coalesced rounds
+
+Then checks that replayed callbacks are reported as duplicates, that a
+retry after the first completion is not counted twice, and that unknown
+usernames show up as not_found in the batch report, and that events
+stored by a request that then failed are still applied. The counter, rollup
+and activity helpers are replaced by stand-ins that count calls and cost
+one round trip each.
+
+Run from the backend folder:
+    python -m benchmarks.bench_webhook_ingest [rtt_ms] [events]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+import services.webhook_ingest as ingest
+from services.metrics_rollup import interview_score
+from services.webhook_ingest import WebhookIngest, DUPLICATE, NOT_FOUND, SUPERSEDED
+
+STATE = {"rtt": 0.002, "round_trips": 0}
+CALLS = {"bump": 0, "record": 0, "completions": 0, "activity": 0}
+
+
+async def round_trip():
+    STATE["round_trips"] += 1
+    await asyncio.sleep(STATE["rtt"])
+
+
+def matches(doc: dict, query: dict) -> bool:
+    for field, cond in query.items():
+        if isinstance(cond, dict) and isinstance(cond.get("$in"), list):
+            cond["$in"] = set(cond["$in"])  # stands in for the index lookup
+        value = doc.get(field)
+        if isinstance(cond, dict):
+            if "$in" in cond and value not in cond["$in"]:
+                return False
+            if "$ne" in cond and value == cond["$ne"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+def apply_update(doc: dict, update: dict):
+    for path, value in update.get("$set", {}).items():
+        target, *rest = path.split(".")
+        if rest:  # results.<i>.status / counts.<name>
+            node = doc[target]
+            for key in rest[:-1]:
+                node = node[int(key)] if isinstance(node, list) else node[key]
+            node[rest[-1]] = value
+        else:
+            doc[path] = value
+    for path, n in update.get("$inc", {}).items():
+        target, key = path.split(".")
+        doc[target][key] = doc[target].get(key, 0) + n
+    for field, value in update.get("$min", {}).items():
+        if doc.get(field) is None or value < doc[field]:
+            doc[field] = value
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        await round_trip()
+        return list(self.docs)
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        await round_trip()
+        for doc in self.docs:
+            yield doc
+
+
+class MemoryCollection:
+    """Just enough of a motor collection for the webhook paths."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def _matching(self, query: dict):
+        if "_id" in query and not isinstance(query["_id"], dict):
+            doc = self.docs.get(query["_id"])
+            return [doc] if doc is not None and matches(doc, query) else []
+        return [d for d in self.docs.values() if matches(d, query)]
+
+    async def insert_one(self, doc: dict):
+        await round_trip()
+        self.docs[doc.setdefault("_id", ObjectId())] = doc
+
+    async def insert_many(self, docs, ordered=True):
+        await round_trip()
+        errors = []
+        for i, doc in enumerate(docs):
+            key = doc.setdefault("_id", ObjectId())
+            if key in self.docs:
+                errors.append({"index": i, "code": 11000, "errmsg": "E11000 duplicate key error"})
+            else:
+                self.docs[key] = doc
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(docs) - len(errors)})
+
+    async def find_one(self, query):
+        await round_trip()
+        return next((dict(d) for d in self._matching(query)), None)
+
+    def find(self, query, projection=None):
+        return Cursor([dict(d) for d in self._matching(query)])
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=None):
+        await round_trip()
+        for doc in self._matching(query):
+            before = dict(doc)
+            apply_update(doc, update)
+            return before
+        return None
+
+    async def bulk_write(self, ops, ordered=True):
+        await round_trip()
+        for op in ops:
+            for doc in self._matching(op._filter)[:1]:
+                apply_update(doc, op._doc)
+
+    async def update_many(self, query, update):
+        await round_trip()
+        for doc in self._matching(query):
+            apply_update(doc, update)
+
+
+class NoIndex:
+    def update(self, candidate_id, fields):
+        pass
+
+
+async def fake_bump(job_id, **deltas):
+    await round_trip()
+    CALLS["bump"] += 1
+
+
+async def fake_record(completions=0, score=None, at=None, score_count=1, **kwargs):
+    await round_trip()
+    CALLS["record"] += 1
+    CALLS["completions"] += completions
+
+
+async def fake_log_events(docs):
+    await round_trip()
+    CALLS["activity"] += len(docs)
+
+
+class CandidateCollection(MemoryCollection):
+    """Candidates with the temp_username index the old handler relied on."""
+
+    def _matching(self, query: dict):
+        if isinstance(query.get("temp_username"), str):
+            doc = self.docs.get(self.by_username.get(query["temp_username"]))
+            return [doc] if doc is not None and matches(doc, query) else []
+        return super()._matching(query)
+
+
+def candidates(n: int, jobs: int = 5) -> CandidateCollection:
+    collection = CandidateCollection()
+    for i in range(n):
+        oid = ObjectId()
+        collection.docs[oid] = {"_id": oid, "temp_username": f"cand_{i}", "job_id": f"job{i % jobs}",
+                                "email": f"cand{i}@example.com", "interview_completed": False}
+    collection.by_username = {d["temp_username"]: oid for oid, d in collection.docs.items()}
+    return collection
+
+
+def result(i: int) -> dict:
+    return {"temp_username": f"cand_{i}", "technical_score": 60 + i % 40, "behavioural_score": 70,
+            "report_url": f"https://reports.example.com/{i}", "completed_at": None, "event_id": f"evt_{i}"}
+
+
+async def per_event(cands: CandidateCollection, payload: dict):
+    """The old interview_completed handler, one callback at a time."""
+    cand = await cands.find_one_and_update(
+        {"temp_username": payload["temp_username"]},
+        {"$set": {"interview_completed": True, "technical_score": payload.get("technical_score"),
+                  "behavioural_score": payload.get("behavioural_score"),
+                  "report_url": payload.get("report_url")}},
+    )
+    if cand and not cand.get("interview_completed"):
+        await fake_bump(cand.get("job_id"), completed=1)
+        score = interview_score(payload.get("technical_score"), payload.get("behavioural_score"))
+        await fake_record(completions=1, score=score)
+        await fake_log_events([cand])
+
+
+def new_ingest(cands: CandidateCollection) -> WebhookIngest:
+    return WebhookIngest(MemoryCollection(), MemoryCollection(), cands)
+
+
+async def drain(hook: WebhookIngest):
+    while not hook.queue.empty():
+        await hook.apply(await hook._next_round())
+
+
+def pct(samples, p):
+    return sorted(samples)[max(int(len(samples) * p) - 1, 0)] * 1000
+
+
+async def burst(call, total: int, concurrency: int):
+    events = iter(range(total))
+    waits = []
+
+    async def sender():
+        for i in events:
+            start = time.perf_counter()
+            await call(i)
+            waits.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(sender() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start), waits
+
+
+async def main(rtt_ms: float = 2, total: int = 2000):
+    STATE["rtt"] = rtt_ms / 1000
+    ingest.bump, ingest.record, ingest.log_events = fake_bump, fake_record, fake_log_events
+    ingest.search_index = NoIndex()
+    print(f"simulated round trip {rtt_ms:.1f} ms, {total} completions from 50 concurrent callbacks")
+
+    cands = candidates(total)
+    STATE["round_trips"] = 0
+    rate, waits = await burst(lambda i: per_event(cands, result(i)), total, 50)
+    print(f"  per-event  {rate:8.0f} events/s  p50 {pct(waits, 0.5):6.2f} ms  p99 {pct(waits, 0.99):6.2f} ms"
+          f"  {STATE['round_trips']} round trips")
+
+    cands = candidates(total)
+    hook = new_ingest(cands)
+    STATE["round_trips"] = 0
+    worker = asyncio.create_task(hook.run())
+    rate, waits = await burst(lambda i: hook.accept([result(i)]), total, 50)
+    while hook.queue.qsize() or hook.counts["applied"] < total:
+        await asyncio.sleep(0.01)
+    worker.cancel()
+    print(f"  ingest     {rate:8.0f} events/s  p50 {pct(waits, 0.5):6.2f} ms  p99 {pct(waits, 0.99):6.2f} ms"
+          f"  {STATE['round_trips']} round trips, applied in {hook.counts['rounds']} rounds")
+    done = sum(c["interview_completed"] for c in cands.docs.values())
+    assert done == total, done
+
+    # One request carrying a whole batch
+    cands = candidates(total)
+    hook = new_ingest(cands)
+    STATE["round_trips"] = 0
+    start = time.perf_counter()
+    await hook.accept([result(i) for i in range(total)])
+    accepted = time.perf_counter() - start
+    await drain(hook)
+    print(f"  batch of {total}: accepted in {accepted * 1000:.1f} ms, applied with {STATE['round_trips']} round trips")
+
+    # Replays: the same events again, by event_id and by Idempotency-Key
+    summary = await hook.accept([result(i) for i in range(10)])
+    assert summary["duplicates"] == 10 and summary["accepted"] == 0, summary
+    bare = {k: v for k, v in result(0).items() if k != "event_id"}
+    first = await hook.accept([bare], idempotency_key="retry-1")
+    again = await hook.accept([bare], idempotency_key="retry-1")
+    assert first["accepted"] == 1 and again["duplicates"] == 1, (first, again)
+    report = await hook.report(again["batch_id"])
+    assert report["results"][0]["status"] == DUPLICATE
+    print(f"  replays: 10/10 by event_id and 1/1 by Idempotency-Key reported as duplicates")
+
+    # Counting: a retry after completion, a re-score in one round and an unknown username
+    cands = candidates(3)
+    hook = new_ingest(cands)
+    CALLS.update(bump=0, record=0, completions=0, activity=0)
+    await hook.accept([result(0), result(1)])
+    await drain(hook)
+    rescored = {**result(1), "event_id": "evt_1_rescored", "technical_score": 99}
+    late = await hook.accept([{**result(0), "event_id": "evt_0_retry"}, rescored,
+                              {**result(2), "event_id": "evt_2_a"}, {**result(2), "event_id": "evt_2_b"},
+                              {**result(404), "event_id": "evt_404"}])
+    await drain(hook)
+    assert CALLS["completions"] == 3, CALLS
+    assert next(c for c in cands.docs.values() if c["temp_username"] == "cand_1")["technical_score"] == 99
+    statuses = [r["status"] for r in (await hook.report(late["batch_id"]))["results"]]
+    assert statuses == ["applied", "applied", SUPERSEDED, "applied", NOT_FOUND], statuses
+    print(f"  3 candidates, 7 callbacks: {CALLS['completions']} completions counted, report {statuses}")
+
+    # A failed report insert: the stored events are still applied, and the
+    # provider's retry is a duplicate rather than a lost completion
+    cands = candidates(2)
+    hook = new_ingest(cands)
+
+    async def report_down(doc):
+        raise RuntimeError("webhook_batches unavailable")
+
+    hook.batches.insert_one = report_down
+    try:
+        await hook.accept([result(0)])
+    except RuntimeError:
+        pass
+    await drain(hook)
+    assert next(c for c in cands.docs.values() if c["temp_username"] == "cand_0")["interview_completed"]
+
+    # Events stranded by another instance are re-queued by the sweep, not only at startup
+    stranded = WebhookIngest(hook.events, MemoryCollection(), cands)
+    await stranded.accept([result(1)])
+    requeued = await hook.requeue_pending(datetime.utcnow() + timedelta(seconds=1))
+    await drain(hook)
+    assert requeued == 1 and all(c["interview_completed"] for c in cands.docs.values())
+    print(f"  failed report insert: events still applied; sweep re-queued {requeued} stranded event")
+    print(f"  stats: {hook.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(float(a) for a in sys.argv[1:2]), *(int(a) for a in sys.argv[2:3])))
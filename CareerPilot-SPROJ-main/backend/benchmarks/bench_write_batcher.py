@@ -0,0 +1,138 @@
+"""
+Benchmark: candidate inserts per second at several concurrency levels,
+one insert_one per document against the WriteBatcher.
+
+By default the collection is a stand-in: a fixed network round trip,
+motor's 100-connection pool, and a server that handles one operation at
+a time at a fixed cost per operation plus per document. That per-operation
+cost and the pool are what batching saves.
+Pass --mongo to run against a real server instead (MONGO_URI, collection
+bench_write_batcher, dropped afterwards).
+
+Also checks that a duplicate key fails only its own caller, and that
+close() writes everything still queued.
+
+Run from the backend folder:
+    python -m benchmarks.bench_write_batcher [--mongo] [rtt_ms] [inserts]
+"""
+import asyncio
+import sys
+import time
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+
+from services.write_batcher import WriteBatcher
+
+LEVELS = (1, 8, 64, 256)
+STATE = {"rtt": 0.002, "per_op": 0.0002, "per_doc": 0.00002, "round_trips": 0}
+
+
+class LatencyCollection:
+    """insert_one/insert_many with Mongo-like costs and a unique "key"."""
+
+    def __init__(self):
+        self.docs = {}
+        self.keys = set()
+        self.pool = asyncio.Semaphore(100)
+        self.server = asyncio.Lock()
+
+    async def _round_trip(self, n: int):
+        STATE["round_trips"] += 1
+        async with self.pool:
+            await asyncio.sleep(STATE["rtt"])
+            async with self.server:
+                await asyncio.sleep(STATE["per_op"] + STATE["per_doc"] * n)
+
+    def _add(self, doc: dict):
+        if "key" in doc and doc["key"] in self.keys:
+            return {"code": 11000, "errmsg": f"E11000 duplicate key error dup key: {{ key: {doc['key']!r} }}"}
+        if "key" in doc:
+            self.keys.add(doc["key"])
+        self.docs[doc.setdefault("_id", ObjectId())] = doc
+
+    async def insert_one(self, doc: dict):
+        await self._round_trip(1)
+        err = self._add(doc)
+        if err:
+            raise DuplicateKeyError(err["errmsg"], err["code"])
+
+    async def insert_many(self, docs, ordered=True):
+        await self._round_trip(len(docs))
+        errors = []
+        for i, doc in enumerate(docs):
+            err = self._add(doc)
+            if err:
+                errors.append({"index": i, **err})
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(docs) - len(errors)})
+
+    async def drop(self):
+        pass
+
+
+def candidate(i: int) -> dict:
+    return {"job_id": "bench", "email": f"cand{i}@example.com", "full_name": f"Candidate {i}",
+            "skills": ["python", "fastapi", "mongodb"], "status": "Uploaded"}
+
+
+async def run(insert, total: int, concurrency: int) -> float:
+    queue = iter(range(total))
+
+    async def worker():
+        for i in queue:
+            await insert(candidate(i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(argv):
+    use_mongo = "--mongo" in argv
+    args = [a for a in argv if a != "--mongo"]
+    STATE["rtt"] = float(args[0]) / 1000 if args else STATE["rtt"]
+    total = int(args[1]) if len(args) > 1 else 2000
+
+    if use_mongo:
+        from config import db
+        collection = db.bench_write_batcher
+        print(f"real MongoDB, {total} inserts per run")
+    else:
+        collection = LatencyCollection()
+        print(f"simulated round trip {STATE['rtt'] * 1000:.1f} ms, {total} inserts per run")
+
+    print(f"  {'concurrency':>11}  {'insert_one/s':>12}  {'batched/s':>10}  {'round trips':>11}")
+    for level in LEVELS:
+        STATE["round_trips"] = 0
+        direct = await run(collection.insert_one, total, level)
+        direct_trips = STATE["round_trips"]
+        batcher = WriteBatcher(collection, "bench")
+        STATE["round_trips"] = 0
+        batched = await run(batcher.insert_one, total, level)
+        await batcher.close()
+        trips = f"{direct_trips} -> {STATE['round_trips']}" if not use_mongo else f"{batcher.counts['batches']} batches"
+        print(f"  {level:>11}  {direct:>12.0f}  {batched:>10.0f}  {trips:>11}")
+    await collection.drop()
+
+    # A duplicate key fails only its own caller
+    collection = LatencyCollection()
+    batcher = WriteBatcher(collection, "bench")
+    docs = [{"key": k} for k in ("a", "b", "a", "c")]
+    results = await asyncio.gather(*(batcher.insert_one(d) for d in docs), return_exceptions=True)
+    outcome = ["dup" if isinstance(r, WriteError) and r.code == 11000 else "ok" for r in results]
+    assert outcome == ["ok", "ok", "dup", "ok"], outcome
+    assert all(results[i].inserted_id == docs[i]["_id"] for i in (0, 1, 3))
+    print(f"  duplicate key in a batch of 4: {outcome}, {batcher.counts['batches']} insert_many")
+
+    # close() flushes what is still waiting for the window
+    batcher = WriteBatcher(collection, "bench", max_delay_ms=60_000)
+    waiting = [asyncio.create_task(batcher.insert_one({"n": i})) for i in range(10)]
+    await asyncio.sleep(0)
+    await batcher.close()
+    await asyncio.gather(*waiting)
+    print(f"  close() wrote {len(waiting)} queued inserts without waiting for the window")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -5,6 +5,24 @@ from config import db
 from routes import resume
 from routes import user_data,practice
 from routes import candidates, dashboard,interview_webhook,jobs
+from services.question_bank import get_question_bank
+from services.flashcard_scheduler import get_scheduler
+from services.ingestion import shutdown_pool
+from services.candidate_search import search_index
+from services.job_counters import backfill_counters
+from services.indexes import ensure_indexes
+from services.jwks import key_manager
+from services.user_cache import USER_CACHE_CHANGE_STREAM, run_user_change_stream
+from services.github_client import github
+from services.github_enrichment import enricher
+from services.email_outbox import outbox
+from services.clerk_pool import clerk_pool
+from services.write_batcher import close_all as flush_write_batchers
+from services.webhook_ingest import webhooks
+from services.metrics_rollup import backfill_rollups
+from services.event_hub import ACTIVITY_CHANGE_STREAM, run_change_stream
+from services.activity_log import to_feed_item
+import asyncio
 
 
 app = FastAPI()
@@ -25,6 +43,144 @@ async def test_db():
     except Exception as e:
         print("❌ MongoDB connection failed:", e)
 
+@app.on_event("startup")
+async def apply_indexes():
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        print("❌ Index bootstrap failed:", e)
+
+@app.on_event("startup")
+async def load_question_bank():
+    bank = get_question_bank()
+    print(f"✅ Loaded {len(bank.questions)} practice questions")
+
+@app.on_event("startup")
+async def build_search_index():
+    try:
+        await search_index.build()
+    except Exception as e:
+        # Queries still work; the index fills in on the next sync
+        print("❌ Candidate search index build failed:", e)
+
+@app.on_event("startup")
+async def backfill_job_counters():
+    try:
+        filled = await backfill_counters()
+        if filled:
+            print(f"✅ Backfilled pipeline counters for {filled} job(s)")
+    except Exception as e:
+        print("❌ Job counter backfill failed:", e)
+
+@app.on_event("startup")
+async def backfill_metrics_rollups():
+    try:
+        written = await backfill_rollups()
+        if written:
+            print(f"✅ Built {written} metrics rollup documents")
+    except Exception as e:
+        print("❌ Metrics rollup backfill failed:", e)
+
+@app.on_event("startup")
+async def start_activity_change_stream():
+    if ACTIVITY_CHANGE_STREAM:
+        app.state.activity_stream = asyncio.create_task(run_change_stream(to_feed_item))
+
+@app.on_event("shutdown")
+async def stop_activity_change_stream():
+    task = getattr(app.state, "activity_stream", None)
+    if task:
+        task.cancel()
+
+@app.on_event("startup")
+async def start_jwks_refresh():
+    app.state.jwks_refresh = asyncio.create_task(key_manager.run_refresh_loop())
+
+@app.on_event("shutdown")
+async def stop_jwks_refresh():
+    app.state.jwks_refresh.cancel()
+    await key_manager.close()
+
+@app.on_event("startup")
+async def start_user_change_stream():
+    if USER_CACHE_CHANGE_STREAM:
+        app.state.user_stream = asyncio.create_task(run_user_change_stream())
+
+@app.on_event("shutdown")
+async def stop_user_change_stream():
+    task = getattr(app.state, "user_stream", None)
+    if task:
+        task.cancel()
+
+@app.on_event("startup")
+async def start_flashcard_flusher():
+    app.state.flashcard_flusher = asyncio.create_task(get_scheduler().run_flush_loop())
+
+@app.on_event("shutdown")
+async def flush_flashcard_reviews():
+    app.state.flashcard_flusher.cancel()
+    await get_scheduler().flush()
+
+@app.on_event("shutdown")
+async def stop_ingestion_pool():
+    shutdown_pool()
+
+@app.on_event("startup")
+async def start_github_enrichment():
+    enricher.start()
+    try:
+        queued = await enricher.requeue_pending()
+        if queued:
+            print(f"✅ Re-queued GitHub enrichment for {queued} resume(s)")
+    except Exception as e:
+        print("❌ GitHub enrichment re-queue failed:", e)
+
+@app.on_event("shutdown")
+async def stop_github_enrichment():
+    enricher.stop()
+
+@app.on_event("shutdown")
+async def close_github_client():
+    await github.close()
+
+@app.on_event("startup")
+async def start_clerk_pool_refill():
+    app.state.clerk_pool_refill = asyncio.create_task(clerk_pool.run_refill_loop())
+
+@app.on_event("shutdown")
+async def stop_clerk_pool_refill():
+    app.state.clerk_pool_refill.cancel()
+
+@app.on_event("startup")
+async def start_email_outbox():
+    app.state.email_outbox = asyncio.create_task(outbox.run())
+
+@app.on_event("shutdown")
+async def stop_email_outbox():
+    # anything mid-send keeps its lease and is retried after LEASE_SECONDS
+    app.state.email_outbox.cancel()
+    await outbox.sender.close()
+
+@app.on_event("startup")
+async def start_webhook_worker():
+    app.state.webhook_worker = asyncio.create_task(webhooks.run())
+    try:
+        queued = await webhooks.requeue_pending()
+        if queued:
+            print(f"✅ Re-queued {queued} interview webhook event(s)")
+    except Exception as e:
+        print("❌ Webhook re-queue failed:", e)
+
+@app.on_event("shutdown")
+async def stop_webhook_worker():
+    # unapplied events stay queued in webhook_events for the next startup
+    app.state.webhook_worker.cancel()
+
+@app.on_event("shutdown")
+async def flush_batched_writes():
+    # registered last, once the workers above have stopped queueing writes
+    await flush_write_batchers()
+
 # === Candidate Routes ===
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(resume.router, prefix="/api/resume", tags=["Resume"])
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from typing import List, Optional
+from datetime import datetime
 from bson import ObjectId
 from pydantic import BaseModel, EmailStr
 from config import db
-from services.candidate_utils import process_resume
+from services.candidate_utils import ingest_resumes
+from services.candidate_search import search_index
+from services.candidate_listing import list_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from services.activity_log import log_event
 
 router = APIRouter(tags=["Candidates"])
 
@@ -15,40 +19,41 @@ class InviteRequest(BaseModel):
     email: EmailStr
 
 @router.post("/upload-resumes", status_code=201)
-async def upload_resumes(background_tasks: BackgroundTasks, files: List[UploadFile] = File(...)):
+async def upload_resumes(files: List[UploadFile] = File(...)):
     if not files:
         raise HTTPException(status_code=400, detail="No files uploaded")
-    created = [await process_resume(file, None, background_tasks) for file in files]
-    return {"created": created}
+    return await ingest_resumes(files, None)
 
 @router.get("/candidates")
-async def list_candidates():
-    rows = await db.candidates.find().sort("uploaded_at", -1).to_list(None)
-    items = []
-    invited = completed = in_progress = 0
-    for r in rows:
-        status = "Completed" if r.get("interview_completed") else r.get("status", "Invited")
-        if status == "Invited": invited += 1
-        elif status == "Completed": completed += 1
-        elif status == "In Progress": in_progress += 1
-        items.append({
-            "id": str(r["_id"]),
-            "email": r.get("email", ""),
-            "full_name": r.get("full_name", ""),
-            "domain": r.get("domain", ""),
-            "skills": r.get("skills", []),
-            "status": status,
-            "temp_username": r.get("temp_username", ""),
-            "uploaded_at": r.get("uploaded_at"),
-        })
-    return {"total": len(rows), "invited": invited, "completed": completed, "in_progress": in_progress, "candidates": items}
+async def list_candidates(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """Newest first; pass back `next_cursor` for the following page."""
+    return await list_page({}, ["email", "full_name", "domain", "skills", "temp_username"], limit, cursor)
+
+@router.get("/search")
+async def search_candidates(
+    q: str = Query(..., min_length=1),
+    job_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Prefix search over name, email, skills, domain and job role."""
+    await search_index.sync()
+    results = search_index.search(q, limit, job_id)
+    return {"query": q, "count": len(results), "candidates": results}
 
 @router.put("/{candidate_id}/email")
 async def edit_email(candidate_id: str, body: EditEmailIn):
     cand = await db.candidates.find_one({"_id": ObjectId(candidate_id)})
     if not cand:
         raise HTTPException(404, "Candidate not found")
-    await db.candidates.update_one({"_id": ObjectId(candidate_id)}, {"$set": {"email": body.email}})
+    await db.candidates.update_one(
+        {"_id": ObjectId(candidate_id)},
+        {"$set": {"email": body.email, "updated_at": datetime.utcnow()}}
+    )
+    search_index.update(candidate_id, {"email": body.email})
+    await log_event("email_changed", candidate_id, body.email, cand.get("job_id"))
     return {"detail": "Email updated"}
 
 @router.post("/{candidate_id}/send-invite")
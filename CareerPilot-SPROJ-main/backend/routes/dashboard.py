@@ -1,32 +1,120 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta
+from typing import Optional
+import asyncio
+import json
+from bson import ObjectId
 from config import db
+from services.parse_cache import parse_cache_stats
+from services.metrics_rollup import get_totals, get_trend, metrics_cache, MAX_TREND_BUCKETS
+from services.activity_log import recent_events, events_after, MAX_FEED_PAGE
+from services.event_hub import hub
+from services.jwks import key_manager
+from services.user_cache import user_cache
+from services.github_cache import github_cache
+from services.email_outbox import outbox
+from services.clerk_pool import clerk_pool
+from services.write_batcher import BATCHERS
+from services.webhook_ingest import webhooks
+
+SSE_KEEPALIVE_SECONDS = 15
 # from ..auth import get_current_recruiter
 
 router = APIRouter(tags=["Dashboard"])
 
 @router.get("/metrics")
 async def get_metrics():
-    total = await db.candidates.count_documents({})
-    completed = await db.candidates.count_documents({ "interview_completed": True})
-    pending = total - completed
-    pipeline = [
-        {"$match": { "interview_completed": True}},
-        {"$project": {"avg": {"$avg": ["$technical_score", "$behavioural_score"]}}},
-        {"$group": {"_id": None, "average": {"$avg": "$avg"}}}
-    ]
-    res = await db.candidates.aggregate(pipeline).to_list(1)
-    avg = round(res[0]["average"], 2) if res else 0.0
-    return {"total_candidates": total, "completed_interviews": completed, "pending_interviews": pending, "average_score": avg}
+    return await get_totals()
+
+@router.get("/metrics/trend")
+async def get_metrics_trend(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: str = Query("day", pattern="^(hour|day)$")
+):
+    """Uploads, invites, completions and average score per hour or day (UTC)."""
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=30)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+    if (end - start) / step >= MAX_TREND_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Range too large: at most {MAX_TREND_BUCKETS} {granularity} buckets")
+    return {"granularity": granularity, "buckets": await get_trend(start, end, granularity)}
 
 @router.get("/activity/recent")
-async def recent_activity():
-    rows = await db.candidates.find().sort("uploaded_at", -1).limit(6).to_list(6)
-    out = []
-    for r in rows:
-        out.append({
-            "email": r["email"],
-            "action": "Completed interview" if r.get("interview_completed") else "Interview invite sent",
-            "score": (r.get("technical_score") + r.get("behavioural_score")) / 2 if r.get("technical_score") else None,
-            "time": r.get("completed_at") or r["uploaded_at"]
-        })
-    return out
\ No newline at end of file
+async def recent_activity(
+    limit: int = Query(6, ge=1, le=MAX_FEED_PAGE),
+    before: Optional[str] = None,
+    job_id: Optional[str] = None
+):
+    """Newest events first. For "load more", pass the last item's id as `before`."""
+    return await recent_events(limit, before, job_id)
+
+def sse_message(event: dict) -> str:
+    data = json.dumps(jsonable_encoder(event))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+@router.get("/activity/stream")
+async def activity_stream(
+    request: Request,
+    job_id: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-Sent Events: uploads, invites, email edits and completions (with
+    scores) as they happen, for every job or just `job_id`. Browsers resend
+    Last-Event-ID on reconnect and get the events they missed first.
+    """
+    async def stream():
+        with hub.subscribe(job_id) as sub:
+            replayed = None
+            if last_event_id:
+                for event in await events_after(last_event_id, job_id):
+                    replayed = event["id"]
+                    yield sse_message(event)
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await sub.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                # published between subscribing and the replay query: already sent
+                elif replayed is None or ObjectId(event["id"]) > ObjectId(replayed):
+                    yield sse_message(event)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """Hit rates and sizes of the in-process and Mongo-backed caches."""
+    return {
+        "resume_parse_cache": await parse_cache_stats(),
+        "metrics_cache": metrics_cache.stats(),
+        "jwks": key_manager.stats(),
+        "user_cache": user_cache.stats(),
+        "github_cache": github_cache.stats(),
+    }
+
+@router.get("/worker-stats")
+async def worker_stats():
+    """Counters of this worker's background queues, pools and event fan-out."""
+    return {
+        "event_hub": hub.stats(),
+        "clerk_pool": clerk_pool.stats(),
+        "write_batchers": {b.label: b.stats() for b in BATCHERS},
+        "webhooks": webhooks.stats(),
+    }
+
+@router.get("/email-outbox")
+async def email_outbox_status():
+    """Delivery status of queued invite emails, with the latest failures."""
+    counts, failures = await asyncio.gather(outbox.status_counts(), outbox.recent_failures())
+    return jsonable_encoder(
+        {"counts": counts, "worker": outbox.stats(), "recent_failures": failures},
+        custom_encoder={ObjectId: str},
+    )
@@ -1,11 +1,11 @@
-import os
+import asyncio
 import re
-import requests
 from typing import Dict, Any, List
 
-GITHUB_API_URL = "https://api.github.com"
-GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
-HEADERS = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+import httpx
+
+from services.github_client import Budget, GitHubError, GITHUB_TIME_BUDGET
+from services.github_cache import github_cache, CachedGitHub
 
 def extract_github_username(url: str) -> str:
     """
@@ -17,63 +17,53 @@ def extract_github_username(url: str) -> str:
     return match.group(1)
 
 
-def fetch_github_profile(username: str) -> Dict[str, Any]:
-    """
-    Fetch basic user profile from GitHub API
-    """
-    resp = requests.get(f"{GITHUB_API_URL}/users/{username}", headers=HEADERS)
-    resp.raise_for_status()
-    return resp.json()
+def summarize_repo(repo: Dict[str, Any], readme_text: str) -> Dict[str, Any]:
+    return {
+        "name": repo["name"],
+        "description": repo.get("description"),
+        "stars": repo["stargazers_count"],
+        "language": repo.get("language"),
+        "topics": repo.get("topics", []),
+        "readme_excerpt": readme_text[:500],  # limit size
+    }
 
 
-def fetch_github_repos(username: str, limit: int = 5) -> List[Dict[str, Any]]:
+async def fetch_github_repos(gh: CachedGitHub, repos: List[Dict[str, Any]], budget: Budget, limit: int = 5) -> List[Dict[str, Any]]:
     """
-    Fetch user repos (sorted by stargazers) and extract summary info
+    Top repos by stars with their README excerpts, fetched concurrently
     """
-    resp = requests.get(
-        f"{GITHUB_API_URL}/users/{username}/repos?sort=updated&per_page=20",
-        headers=HEADERS,
-    )
-    resp.raise_for_status()
-    repos = resp.json()
-
-    repo_data = []
-    for repo in sorted(repos, key=lambda r: r["stargazers_count"], reverse=True)[:limit]:
-        # fetching README
-        readme_url = f"{GITHUB_API_URL}/repos/{username}/{repo['name']}/readme"
-        readme_resp = requests.get(readme_url, headers=HEADERS)
-        readme_text = ""
-        if readme_resp.status_code == 200:
-            readme_text = requests.get(readme_resp.json()["download_url"]).text
-
-        repo_data.append(
-            {
-                "name": repo["name"],
-                "description": repo.get("description"),
-                "stars": repo["stargazers_count"],
-                "language": repo.get("language"),
-                "topics": repo.get("topics", []),
-                "readme_excerpt": readme_text[:500],  # limit size
-            }
-        )
-    return repo_data
+    top = sorted(repos, key=lambda r: r["stargazers_count"], reverse=True)[:limit]
+    readmes = await gh.readmes([r["name"] for r in top], budget)
+    return [summarize_repo(repo, text) for repo, text in zip(top, readmes)]
 
 
-def build_github_summary(url: str) -> Dict[str, Any]:
+async def build_github_summary(url: str) -> Dict[str, Any]:
     """
-    Given a GitHub URL, fetch user + repo data and build summary for AI
+    Given a GitHub URL, fetch user + repo data and build summary for AI.
+    Raises GitHubError/httpx.HTTPError if the profile can't be fetched.
     """
     username = extract_github_username(url)
     if not username:
         return {"error": "Invalid GitHub URL"}
 
-  
-    try:
-        profile = fetch_github_profile(username)
-    except requests.exceptions.HTTPError as e:
-        profile = {}
-        print("GitHub fetch failed:", e)
-    repos = fetch_github_repos(username)
+    budget = Budget(GITHUB_TIME_BUDGET)
+    gh = await github_cache.open(username)
+    # profile and repo list don't depend on each other
+    profile, repos = await asyncio.gather(
+        gh.profile(budget),
+        gh.repos(budget),
+        return_exceptions=True,
+    )
+    if isinstance(repos, (GitHubError, httpx.HTTPError)):
+        print("GitHub repo fetch failed:", repos)
+        repos = []
+    # without a profile there is nothing to summarize: let the caller retry
+    for result in (profile, repos):
+        if isinstance(result, BaseException):
+            raise result
+
+    top_repos = await fetch_github_repos(gh, repos, budget)
+    await github_cache.save(gh)
 
     return {
         "username": username,
@@ -85,5 +75,5 @@ def build_github_summary(url: str) -> Dict[str, Any]:
             "public_repos": profile.get("public_repos"),
             "followers": profile.get("followers"),
         },
-        "top_repos": repos,
+        "top_repos": top_repos,
     }
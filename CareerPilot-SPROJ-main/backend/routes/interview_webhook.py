@@ -1,27 +1,46 @@
 # app/routes/interview_webhook.py
-from fastapi import APIRouter, HTTPException
-from config import db
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
+from typing import List, Optional, Union
+from services.webhook_ingest import webhooks
 
 router = APIRouter(tags=["Webhooks"])
 
-@router.post("/interview-completed")
-async def interview_completed(payload: dict):
+MAX_WEBHOOK_BATCH = 5000
+
+class InterviewResult(BaseModel):
+    temp_username: str = Field(min_length=1)
+    technical_score: Optional[float] = None
+    behavioural_score: Optional[float] = None
+    report_url: Optional[str] = None
+    completed_at: Optional[str] = None
+    event_id: Optional[str] = None  # provider's id for this callback, used for dedup
+
+class InterviewResultBatch(BaseModel):
+    events: List[InterviewResult] = Field(min_length=1, max_length=MAX_WEBHOOK_BATCH)
+
+@router.post("/interview-completed", status_code=202)
+async def interview_completed(
+    payload: Union[InterviewResultBatch, InterviewResult],
+    idempotency_key: Optional[str] = Header(None),
+):
     """
-    Expects payload like:
+    Expects one result like:
     { "temp_username": "cand_abc", "technical_score": 85, "behavioural_score": 78, "report_url": "..." }
+    or a batch: { "events": [ {...}, {...} ] }
+
+    Replays (same event_id, Idempotency-Key header or identical payload)
+    are reported as duplicates and not applied again. Updates are applied
+    in the background; poll /interview-completed/batches/{batch_id}.
     """
-    if "temp_username" not in payload:
-        raise HTTPException(status_code=400, detail="temp_username required")
-    res = await db.candidates.update_one(
-        {"temp_username": payload["temp_username"]},
-        {"$set": {
-            "interview_completed": True,
-            "technical_score": payload.get("technical_score"),
-            "behavioural_score": payload.get("behavioural_score"),
-            "report_url": payload.get("report_url"),
-            "completed_at": payload.get("completed_at")
-        }}
-    )
-    if res.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Candidate not found")
-    return {"status": "updated"}
+    events = payload.events if isinstance(payload, InterviewResultBatch) else [payload]
+    summary = await webhooks.accept([e.model_dump() for e in events], idempotency_key)
+    return {"status": "accepted", **summary}
+
+@router.get("/interview-completed/batches/{batch_id}")
+async def interview_batch_report(batch_id: str):
+    report = await webhooks.report(batch_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return jsonable_encoder(report)
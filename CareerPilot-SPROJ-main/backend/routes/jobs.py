@@ -1,11 +1,20 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from config import db
 from datetime import datetime
-from services.candidate_utils import process_resume
-from emailer import build_interview_email_html, send_email_background
+from services.candidate_utils import ingest_resumes, random_string
+from services.candidate_ranker import ranker
+from services.candidate_search import search_index
+from services.candidate_listing import list_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from services.job_counters import bump, read_counters, empty_counters
+from services.metrics_rollup import record
+from services.activity_log import log_event, log_events, event_doc
+from services.email_outbox import outbox
+from services.skill_matcher import get_matcher
+from emailer import INTERVIEW_INVITE, INTERVIEW_INVITE_SUBJECT, interview_invite_context
 
 router = APIRouter(tags=["Jobs"])
 
@@ -17,18 +26,18 @@ class JobCreate(BaseModel):
     questions: List[str] = []
     seniority: str = ""
 
-# -------------------- SHARED INVITE HELPER --------------------
-async def send_invite(candidate: dict, job: dict, background_tasks: BackgroundTasks, email_override: str = None):
-    email = email_override or candidate.get("email")
-    if not email:
-        raise HTTPException(status_code=400, detail="Email required")
-
-    magic_token = candidate.get("magic_token") or "manual-" + str(datetime.utcnow().timestamp())
+class BulkInviteRequest(BaseModel):
+    status: Optional[List[str]] = None         # e.g. ["Uploaded"]
+    skills: Optional[List[str]] = None         # candidate must have all of them
+    candidate_ids: Optional[List[str]] = None
 
+# -------------------- SHARED INVITE HELPER --------------------
+def invite_message(candidate: dict, job: dict, email: str, magic_token: str) -> dict:
+    """Outbox document for one candidate's interview invite."""
     frontend_base = "http://localhost:5173"  # or from env
     magic_url = f"{frontend_base.rstrip('/')}/interview/magic/{magic_token}"
 
-    html = build_interview_email_html(
+    context = interview_invite_context(
         candidate.get("full_name", "Candidate"),
         magic_url,
         candidate.get("temp_username", ""),
@@ -36,30 +45,45 @@ async def send_invite(candidate: dict, job: dict, background_tasks: BackgroundTa
         job_title=job.get("title"),
         job_seniority=job.get("seniority")
     )
-
-    background_tasks.add_task(
-        send_email_background,
-        email,
-        "CareerPilot: AI Interview Invite",
-        html
+    return outbox.message(
+        email, INTERVIEW_INVITE_SUBJECT, INTERVIEW_INVITE, context,
+        candidate_id=candidate["_id"], job_id=candidate.get("job_id"),
     )
 
-    await db.candidates.update_one(
+async def send_invite(candidate: dict, job: dict, email_override: str = None):
+    email = email_override or candidate.get("email")
+    if not email:
+        raise HTTPException(status_code=400, detail="Email required")
+
+    magic_token = candidate.get("magic_token") or "manual-" + str(datetime.utcnow().timestamp())
+    await outbox.enqueue_many([invite_message(candidate, job, email, magic_token)])
+
+    now = datetime.utcnow()
+    before = await db.candidates.find_one_and_update(
         {"_id": candidate["_id"]},
         {"$set": {
             "email": email,
             "invite_sent": True,
             "magic_token": magic_token,
-            "status": "Invited"
-        }}
+            "status": "Invited",
+            "updated_at": now
+        }, "$min": {"invited_at": now}},
+        projection={"invite_sent": 1},
+        return_document=ReturnDocument.BEFORE
     )
+    search_index.update(str(candidate["_id"]), {"email": email, "status": "Invited"})
+    # count a candidate once, however many times the invite is re-sent
+    if before and not before.get("invite_sent"):
+        await bump(job["_id"], invited=1)
+        await record(invites=1, at=now)
+    await log_event("invited", candidate["_id"], email, candidate.get("job_id"), at=now)
 
     return {"status": "invite_sent", "candidate_id": str(candidate["_id"]), "job_id": str(job["_id"]), "email": email}
 
 # -------------------- JOB ROUTES --------------------
 @router.post("/")
 async def create_job(job: JobCreate = JobCreate()):
-    job_data = {**job.dict(), "createdAt": datetime.utcnow(), "isActive": True}
+    job_data = {**job.dict(), "createdAt": datetime.utcnow(), "isActive": True, "counters": empty_counters()}
     result = await db.jobs.insert_one(job_data)
     return {"jobId": str(result.inserted_id)}
 
@@ -70,11 +94,11 @@ async def list_jobs():
 
     for job in jobs:
         job_id = str(job["_id"])
-        rows = await db.candidates.find({"job_id": job_id}).to_list(None)
+        counters = read_counters(job)
 
-        resumes_count = len(rows)
-        interviewed_count = sum(1 for r in rows if r.get("status") == "Interviewed")
-        shortlisted_count = sum(1 for r in rows if r.get("status") == "Shortlisted")
+        resumes_count = counters["resumes"]
+        interviewed_count = counters["interviewed"]
+        shortlisted_count = counters["shortlisted"]
 
         progress = 0
         if resumes_count > 0:
@@ -92,6 +116,8 @@ async def list_jobs():
             "resumesCount": resumes_count,
             "interviewedCount": interviewed_count,
             "shortlistedCount": shortlisted_count,
+            "invitedCount": counters["invited"],
+            "completedCount": counters["completed"],
             "progress": progress,
         })
 
@@ -127,7 +153,6 @@ async def toggle_job_active(job_id: str, payload: dict):
 @router.post("/{job_id}/candidates/upload-resumes", status_code=201)
 async def upload_resumes_for_job(
     job_id: str,
-    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
 ):
     if not files:
@@ -140,54 +165,144 @@ async def upload_resumes_for_job(
     job_title = job.get("title", "")
     job_seniority = job.get("seniority", "")
 
-    created = [
-        await process_resume(file, job_id, background_tasks, job_title, job_seniority)
-        for file in files
-    ]
-    return {"created": created}
+    return await ingest_resumes(files, job_id, job_title, job_seniority)
 
 @router.get("/{job_id}/candidates")
-async def list_candidates_for_job(job_id: str):
-    rows = await db.candidates.find({"job_id": job_id}).sort("uploaded_at", -1).to_list(None)
-    if not rows:
-        return {"total": 0, "candidates": []}
-
-    items = []
-    invited = completed = in_progress = 0
-
-    for r in rows:
-        status = "Completed" if r.get("interview_completed") else r.get("status", "Invited")
-        if status == "Invited":
-            invited += 1
-        elif status == "Completed":
-            completed += 1
-        elif status == "In Progress":
-            in_progress += 1
-
-        # ✅ append inside the loop
-        items.append({
-            "id": str(r["_id"]),
-            "full_name": r.get("full_name", ""),
-            "email": r.get("email", ""),
-            "job_role": r.get("job_role", ""),
-            "job_seniority": r.get("job_seniority", ""),
-            "skills": r.get("skills", []),
-            "status": status,
-            "uploaded_at": r.get("uploaded_at"),
+async def list_candidates_for_job(
+    job_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    page = await list_page(
+        {"job_id": job_id},
+        ["full_name", "email", "job_role", "job_seniority", "skills"],
+        limit,
+        cursor,
+    )
+    return {"job_id": job_id, **page}
+
+
+@router.get("/{job_id}/candidates/ranked")
+async def rank_candidates_for_job(job_id: str, k: int = Query(20, ge=1, le=500)):
+    job = await db.jobs.find_one({"_id": ObjectId(job_id)}, {"skills": 1})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    result = await ranker.rank(job_id, job.get("skills", []), k)
+
+    ids = [ObjectId(r["id"]) for r in result["ranked"]]
+    rows = await db.candidates.find(
+        {"_id": {"$in": ids}},
+        {"full_name": 1, "email": 1, "status": 1, "interview_completed": 1, "skills": 1},
+    ).to_list(len(ids))
+    by_id = {str(r["_id"]): r for r in rows}
+
+    candidates = []
+    for r in result["ranked"]:
+        row = by_id.get(r["id"], {})
+        candidates.append({
+            **r,
+            "full_name": row.get("full_name", ""),
+            "email": row.get("email", ""),
+            "status": "Completed" if row.get("interview_completed") else row.get("status", "Invited"),
+            "skills": row.get("skills", []),
         })
 
     return {
         "job_id": job_id,
-        "total": len(rows),
-        "invited": invited,
-        "completed": completed,
-        "in_progress": in_progress,
-        "candidates": items,
+        "total": result["total"],
+        "job_skills": result["job_skills"],
+        "candidates": candidates,
+    }
+
+
+@router.post("/{job_id}/candidates/send-invites")
+async def send_invites_for_job(job_id: str, payload: BulkInviteRequest = BulkInviteRequest()):
+    """
+    Invite every un-invited candidate of a job, optionally narrowed by
+    status, skills (all required) or ids. One query selects them, one
+    bulk_write marks them invited and one insert queues the emails of
+    those this call won; counters, rollups and the activity feed are each
+    updated once.
+    """
+    job = await db.jobs.find_one({"_id": ObjectId(job_id)}, {"title": 1, "seniority": 1})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    query = {"job_id": job_id, "invite_sent": {"$ne": True}}
+    if payload.status:
+        query["status"] = {"$in": payload.status}
+    if payload.skills:
+        # stored skills are canonical taxonomy names ("React", not "react.js")
+        matcher = get_matcher()
+        query["skills"] = {"$all": [matcher.normalize(skill) for skill in payload.skills]}
+    if payload.candidate_ids:
+        try:
+            query["_id"] = {"$in": [ObjectId(cid) for cid in payload.candidate_ids]}
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid candidate id")
+
+    # HOT_QUERIES "bulk invite selection" in services/indexes.py
+    candidates = await db.candidates.find(query, {
+        "full_name": 1, "email": 1, "temp_username": 1, "temp_password": 1, "magic_token": 1, "job_id": 1,
+    }).to_list(None)
+
+    eligible, skipped = [], 0
+    for cand in candidates:
+        # no real address was found in these resumes
+        if not cand.get("email") or cand["email"].endswith("@placeholder.ai"):
+            skipped += 1
+        else:
+            eligible.append(cand)
+    if not eligible:
+        return {"job_id": job_id, "matched": len(candidates), "invited": 0, "queued_emails": 0,
+                "skipped_no_email": skipped, "candidate_ids": []}
+
+    now = datetime.utcnow()
+    claim = ObjectId()
+    updates = [
+        UpdateOne(
+            # a single invite or another bulk call may have landed since the
+            # find; the claim shows which candidates this call invited
+            {"_id": cand["_id"], "invite_sent": {"$ne": True}},
+            {"$set": {
+                "invite_sent": True,
+                "invite_claim": claim,
+                "magic_token": cand.get("magic_token") or random_string(32),
+                "status": "Invited",
+                "updated_at": now
+            }, "$min": {"invited_at": now}},
+        )
+        for cand in eligible
+    ]
+    await db.candidates.bulk_write(updates, ordered=False)
+    won = await db.candidates.find(
+        {"_id": {"$in": [c["_id"] for c in eligible]}, "invite_claim": claim},
+        {"full_name": 1, "email": 1, "temp_username": 1, "temp_password": 1, "magic_token": 1, "job_id": 1},
+    ).to_list(None)
+
+    messages = [invite_message(cand, job, cand["email"], cand["magic_token"]) for cand in won]
+    events = [event_doc("invited", cand["_id"], cand["email"], job_id, at=now) for cand in won]
+    await outbox.enqueue_many(messages)
+    for cand in won:
+        search_index.update(str(cand["_id"]), {"status": "Invited"})
+    if won:
+        await bump(job["_id"], invited=len(won))
+        await record(invites=len(won), at=now)
+    await log_events(events)
+
+    return {
+        "job_id": job_id,
+        "matched": len(candidates),
+        "invited": len(won),
+        "queued_emails": len(messages),
+        "skipped_no_email": skipped,
+        "candidate_ids": [str(c["_id"]) for c in won],
     }
 
 
 @router.post("/{job_id}/candidates/{candidate_id}/send-invite")
-async def send_invite_for_job_candidate(job_id: str, candidate_id: str, payload: dict, background_tasks: BackgroundTasks):
+async def send_invite_for_job_candidate(job_id: str, candidate_id: str, payload: dict):
     email = payload.get("email")
     job = await db.jobs.find_one({"_id": ObjectId(job_id)})
     if not job:
@@ -197,4 +312,4 @@ async def send_invite_for_job_candidate(job_id: str, candidate_id: str, payload:
     if not cand:
         raise HTTPException(status_code=404, detail="Candidate not found for this job")
 
-    return await send_invite(cand, job, background_tasks, email_override=email)
+    return await send_invite(cand, job, email_override=email)
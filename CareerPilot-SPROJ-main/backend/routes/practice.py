@@ -1,51 +1,28 @@
-from fastapi import APIRouter, HTTPException, Query
-import json
-import random
-import os
+from fastapi import APIRouter, HTTPException, Query, Depends
+from pydantic import BaseModel, Field
 from typing import Optional
+from services.question_bank import get_question_bank
+from services.flashcard_scheduler import get_deck, get_scheduler
+from routes.dependencies import get_current_user
 
 router = APIRouter()
 
 
+class FlashcardReview(BaseModel):
+    card_id: str
+    grade: int = Field(..., ge=0, le=5)
+
+
 @router.get("/software")
 async def get_software_questions(
     difficulty: list[str] = Query(default=["all"]),
     topic: str = Query(default="all"),
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    seed: Optional[int] = Query(None, description="Shuffle seed returned by the first page")
 ):
     try:
-        data_path = os.path.join(os.path.dirname(__file__), "../data/software_questions.json")
-        with open(data_path, "r") as f:
-            all_questions = json.load(f)
-
-        # Normalize difficulty
-        difficulty = [d.lower() for d in difficulty]
-
-        # Filter by difficulty
-        if "all" in difficulty:
-            filtered = all_questions
-        else:
-            filtered = [q for q in all_questions if q["difficulty"].lower() in difficulty]
-
-        # Filter by topic
-        if topic != "all":
-            filtered = [q for q in filtered if topic in q.get("topics", [])]
-
-        total_count = len(filtered)
-
-        # Shuffle for randomness
-        random.shuffle(filtered)
-
-        # Pagination
-        start = (page - 1) * limit
-        end = start + limit
-        paginated = filtered[start:end]
-
-        return {
-            "questions": paginated,
-            "totalCount": total_count
-        }
+        return get_question_bank().page(difficulty, topic, page, limit, seed)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading questions: {str(e)}")
@@ -54,20 +31,10 @@ async def get_software_questions(
 @router.get("/datascience-flashcards")
 async def get_datascience_flashcards(
     category: Optional[str] = Query(None, description="Filter flashcards by category"),
-    limit: int = Query(20, description="Limit number of flashcards returned")
+    limit: int = Query(20, ge=1, le=100, description="Limit number of flashcards returned")
 ):
     try:
-        data_path = os.path.join(os.path.dirname(__file__), "../data/data_science_full_flashcards.json")
-        with open(data_path, "r", encoding="utf-8") as f:
-            all_cards = json.load(f)
-
-        if category:
-            filtered_cards = [card for card in all_cards if card.get("category") == category]
-        else:
-            filtered_cards = all_cards
-
-        random.shuffle(filtered_cards)
-        limited_cards = filtered_cards[:limit]
+        limited_cards = get_deck().sample(category, limit)
 
         return {
             "category": category or "all",
@@ -76,4 +43,34 @@ async def get_datascience_flashcards(
         }
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading flashcards: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error loading flashcards: {str(e)}")
+
+
+@router.get("/datascience-flashcards/due")
+async def get_due_flashcards(
+    category: Optional[str] = Query(None, description="Filter flashcards by category"),
+    limit: int = Query(20, ge=1, le=100, description="Number of due flashcards to return"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Spaced-repetition mode: cards whose next review is due for this user,
+    topped up with cards they have not seen yet.
+    """
+    cards = await get_scheduler().next_due(str(current_user["_id"]), limit, category)
+    return {
+        "category": category or "all",
+        "count": len(cards),
+        "flashcards": cards
+    }
+
+
+@router.post("/datascience-flashcards/review")
+async def review_flashcard(
+    body: FlashcardReview,
+    current_user = Depends(get_current_user)
+):
+    """Record how well the user recalled a card (SM-2 grade 0-5)."""
+    try:
+        return await get_scheduler().record_review(str(current_user["_id"]), body.card_id, body.grade)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Flashcard not found")
@@ -1,79 +1,53 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-# from PyPDF2 import PdfReader
-
-import pypdfium2
+import asyncio
 import re
 import io
 from datetime import datetime
 from config import db
-from .github_analysis import build_github_summary
 from routes.dependencies import get_current_user
+from services.pdf_extract import extract_text
+from services.resume_tokenizer import tokenize_resume
+from services.skill_matcher import match_skills
+from services.user_cache import invalidate_user
+from services.github_enrichment import enricher, github_username, PENDING
 
 router = APIRouter(tags=["Resume"])
-def extract_text_fast(pdf_bytes: bytes) -> str:
-    pdf = pypdfium2.PdfDocument(io.BytesIO(pdf_bytes))
-    text = "\n".join(page.get_textpage().get_text_range() for page in pdf)
-    return text
-
+NAME_RE = re.compile(r"^[A-Za-z\s\-]{2,50}$")
+DIGIT_RE = re.compile(r"\d")
+SKILL_SPLIT_RE = re.compile(r"[,;•\-]")
+BULLET_RE = re.compile(r"^[•\-]")
 
 def extract_name(lines):
     for line in lines[:4]:
-        if re.search(r"\d", line) or "@" in line or "http" in line.lower():
+        if DIGIT_RE.search(line) or "@" in line or "http" in line.lower():
             continue
-        if re.match(r"^[A-Za-z\s\-]{2,50}$", line):
+        if NAME_RE.match(line):
             return line.strip()
     return "Unknown"
 
-def extract_section(lines, section_keyword, stop_keywords):
-    capture = False
-    results = []
-    section_keyword_lower = section_keyword.lower()
-    stop_keywords_lower = [k.lower() for k in stop_keywords]
-
-    for line in lines:
-        line_lower = line.lower()
-        if any(k in line_lower for k in stop_keywords_lower):
-            capture = False
-
-        if section_keyword_lower in line_lower:
-            capture = True
-            continue
-
-        if capture and line.strip():
-            results.append(line.strip())
-    return results
-
 def parse_resume_regex(text: str):
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    sections = tokenize_resume(text)
 
-    name = extract_name(lines)
+    name = extract_name(sections["header"])
 
-    edu_keywords = ["education", "school", "academic", "degree", "bachelor", "master", "university"]
-    education = extract_section(lines, "education", stop_keywords=["skills", "projects", "experience"])
-    if not education:
-        education = [line for line in lines if any(k.lower() in line.lower() for k in edu_keywords)]
+    education = sections["education"] or sections["education_hints"]
 
-    skills_lines = extract_section(lines, "skills", stop_keywords=["education", "projects", "experience"])
     skills = []
-    for line in skills_lines:
-        for part in re.split(r"[,;•\-]", line):
+    seen = set()
+    for line in sections["skills"]:
+        for part in SKILL_SPLIT_RE.split(line):
             part_clean = part.strip()
-            if part_clean and part_clean not in skills:
+            if part_clean and part_clean not in seen:
+                seen.add(part_clean)
                 skills.append(part_clean)
 
-    projects = extract_section(lines, "project", stop_keywords=["education", "skills", "experience"])
-
-    github = re.findall(r"(?:https?://)?github\.com/[^\s•]+", text)
-
-    work_experience = extract_section(lines, "experience", stop_keywords=["education", "skills", "projects"])
-
     return {
         "name": name,
         "education": education,
         "skills": skills,
-        "projects": projects,
-        "github": github,
-        "work_experience": work_experience
+        "projects": sections["projects"],
+        "github": sections["github"],
+        "work_experience": sections["experience"]
     }
 
 def summarize_resume(parsed_data):
@@ -88,7 +62,7 @@ def summarize_resume(parsed_data):
             # Grab first bullet point or second line
             bullet = ""
             for line in lines[1:]:
-                if re.match(r"^[•\-]", line):  # bullet point
+                if BULLET_RE.match(line):  # bullet point
                     bullet = line.lstrip("•- ").strip()
                     break
             if not bullet and len(lines) > 1:
@@ -107,22 +81,6 @@ def summarize_resume(parsed_data):
     }
 
 
-def detect_domain(parsed_data):
-    skills = [s.lower() for s in parsed_data.get("skills", [])]
-    if any(s in skills for s in ["python", "java", "c++", "javascript", "fastapi", "django", "react"]):
-        return "Software Engineering"
-    if any(s in skills for s in ["pytorch", "tensorflow", "scikit-learn", "ml", "data"]):
-        return "Data Science / ML"
-    if any(s in skills for s in ["matlab", "circuit", "mechanical", "electrical"]):
-        return "Electrical/Mechanical"
-    if any(s in skills for s in ["docker", "aws", "kubernetes", "ci/cd"]):
-        return "DevOps"
-    if any(s in skills for s in ["security", "cybersecurity", "pentest"]):
-        return "Cybersecurity"
-    if any(s in skills for s in ["ui", "ux", "design", "figma", "adobe"]):
-        return "Design"
-    return "Other"
-
 @router.post("/upload")
 async def upload_resume(
     file: UploadFile = File(...),
@@ -138,17 +96,20 @@ async def upload_resume(
     pdf_file = io.BytesIO(contents)
 
     try:
-        text = extract_text_fast(contents)
+        # up to PDF_TIME_LIMIT of parsing; keep it off the event loop
+        text = await asyncio.to_thread(extract_text, contents)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read PDF: {e}")
 
     parsed_data = parse_resume_regex(text)
     summary = summarize_resume(parsed_data)
-    domain = detect_domain(parsed_data)
+    skill_match = match_skills(text)
+    domain = skill_match["domain"]
 
-    github_summary = None
-    if parsed_data["github"]:
-        github_summary = build_github_summary(parsed_data["github"][0])
+    # GitHub is fetched by the background enricher; poll /github-status
+    github_url = parsed_data["github"][0] if parsed_data["github"] else None
+    username = github_username(github_url)
+    github_status = PENDING if username else None
 
     resume_doc = {
         "user_id": user_id,
@@ -156,7 +117,12 @@ async def upload_resume(
         "parsed_data": parsed_data,
         "summary": summary,
         "domain": domain,
-        "github_summary": github_summary,
+        "normalized_skills": skill_match["skills"],
+        "skill_counts": skill_match["skill_counts"],
+        "domain_scores": skill_match["domain_scores"],
+        "github_summary": None,
+        "github_username": username,
+        "github_status": github_status,
         "updated_at": datetime.utcnow()
     }
 
@@ -166,6 +132,9 @@ async def upload_resume(
         upsert=True
     )
     await db.users.update_one({"_id": user_id}, {"$set": {"domain": domain}})
+    invalidate_user(current_user.get("clerk_id"))
+    if username:
+        enricher.enqueue(user_id, github_url)
 
     return {
         "user_id": str(user_id),
@@ -176,7 +145,26 @@ async def upload_resume(
         "parsed_data": parsed_data,
         "summary": summary,
         "domain": domain,
-        "github_summary": github_summary
+        "normalized_skills": skill_match["skills"],
+        "domain_scores": skill_match["domain_scores"],
+        "github_summary": None,
+        "github_status": github_status
+    }
+
+@router.get("/github-status")
+async def github_status(current_user = Depends(get_current_user)):
+    """Poll after upload: pending until the background GitHub fetch lands."""
+    # HOT_QUERIES "resume by user" in services/indexes.py
+    resume = await db.resumes.find_one(
+        {"user_id": current_user["_id"]},
+        {"github_status": 1, "github_summary": 1, "github_error": 1, "_id": 0},
+    )
+    if not resume:
+        raise HTTPException(status_code=404, detail="No resume found for this user")
+    return {
+        "github_status": resume.get("github_status"),
+        "github_summary": resume.get("github_summary"),
+        "github_error": resume.get("github_error"),
     }
 
 @router.put("/update")
@@ -5,6 +5,7 @@ from pydantic import BaseModel, EmailStr
 from datetime import datetime
 from config import db
 from typing import Optional
+from services.user_cache import invalidate_user
 
 router = APIRouter(tags=["User Data"])
 
@@ -45,6 +46,7 @@ async def create_user(data: UserCreate):
     }
 
     result = await db.users.insert_one(user_doc)
+    invalidate_user(data.clerk_id)
     return {
         "msg": "User created successfully ✅",
         "user_id": str(result.inserted_id),
@@ -73,6 +75,7 @@ async def update_user(clerk_id: str, updates: UserUpdate):
     update_data["updated_at"] = datetime.utcnow()
 
     result = await db.users.update_one({"clerk_id": clerk_id}, {"$set": update_data})
+    invalidate_user(clerk_id)
 
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
@@ -86,6 +89,7 @@ async def delete_user(clerk_id: str):
     Remove a user by Clerk ID (optional).
     """
     result = await db.users.delete_one({"clerk_id": clerk_id})
+    invalidate_user(clerk_id)
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     return {"msg": "User deleted successfully ❌"}
@@ -0,0 +1,69 @@
+"""
+Explain every hot query (services/indexes.HOT_QUERIES) and fail if any
+winning plan scans the whole collection (COLLSCAN) or sorts in memory
+(SORT). Aggregations are explained through the aggregate command, which
+reports the plan of the query their leading $match/$sort runs as. Point
+MONGO_URI at a test database; the collections may be empty.
+
+Run from the backend folder:
+    python -m scripts.check_query_plans [--ensure]
+
+--ensure applies the index registry first, like the app does at startup.
+Exits 1 when any plan regresses.
+"""
+import asyncio
+import sys
+
+from config import db
+from services.indexes import HOT_QUERIES, ensure_indexes
+
+BAD_STAGES = {"COLLSCAN", "SORT"}
+
+
+def plan_stages(plan: dict) -> list:
+    """Every stage name in a winning plan, classic or slot-based engine."""
+    plan = plan.get("queryPlan", plan)
+    stages = [plan.get("stage")]
+    for child in plan.get("inputStages", []) + [plan[k] for k in ("inputStage", "outerStage", "innerStage") if k in plan]:
+        stages.extend(plan_stages(child))
+    return [s for s in stages if s]
+
+
+def query_planner(result: dict) -> dict:
+    """The queryPlanner section of a find or aggregate explain."""
+    if "queryPlanner" in result:
+        return result["queryPlanner"]
+    # aggregate: the query runs in the first stage, a $cursor
+    return result["stages"][0]["$cursor"]["queryPlanner"]
+
+
+async def explain(query: dict) -> list:
+    if "pipeline" in query:
+        command = {"aggregate": query["collection"], "pipeline": query["pipeline"], "cursor": {}}
+    else:
+        command = {"find": query["collection"], "filter": query["filter"]}
+        if "sort" in query:
+            command["sort"] = query["sort"]
+        if "limit" in query:
+            command["limit"] = query["limit"]
+    result = await db.command({"explain": command, "verbosity": "queryPlanner"})
+    return plan_stages(query_planner(result)["winningPlan"])
+
+
+async def main(ensure: bool) -> int:
+    if ensure:
+        await ensure_indexes()
+
+    failures = 0
+    for query in HOT_QUERIES:
+        stages = await explain(query)
+        bad = BAD_STAGES.intersection(stages)
+        failures += bool(bad)
+        mark = "❌" if bad else "✅"
+        print(f"{mark} {query['name']:<40} {' <- '.join(stages)}")
+    print(f"{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} query plans use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main("--ensure" in sys.argv[1:])))
@@ -0,0 +1,20 @@
+"""
+Rebuild the per-job pipeline counters (jobs.counters) from the candidates
+collection. Safe to re-run; counters are overwritten, not incremented.
+
+Run from the backend folder:
+    python -m scripts.rebuild_job_counters [job_id ...]
+"""
+import asyncio
+import sys
+
+from services.job_counters import rebuild_counters
+
+
+async def main(job_ids):
+    written = await rebuild_counters(job_ids or None)
+    print(f"✅ Rebuilt counters for {written} job(s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,20 @@
+"""
+Rebuild the dashboard metrics rollups (hour/day buckets and totals) from
+the candidates collection. Run while uploads are quiet: events written
+during the rebuild can be lost.
+
+Run from the backend folder:
+    python -m scripts.rebuild_metrics_rollups
+"""
+import asyncio
+
+from services.metrics_rollup import rebuild_rollups
+
+
+async def main():
+    written = await rebuild_rollups()
+    print(f"✅ Wrote {written} metrics rollup documents")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
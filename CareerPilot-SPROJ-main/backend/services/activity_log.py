@@ -0,0 +1,107 @@
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+from config import db
+from services.event_hub import publish_local
+from services.write_batcher import WriteBatcher
+
+MAX_FEED_PAGE = 100
+event_writes = WriteBatcher(db.activity_events, "activity_events")
+
+# event type -> feed text
+ACTIONS = {
+    "upload": "Resume uploaded",
+    "invited": "Interview invite sent",
+    "email_changed": "Email updated",
+    "completed": "Completed interview",
+}
+
+# the fields to_feed_item() reads (_id is always returned)
+FEED_PROJECTION = {"type": 1, "candidate_id": 1, "job_id": 1, "email": 1, "score": 1, "at": 1}
+
+
+def event_doc(event_type: str, candidate_id, email: str = "", job_id: Optional[str] = None,
+              score: Optional[float] = None, at: Optional[datetime] = None) -> dict:
+    return {
+        "type": event_type,
+        "candidate_id": str(candidate_id),
+        "job_id": job_id,
+        "email": email,
+        "score": score,
+        "at": at or datetime.utcnow(),
+    }
+
+
+async def log_event(event_type: str, candidate_id, email: str = "", job_id: Optional[str] = None,
+                    score: Optional[float] = None, at: Optional[datetime] = None):
+    """
+    Append one event to activity_events. The ObjectId _id is the feed
+    order, so reads never sort candidates. A failed write is logged and
+    never fails the request that caused it.
+    """
+    doc = event_doc(event_type, candidate_id, email, job_id, score, at)
+    try:
+        await event_writes.insert_one(doc)
+    except Exception as e:
+        print(f"❌ Activity event '{event_type}' not logged: {e}")
+        return
+    publish_local(to_feed_item(doc))
+
+
+async def log_events(docs: List[dict]):
+    """Append many event_doc()s in one insert; same failure rules as log_event."""
+    if not docs:
+        return
+    try:
+        await db.activity_events.insert_many(docs)
+    except Exception as e:
+        print(f"❌ {len(docs)} activity events not logged: {e}")
+        return
+    for doc in docs:
+        publish_local(to_feed_item(doc))
+
+
+def to_feed_item(doc: dict) -> dict:
+    return {
+        "id": str(doc["_id"]),
+        "type": doc["type"],
+        "action": ACTIONS.get(doc["type"], doc["type"]),
+        "candidate_id": doc.get("candidate_id"),
+        "job_id": doc.get("job_id"),
+        "email": doc.get("email", ""),
+        "score": doc.get("score"),
+        "interview_completed": doc["type"] == "completed",
+        "time": doc.get("at"),
+    }
+
+
+async def events_after(after: str, job_id: Optional[str] = None) -> List[dict]:
+    """Events newer than `after` (oldest first), to replay on SSE reconnect."""
+    try:
+        query = {"_id": {"$gt": ObjectId(after)}}
+    except InvalidId:
+        return []
+    if job_id:
+        query["job_id"] = job_id
+    cursor = db.activity_events.find(query, FEED_PROJECTION).sort("_id", 1).limit(MAX_FEED_PAGE)
+    rows = await cursor.to_list(MAX_FEED_PAGE)
+    return [to_feed_item(r) for r in rows]
+
+
+async def recent_events(limit: int, before: Optional[str] = None, job_id: Optional[str] = None) -> List[dict]:
+    """Newest events first; `before` is the id of the last event already shown."""
+    query = {}
+    if before:
+        try:
+            query["_id"] = {"$lt": ObjectId(before)}
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    if job_id:
+        query["job_id"] = job_id
+    # HOT_QUERIES "activity feed" and "activity feed for job" in services/indexes.py
+    rows = await db.activity_events.find(query, FEED_PROJECTION).sort("_id", -1).limit(limit).to_list(limit)
+    return [to_feed_item(r) for r in rows]
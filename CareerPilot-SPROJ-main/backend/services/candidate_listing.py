@@ -0,0 +1,103 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+from config import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Same rule the listings always used: a finished interview wins over `status`
+STATUS_EXPR = {
+    "$cond": [{"$eq": ["$interview_completed", True]}, "Completed", {"$ifNull": ["$status", "Invited"]}]
+}
+
+
+def encode_cursor(uploaded_at: Optional[datetime], candidate_id: ObjectId) -> str:
+    payload = {"t": uploaded_at.isoformat() if uploaded_at else None, "id": str(candidate_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Mongo filter for the rows that come after `cursor` in (uploaded_at, _id) desc order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        after_id = ObjectId(payload["id"])
+        uploaded_at = datetime.fromisoformat(payload["t"]) if payload["t"] else None
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if uploaded_at is None:
+        # rows without uploaded_at sort last; only the _id tie-break is left
+        return {"uploaded_at": None, "_id": {"$lt": after_id}}
+    return {"$or": [
+        {"uploaded_at": {"$lt": uploaded_at}},
+        {"uploaded_at": uploaded_at, "_id": {"$lt": after_id}},
+        {"uploaded_at": None},
+    ]}
+
+
+async def status_counts(match: dict) -> dict:
+    """Candidates per status and in total, in one aggregation."""
+    pipeline = [
+        {"$match": match},
+        {"$facet": {
+            "by_status": [{"$group": {"_id": STATUS_EXPR, "n": {"$sum": 1}}}],
+            "total": [{"$count": "n"}],
+        }},
+    ]
+    # HOT_QUERIES "status_counts" in services/indexes.py
+    result = (await db.candidates.aggregate(pipeline).to_list(1))[0]
+    counts = {c["_id"]: c["n"] for c in result["by_status"]}
+    counts["total"] = result["total"][0]["n"] if result["total"] else 0
+    return counts
+
+
+async def list_page(match: dict, fields: List[str], limit: int, cursor: Optional[str] = None) -> dict:
+    """
+    One page of candidates, newest first, plus status totals over the whole
+    `match`. The page is a keyset query on (uploaded_at, _id) so it walks an
+    index instead of skipping; only `fields` are projected, so credentials
+    and resume paths never leave Mongo.
+    """
+    page_match = {"$and": [match, decode_cursor(cursor)]} if cursor else match
+    projection = {f: 1 for f in fields}
+    projection.update({"uploaded_at": 1, "status": 1, "interview_completed": 1})
+
+    # HOT_QUERIES "list_candidates_for_job", its next page, and "list_candidates" in services/indexes.py
+    page_query = (
+        db.candidates.find(page_match, projection)
+        .sort([("uploaded_at", -1), ("_id", -1)])
+        .limit(limit + 1)
+    )
+    rows, counts = await asyncio.gather(page_query.to_list(limit + 1), status_counts(match))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].get("uploaded_at"), rows[-1]["_id"])
+
+    items = []
+    for r in rows:
+        item = {"id": str(r["_id"])}
+        for f in fields:
+            item[f] = r.get(f, [] if f == "skills" else "")
+        item["status"] = "Completed" if r.get("interview_completed") else r.get("status", "Invited")
+        item["uploaded_at"] = r.get("uploaded_at")
+        items.append(item)
+
+    return {
+        "total": counts["total"],
+        "invited": counts.get("Invited", 0),
+        "completed": counts.get("Completed", 0),
+        "in_progress": counts.get("In Progress", 0),
+        "candidates": items,
+        "next_cursor": next_cursor,
+    }
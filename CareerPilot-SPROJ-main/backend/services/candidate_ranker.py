@@ -0,0 +1,140 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from config import db
+from services.skill_matcher import get_matcher
+
+SYNC_OVERLAP = timedelta(seconds=2)  # tolerate small clock skew between workers
+
+
+class SkillVocabulary:
+    """Maps normalized skill names to bit positions, growing on demand."""
+
+    def __init__(self):
+        self.bit_of: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def encode(self, skills: List[str]) -> int:
+        matcher = get_matcher()
+        bits = 0
+        for skill in skills:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            name = matcher.normalize(skill)
+            bit = self.bit_of.get(name)
+            if bit is None:
+                bit = len(self.names)
+                self.bit_of[name] = bit
+                self.names.append(name)
+            bits |= 1 << bit
+        return bits
+
+    def decode(self, bits: int) -> List[str]:
+        names = []
+        while bits:
+            low = bits & -bits
+            names.append(self.names[low.bit_length() - 1])
+            bits ^= low
+        return names
+
+
+class JobIndex:
+    """Skill bitsets of every candidate of one job, in parallel lists."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.bits: List[int] = []
+        self.position: Dict[str, int] = {}
+        self.synced_until: Optional[datetime] = None
+
+    def upsert(self, candidate_id: str, bits: int):
+        pos = self.position.get(candidate_id)
+        if pos is None:
+            self.position[candidate_id] = len(self.ids)
+            self.ids.append(candidate_id)
+            self.bits.append(bits)
+        else:
+            self.bits[pos] = bits
+
+    def remove(self, candidate_id: str):
+        pos = self.position.pop(candidate_id, None)
+        if pos is None:
+            return
+        last_id, last_bits = self.ids.pop(), self.bits.pop()
+        if pos < len(self.ids):  # move the last entry into the hole
+            self.ids[pos], self.bits[pos] = last_id, last_bits
+            self.position[last_id] = pos
+
+
+class CandidateRanker:
+    """
+    Ranks a job's candidates by skill overlap.
+
+    Each candidate is a bitset over the shared skill vocabulary, so scoring
+    a whole job is one pass of AND + popcount over a list of ints. Job
+    indexes are built from Mongo on first use, updated in place when this
+    worker ingests a resume, and caught up before each ranking with an
+    `updated_at` query (overlapping the last one, like the search index)
+    so resumes ingested or edited by other workers show up too. Deletes
+    and moves to another job don't match that query; when the job's
+    candidate count no longer matches the index, the ids that are gone
+    are dropped.
+    """
+
+    def __init__(self):
+        self.vocab = SkillVocabulary()
+        self.jobs: Dict[str, JobIndex] = {}
+
+    def add_candidate(self, job_id: Optional[str], candidate_id: str, skills: List[str]):
+        index = self.jobs.get(job_id) if job_id else None
+        if index is not None:
+            index.upsert(candidate_id, self.vocab.encode(skills))
+
+    async def _load(self, index: JobIndex, query: dict):
+        stamp = datetime.utcnow()
+        # HOT_QUERIES "ranker sync" in services/indexes.py
+        async for doc in db.candidates.find(query, {"skills": 1}):
+            index.upsert(str(doc["_id"]), self.vocab.encode(doc.get("skills", [])))
+        index.synced_until = stamp
+
+    async def _sync(self, job_id: str) -> JobIndex:
+        index = self.jobs.get(job_id)
+        if index is None:
+            index = self.jobs[job_id] = JobIndex()
+
+        if index.synced_until is None:
+            await self._load(index, {"job_id": job_id})
+            return index
+
+        await self._load(index, {"job_id": job_id, "updated_at": {"$gte": index.synced_until - SYNC_OVERLAP}})
+        if await db.candidates.count_documents({"job_id": job_id}) != len(index.ids):
+            current = {str(doc["_id"]) async for doc in db.candidates.find({"job_id": job_id}, {"_id": 1})}
+            for candidate_id in [c for c in index.ids if c not in current]:
+                index.remove(candidate_id)
+        return index
+
+    def score(self, index: JobIndex, job_bits: int, k: int) -> List[tuple]:
+        """Top-k (position, matched count) by number of job skills matched."""
+        overlaps = [(b & job_bits).bit_count() for b in index.bits]
+        top = heapq.nlargest(k, range(len(overlaps)), key=overlaps.__getitem__)
+        return [(pos, overlaps[pos]) for pos in top]
+
+    async def rank(self, job_id: str, job_skills: List[str], k: int) -> dict:
+        index = await self._sync(job_id)
+        job_bits = self.vocab.encode(job_skills)
+        wanted = job_bits.bit_count()
+
+        ranked = []
+        for pos, matched in self.score(index, job_bits, k):
+            cand_bits = index.bits[pos]
+            ranked.append({
+                "id": index.ids[pos],
+                "score": round(matched / wanted, 3) if wanted else 0.0,
+                "matched_skills": self.vocab.decode(cand_bits & job_bits),
+                "missing_skills": self.vocab.decode(job_bits & ~cand_bits),
+            })
+        return {"total": len(index.ids), "job_skills": self.vocab.decode(job_bits), "ranked": ranked}
+
+
+ranker = CandidateRanker()
@@ -0,0 +1,212 @@
+import asyncio
+import bisect
+import heapq
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from config import db
+
+SEARCH_SYNC_SECONDS = float(os.getenv("SEARCH_SYNC_SECONDS", 5))
+SYNC_OVERLAP = timedelta(seconds=2)  # tolerate small clock skew between workers
+MAX_PREFIX_EXPANSIONS = 200
+
+# Letters and digits split apart so "khan123@gmail.com" indexes as khan,
+# 123, gmail, com instead of one unique token per address.
+TOKEN_RE = re.compile(r"[a-z]+[+#]*|[0-9]+")
+
+# field -> weight of a hit in that field
+FIELD_WEIGHTS = {
+    "full_name": 3.0,
+    "email": 2.0,
+    "skills": 2.0,
+    "domain": 1.0,
+    "job_role": 1.0,
+}
+PROJECTION = {f: 1 for f in (*FIELD_WEIGHTS, "job_id", "status", "interview_completed")}
+
+
+def tokenize(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        value = " ".join(v for v in value if isinstance(v, str))
+    return TOKEN_RE.findall(str(value).lower())
+
+
+class CandidateSearchIndex:
+    """
+    Inverted index over candidate name, email, skills, domain and job role.
+
+    postings[token] maps candidate id -> summed field weight, and
+    tiers[token] groups the same ids by weight so a query can walk them
+    best-first. `terms` is the sorted vocabulary, so a prefix query is a
+    bisect plus a short forward scan. Every query term must match (AND);
+    results are ranked by the sum of field weights, with exact term hits
+    counting double.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.tiers: Dict[str, Dict[float, set]] = {}
+        self.terms: List[str] = []
+        self.docs: Dict[str, dict] = {}
+        self.doc_terms: Dict[str, List[str]] = {}
+        self.synced_until: Optional[datetime] = None
+        self.last_sync = 0.0
+        self._sync_lock = asyncio.Lock()
+
+    def upsert(self, candidate_id: str, doc: dict):
+        self.remove(candidate_id)
+        weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(doc.get(field)):
+                weights[token] = weights.get(token, 0.0) + weight
+
+        for token, weight in weights.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                self.tiers[token] = {}
+                bisect.insort(self.terms, token)
+            posting[candidate_id] = weight
+            self.tiers[token].setdefault(weight, set()).add(candidate_id)
+
+        self.doc_terms[candidate_id] = list(weights)
+        self.docs[candidate_id] = {
+            "id": candidate_id,
+            "full_name": doc.get("full_name", ""),
+            "email": doc.get("email", ""),
+            "job_id": doc.get("job_id"),
+            "job_role": doc.get("job_role", ""),
+            "domain": doc.get("domain", ""),
+            "skills": doc.get("skills", []),
+            "status": "Completed" if doc.get("interview_completed") else doc.get("status", "Invited"),
+        }
+
+    def update(self, candidate_id: str, fields: dict):
+        """Apply a partial update on top of what is indexed."""
+        current = self.docs.get(candidate_id)
+        if current is not None:
+            self.upsert(candidate_id, {**current, **fields})
+
+    def remove(self, candidate_id: str):
+        for token in self.doc_terms.pop(candidate_id, []):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            weight = posting.pop(candidate_id, None)
+            tiers = self.tiers[token]
+            if weight is not None:
+                tiers[weight].discard(candidate_id)
+                if not tiers[weight]:
+                    del tiers[weight]
+            if not posting:
+                del self.postings[token]
+                del self.tiers[token]
+                i = bisect.bisect_left(self.terms, token)
+                if i < len(self.terms) and self.terms[i] == token:
+                    self.terms.pop(i)
+        self.docs.pop(candidate_id, None)
+
+    def _expand(self, term: str) -> List[tuple]:
+        """(token, boost) for every indexed token starting with `term`."""
+        i = bisect.bisect_left(self.terms, term)
+        expansions = []
+        for token in self.terms[i:i + MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(term):
+                break
+            expansions.append((token, 2.0 if token == term else 1.0))
+        return expansions
+
+    def _bound(self, expansions: List[tuple]) -> float:
+        """Highest score any candidate can get from one query term."""
+        return max(max(self.tiers[token]) * boost for token, boost in expansions)
+
+    def _score(self, cid: str, expansions: List[tuple]) -> float:
+        best = 0.0
+        for token, boost in expansions:
+            weight = self.postings[token].get(cid)
+            if weight is not None and weight * boost > best:
+                best = weight * boost
+        return best
+
+    def search(self, query: str, limit: int = 20, job_id: Optional[str] = None) -> List[dict]:
+        terms = set(TOKEN_RE.findall(query.lower()))
+        if not terms:
+            return []
+
+        expanded = [self._expand(t) for t in terms]
+        if not all(expanded):
+            return []
+        # Drive the AND from the rarest term; the others are only probed
+        expanded.sort(key=lambda e: sum(len(self.postings[token]) for token, _ in e))
+        seed, rest = expanded[0], expanded[1:]
+        rest_bound = sum(self._bound(e) for e in rest)
+
+        # Walk the seed term's candidates best tier first, and stop once no
+        # remaining tier can beat the current top `limit`.
+        tiers = sorted(
+            ((weight * boost, ids) for token, boost in seed for weight, ids in self.tiers[token].items()),
+            key=lambda tier: -tier[0],
+        )
+        top: List[tuple] = []  # min-heap of (score, cid)
+        seen = set()
+        for seed_score, ids in tiers:
+            bound = seed_score + rest_bound
+            if len(top) >= limit and bound <= top[0][0]:
+                break
+            for cid in ids:
+                if len(top) >= limit and bound <= top[0][0]:
+                    break
+                if cid in seen:
+                    continue
+                seen.add(cid)  # first visit is the cid's best seed score
+                if job_id and self.docs[cid]["job_id"] != job_id:
+                    continue
+                total = seed_score
+                for expansions in rest:
+                    score = self._score(cid, expansions)
+                    if not score:
+                        break
+                    total += score
+                else:
+                    if len(top) < limit:
+                        heapq.heappush(top, (total, cid))
+                    elif total > top[0][0]:
+                        heapq.heapreplace(top, (total, cid))
+
+        best = sorted(top, reverse=True)
+        return [{**self.docs[cid], "score": round(score, 2)} for score, cid in best]
+
+    async def _load(self, query: dict):
+        stamp = datetime.utcnow()
+        async for doc in db.candidates.find(query, PROJECTION):
+            self.upsert(str(doc["_id"]), doc)
+        self.synced_until = stamp
+        self.last_sync = time.monotonic()
+
+    async def build(self):
+        """Load every candidate from Mongo (startup)."""
+        started = time.perf_counter()
+        await self._load({})
+        print(f"✅ Candidate search index: {len(self.docs)} candidates in {time.perf_counter() - started:.2f}s")
+
+    async def sync(self):
+        """
+        Pick up inserts and edits made by other workers, at most every
+        SEARCH_SYNC_SECONDS, via the candidates' updated_at stamp.
+        """
+        if time.monotonic() - self.last_sync < SEARCH_SYNC_SECONDS or self._sync_lock.locked():
+            return
+        async with self._sync_lock:
+            if self.synced_until is None:
+                await self._load({})
+            else:
+                # HOT_QUERIES "search index sync" in services/indexes.py
+                await self._load({"updated_at": {"$gte": self.synced_until - SYNC_OVERLAP}})
+
+
+search_index = CandidateSearchIndex()
@@ -1,14 +1,19 @@
-import os, random, string
+import os, random, string, asyncio
 from datetime import datetime
-from fastapi import UploadFile, BackgroundTasks
+from fastapi import UploadFile
 from bson import ObjectId
-from typing import Optional
+from typing import List, Optional
 
-from config import db
-from utils import save_upload, extract_email_from_text, get_text_from_pdf, create_clerk_user
-from routes.resume import parse_resume_regex
 from clerk_backend_api import Clerk
-from emailer import build_interview_email_html, send_email_background
+from services.ingestion import save_stage, parse_stage, provision_stage, insert_stage
+from services.parse_cache import get_cached_parse, store_parse
+from services.candidate_ranker import ranker
+from services.candidate_search import search_index
+from services.job_counters import bump
+from services.metrics_rollup import record
+from services.activity_log import log_event
+from services.email_outbox import outbox
+from emailer import INTERVIEW_INVITE, INTERVIEW_INVITE_SUBJECT, interview_invite_context
 
 clerk = Clerk(bearer_auth=os.getenv("CLERK_SECRET_KEY"))
 
@@ -18,21 +23,24 @@ def random_string(length=32):
 async def process_resume(
     file: UploadFile,
     job_id: Optional[str],
-    background_tasks: BackgroundTasks,
     job_title: Optional[str] = None,
     job_seniority: Optional[str] = None
 ):
-    # Save PDF & extract text
-    path = await save_upload(file)
-    text = get_text_from_pdf(path) or ""
-    parsed = parse_resume_regex(text)
+    # Save PDF under its content hash; only parse files we haven't seen before
+    path, sha256 = await save_stage(file)
+    result = await get_cached_parse(sha256)
+    if result is None:
+        result = await parse_stage(path)
+        await store_parse(sha256, result)
+    parsed = result["parsed"]
 
+    skill_match = result["skill_match"]
     name = parsed.get("name") or "Candidate"
-    domain = parsed.get("domain")
-    skills = parsed.get("skills", [])
+    domain = skill_match["domain"]
+    skills = skill_match["skills"] or parsed.get("skills", [])
 
-    real_email = extract_email_from_text(text) or f"{random_string(8)}@placeholder.ai"
-    clerk_creds = create_clerk_user(full_name=name)
+    real_email = result["email"] or f"{random_string(8)}@placeholder.ai"
+    clerk_creds = await provision_stage(name)
     magic_token = random_string(32)
 
 
@@ -47,22 +55,29 @@ async def process_resume(
         "job_seniority": job_seniority,  # <-- add this
         "resume_filename": os.path.basename(path),
         "resume_path": path,
+        "resume_sha256": sha256,
         "temp_username": clerk_creds["email"],
         "temp_password": clerk_creds["password"],
         "clerk_user_id": clerk_creds["clerk_user_id"],
         "magic_token": magic_token,
         "uploaded_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
         "invite_sent": False,
         "interview_completed": False,
     }
 
 
-    ins = await db.candidates.insert_one(candidate_doc)
+    ins = await insert_stage(candidate_doc)
+    ranker.add_candidate(job_id, str(ins.inserted_id), candidate_doc["skills"])
+    search_index.upsert(str(ins.inserted_id), candidate_doc)
+    await bump(job_id, resumes=1)
+    await record(uploads=1, at=candidate_doc["uploaded_at"])
+    await log_event("upload", ins.inserted_id, real_email, job_id, at=candidate_doc["uploaded_at"])
 
     # Build invite email with job context
     frontend_base = os.getenv("FRONTEND_BASE_URL", "http://localhost:5173")
     magic_url = f"{frontend_base.rstrip('/')}/interview/magic/{magic_token}"
-    html = build_interview_email_html(
+    context = interview_invite_context(
         name,
         magic_url,
         clerk_creds["email"],
@@ -70,12 +85,34 @@ async def process_resume(
         job_title=job_title,
         job_seniority=job_seniority
     )
-
-    background_tasks.add_task(
-        send_email_background,
-        real_email,
-        "CareerPilot: AI Interview Invite",
-        html
+    await outbox.enqueue(
+        real_email, INTERVIEW_INVITE_SUBJECT, INTERVIEW_INVITE, context,
+        candidate_id=ins.inserted_id, job_id=job_id,
     )
 
     return {"id": str(ins.inserted_id), "email": real_email, "filename": file.filename}
+
+
+async def ingest_resumes(
+    files: List[UploadFile],
+    job_id: Optional[str],
+    job_title: Optional[str] = None,
+    job_seniority: Optional[str] = None
+):
+    """
+    Run every file through process_resume concurrently. Each stage has its own
+    concurrency limit, so a large batch never blocks the event loop. A failing
+    file is reported under "failed" and does not abort the rest of the batch.
+    """
+    async def run_one(file: UploadFile):
+        try:
+            return await process_resume(file, job_id, job_title, job_seniority)
+        except Exception as e:
+            print(f"❌ Resume ingestion failed for {file.filename}: {e}")
+            return {"filename": file.filename, "error": str(e)}
+
+    results = await asyncio.gather(*(run_one(f) for f in files))
+    return {
+        "created": [r for r in results if "error" not in r],
+        "failed": [r for r in results if "error" in r],
+    }
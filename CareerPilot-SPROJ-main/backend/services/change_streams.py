@@ -0,0 +1,32 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from pymongo.errors import OperationFailure
+
+RETRY_SECONDS = 5
+
+
+async def watch(collection, pipeline: list, on_change: Callable[[dict], Optional[Awaitable]],
+                label: str, full_document: Optional[str] = None):
+    """
+    Run a change stream forever, calling on_change for every event. Resumes
+    after the last seen event when the stream drops; starts again from now
+    if the oplog no longer has that point. Needs a replica set.
+    """
+    resume_token = None
+    while True:
+        try:
+            async with collection.watch(pipeline, resume_after=resume_token, full_document=full_document) as stream:
+                print(f"✅ {label} change stream connected")
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    result = on_change(change)
+                    if asyncio.iscoroutine(result):
+                        await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, OperationFailure) and e.code == 286:  # ChangeStreamHistoryLost
+                resume_token = None
+            print(f"❌ {label} change stream error, retrying: {e}")
+            await asyncio.sleep(RETRY_SECONDS)
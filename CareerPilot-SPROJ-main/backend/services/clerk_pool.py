@@ -0,0 +1,126 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ASCENDING
+
+from config import db
+from utils import create_clerk_user, rename_clerk_user
+
+CLERK_POOL_LOW_WATER = int(os.getenv("CLERK_POOL_LOW_WATER", 20))
+CLERK_POOL_TARGET = int(os.getenv("CLERK_POOL_TARGET", CLERK_POOL_LOW_WATER * 2))
+CLERK_CONCURRENCY = int(os.getenv("INGEST_CLERK_CONCURRENCY", 4))
+REFILL_INTERVAL = 60  # seconds between checks when nothing is claimed
+
+# clerk_account_pool.status
+AVAILABLE, CLAIMED = "available", "claimed"
+
+
+class ClerkAccountPool:
+    """
+    Temp interview accounts created ahead of time in clerk_account_pool.
+
+    Ingestion claims one with a single find_one_and_update, so it never
+    waits on Clerk; the account gets the candidate's name afterwards in
+    the background. The refill loop creates accounts whenever fewer than
+    low_water are available, up to target. If the pool runs dry the
+    account is created inline, as before.
+    """
+
+    def __init__(self, collection, low_water: int = CLERK_POOL_LOW_WATER,
+                 target: int = CLERK_POOL_TARGET, concurrency: int = CLERK_CONCURRENCY):
+        self.collection = collection
+        self.low_water = low_water
+        self.target = max(target, low_water)
+        self.slots = asyncio.Semaphore(concurrency)
+        self.wake = asyncio.Event()
+        self.renames = set()
+        self.counts = {"claimed": 0, "fallback": 0, "created": 0, "create_failures": 0, "rename_failures": 0}
+
+    async def claim(self, full_name: Optional[str] = None) -> dict:
+        """An account for one candidate: {"clerk_user_id", "email", "password"}."""
+        # HOT_QUERIES "clerk pool claim" in services/indexes.py
+        doc = await self.collection.find_one_and_update(
+            {"status": AVAILABLE},
+            {"$set": {"status": CLAIMED, "claimed_at": datetime.utcnow()}},
+            projection={"clerk_user_id": 1, "email": 1, "password": 1},
+            sort=[("created_at", ASCENDING)],
+        )
+        self.wake.set()  # the refill loop decides whether to top up
+        if doc is None:
+            self.counts["fallback"] += 1
+            print("❌ Clerk account pool empty, creating account inline")
+            # clerk_backend_api is synchronous; keep it off the event loop, and
+            # within the same concurrency bound as the refill and renames
+            async with self.slots:
+                return await asyncio.to_thread(create_clerk_user, full_name=full_name)
+
+        self.counts["claimed"] += 1
+        if full_name:
+            task = asyncio.create_task(self._rename(doc["clerk_user_id"], full_name))
+            self.renames.add(task)
+            task.add_done_callback(self.renames.discard)
+        return {"clerk_user_id": doc["clerk_user_id"], "email": doc["email"], "password": doc["password"]}
+
+    async def _rename(self, clerk_user_id: str, full_name: str):
+        try:
+            async with self.slots:
+                await asyncio.to_thread(rename_clerk_user, clerk_user_id, full_name)
+        except Exception as e:
+            # cosmetic: the interview login works without a name
+            self.counts["rename_failures"] += 1
+            print(f"❌ Clerk rename failed for {clerk_user_id}: {e}")
+
+    async def _create(self) -> dict:
+        async with self.slots:
+            return await asyncio.to_thread(create_clerk_user)
+
+    async def top_up(self) -> Optional[int]:
+        """
+        Create accounts if the pool is below low_water. Returns how many
+        were added, or None if Clerk failed every time.
+        """
+        available = await self.collection.count_documents({"status": AVAILABLE})
+        if available >= self.low_water:
+            return 0
+        results = await asyncio.gather(
+            *(self._create() for _ in range(self.target - available)), return_exceptions=True
+        )
+        accounts = [r for r in results if isinstance(r, dict)]
+        failures = [r for r in results if isinstance(r, BaseException)]
+        self.counts["create_failures"] += len(failures)
+        if failures:
+            print(f"❌ {len(failures)} Clerk pool account(s) not created: {failures[0]}")
+        if not accounts:
+            return None
+
+        now = datetime.utcnow()
+        await self.collection.insert_many(
+            [{**a, "status": AVAILABLE, "created_at": now} for a in accounts], ordered=False
+        )
+        self.counts["created"] += len(accounts)
+        return len(accounts)
+
+    async def run_refill_loop(self):
+        while True:
+            self.wake.clear()
+            try:
+                added = await self.top_up()
+            except Exception as e:
+                print("❌ Clerk pool top-up failed:", e)
+                added = None
+            if added is None:
+                # Clerk or Mongo is down: don't retry on every claim
+                await asyncio.sleep(REFILL_INTERVAL)
+                continue
+            try:
+                await asyncio.wait_for(self.wake.wait(), REFILL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {**self.counts, "low_water": self.low_water, "target": self.target}
+
+
+clerk_pool = ClerkAccountPool(db.clerk_account_pool)
@@ -0,0 +1,269 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from config import db
+from emailer import TEMPLATES, render
+from services.write_batcher import WriteBatcher
+
+SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
+SENDGRID_API_HOST = os.getenv("SENDGRID_API_HOST", "https://api.sendgrid.com")
+FROM_EMAIL = os.getenv("SENDGRID_FROM_EMAIL")
+MAX_PERSONALIZATIONS = 1000  # SendGrid's limit per mail/send call
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", MAX_PERSONALIZATIONS))
+MAX_ATTEMPTS = 6
+RETRY_BASE = 30      # seconds, doubled on every attempt
+LEASE_SECONDS = 120  # a claimed batch not marked by then is picked up again
+POLL_INTERVAL = 5    # seconds between scans for due retries
+
+# email_outbox.status
+QUEUED, SENDING, SENT, FAILED = "queued", "sending", "sent", "failed"
+RETRY, REJECTED = "retry", "rejected"  # SendGridSender outcomes besides SENT
+
+
+class SendGridSender:
+    """
+    Posts to SendGrid's v3 mail/send on one pooled httpx.AsyncClient.
+
+    All messages in a call share template and subject; each recipient is a
+    personalization whose substitutions fill the template's placeholders.
+    Without SENDGRID_API_KEY the emails are printed instead (dev mode).
+    """
+
+    def __init__(self, api_key: Optional[str] = SENDGRID_API_KEY, host: str = SENDGRID_API_HOST,
+                 from_email: Optional[str] = FROM_EMAIL, client: Optional[httpx.AsyncClient] = None):
+        self.api_key = api_key
+        self.url = f"{host.rstrip('/')}/v3/mail/send"
+        self.from_email = from_email
+        self.client = client
+        self.calls = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=15.0,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self.client
+
+    def payload(self, messages: List[dict]) -> dict:
+        first = messages[0]
+        return {
+            "from": {"email": self.from_email},
+            "subject": first["subject"],
+            "content": [{"type": "text/html", "value": TEMPLATES[first["template"]]}],
+            "personalizations": [
+                {
+                    "to": [{"email": m["to"]}],
+                    "substitutions": {f"-{k}-": str(v) for k, v in m["context"].items()},
+                }
+                for m in messages
+            ],
+        }
+
+    async def send(self, messages: List[dict]) -> Tuple[str, Optional[str], float]:
+        """
+        One API call for up to MAX_PERSONALIZATIONS messages. Returns
+        (SENT, message_id, 0), (RETRY, error, seconds_to_wait) for rate
+        limits, 5xx and network errors, or (REJECTED, error, 0).
+        """
+        if not self.api_key:
+            for m in messages:
+                print("📧 [DEV EMAIL] To:", m["to"])
+                print("Subject:", m["subject"])
+                print(render(m["template"], m["context"]))
+            return SENT, None, 0
+
+        self.calls += 1
+        try:
+            resp = await self._client().post(
+                self.url, json=self.payload(messages),
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+        except httpx.HTTPError as e:
+            return RETRY, f"{type(e).__name__}: {e}", 0
+
+        if resp.status_code in (200, 202):
+            return SENT, resp.headers.get("X-Message-Id"), 0
+        error = f"{resp.status_code} {resp.text[:300]}"
+        if resp.status_code == 429 or resp.status_code >= 500:
+            reset = resp.headers.get("X-RateLimit-Reset")
+            return RETRY, error, max(float(reset) - time.time(), 0) if reset else 0
+        return REJECTED, error, 0
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+
+
+class EmailOutbox:
+    """
+    Durable queue of outgoing emails in the email_outbox collection.
+
+    Routes enqueue; the delivery worker claims due messages (lease-based,
+    so several app instances can share the outbox), groups them by
+    template and subject into SendGrid calls, and records the outcome on
+    each message. Transient failures back off exponentially up to
+    MAX_ATTEMPTS. If SendGrid rejects a batch, its messages are retried
+    one by one so a single bad address doesn't fail the rest. Delivery is
+    at-least-once: a worker that dies mid-call leaves its lease to expire.
+    """
+
+    def __init__(self, collection, sender: SendGridSender, batch_size: int = OUTBOX_BATCH_SIZE):
+        self.collection = collection
+        self.sender = sender
+        self.batch_size = batch_size
+        self.writes = WriteBatcher(collection, "email_outbox")
+        self.wake = asyncio.Event()
+        self.counts = {"sent": 0, "retried": 0, "failed": 0}
+
+    @staticmethod
+    def message(to: str, subject: str, template: str, context: dict, **meta) -> dict:
+        now = datetime.utcnow()
+        return {
+            "to": to,
+            "subject": subject,
+            "template": template,
+            "context": context,
+            **meta,
+            "status": QUEUED,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+        }
+
+    async def enqueue(self, to: str, subject: str, template: str, context: dict, **meta) -> ObjectId:
+        """Queue one email; meta (candidate_id, job_id, ...) is stored alongside."""
+        result = await self.writes.insert_one(self.message(to, subject, template, context, **meta))
+        self.wake.set()
+        return result.inserted_id
+
+    async def enqueue_many(self, messages: List[dict]) -> List[ObjectId]:
+        """Queue documents built with EmailOutbox.message in one insert."""
+        if not messages:
+            return []
+        result = await self.collection.insert_many(messages, ordered=False)
+        self.wake.set()
+        return result.inserted_ids
+
+    async def _claim(self) -> List[dict]:
+        now = datetime.utcnow()
+        # leases left behind by a worker that died mid-send
+        # (HOT_QUERIES "outbox expired leases" in services/indexes.py)
+        await self.collection.update_many(
+            {"status": SENDING, "lease_until": {"$lt": now}},
+            {"$set": {"status": QUEUED}, "$unset": {"claim": ""}},
+        )
+        due = {"status": QUEUED, "next_attempt_at": {"$lte": now}}
+        # HOT_QUERIES "outbox due" in services/indexes.py
+        ids = [d["_id"] async for d in
+               self.collection.find(due, {"_id": 1}).sort("next_attempt_at", 1).limit(self.batch_size)]
+        if not ids:
+            return []
+        token = ObjectId()
+        await self.collection.update_many(
+            {"_id": {"$in": ids}, **due},
+            {"$set": {"status": SENDING, "claim": token, "lease_until": now + timedelta(seconds=LEASE_SECONDS)}},
+        )
+        # only what this worker won; another instance may have claimed the rest
+        # HOT_QUERIES "outbox claim" in services/indexes.py
+        return await self.collection.find({"claim": token}).to_list(None)
+
+    async def _mark_sent(self, docs: List[dict], message_id: Optional[str]):
+        await self.collection.update_many(
+            {"_id": {"$in": [d["_id"] for d in docs]}},
+            {"$set": {"status": SENT, "sent_at": datetime.utcnow(), "sendgrid_message_id": message_id,
+                      "last_error": None},
+             "$inc": {"attempts": 1},
+             "$unset": {"claim": "", "lease_until": ""}},
+        )
+        self.counts["sent"] += len(docs)
+
+    async def _mark_unsent(self, docs: List[dict], error: str, retry_after: float, final: bool = False):
+        now = datetime.utcnow()
+        ops = []
+        for d in docs:
+            attempts = d.get("attempts", 0) + 1
+            if final or attempts >= MAX_ATTEMPTS:
+                update = {"status": FAILED, "failed_at": now}
+                self.counts["failed"] += 1
+            else:
+                delay = max(RETRY_BASE * 2 ** (attempts - 1), retry_after)
+                update = {"status": QUEUED, "next_attempt_at": now + timedelta(seconds=delay)}
+                self.counts["retried"] += 1
+            ops.append(UpdateOne(
+                {"_id": d["_id"]},
+                {"$set": {**update, "attempts": attempts, "last_error": error},
+                 "$unset": {"claim": "", "lease_until": ""}},
+            ))
+        await self.collection.bulk_write(ops, ordered=False)
+
+    async def _deliver(self, docs: List[dict]):
+        groups: Dict[Tuple[str, str], List[dict]] = {}
+        for d in docs:
+            groups.setdefault((d["template"], d["subject"]), []).append(d)
+
+        for group in groups.values():
+            for i in range(0, len(group), MAX_PERSONALIZATIONS):
+                batch = group[i:i + MAX_PERSONALIZATIONS]
+                status, detail, retry_after = await self.sender.send(batch)
+                if status == REJECTED and len(batch) > 1:
+                    for d in batch:
+                        status, detail, retry_after = await self.sender.send([d])
+                        await self._record([d], status, detail, retry_after)
+                else:
+                    await self._record(batch, status, detail, retry_after)
+
+    async def _record(self, docs: List[dict], status: str, detail: Optional[str], retry_after: float):
+        if status == SENT:
+            await self._mark_sent(docs, detail)
+        else:
+            if status == REJECTED:
+                print(f"❌ SendGrid rejected email to {docs[0]['to']}: {detail}")
+            await self._mark_unsent(docs, detail, retry_after, final=status == REJECTED)
+
+    async def drain_once(self) -> int:
+        """Claim and deliver one batch; returns how many messages it held."""
+        docs = await self._claim()
+        if docs:
+            await self._deliver(docs)
+        return len(docs)
+
+    async def run(self):
+        """Delivery worker: drain while there is work, then wait for an enqueue or the poll."""
+        while True:
+            self.wake.clear()
+            try:
+                if await self.drain_once():
+                    continue
+            except Exception as e:
+                print("❌ Email outbox delivery failed:", e)
+            try:
+                await asyncio.wait_for(self.wake.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def status_counts(self) -> dict:
+        # each count is answered from the status_due index
+        statuses = (QUEUED, SENDING, SENT, FAILED)
+        counts = await asyncio.gather(*(self.collection.count_documents({"status": s}) for s in statuses))
+        return dict(zip(statuses, counts))
+
+    async def recent_failures(self, limit: int = 20) -> List[dict]:
+        # HOT_QUERIES "outbox failures" in services/indexes.py
+        return await self.collection.find(
+            {"status": FAILED},
+            {"to": 1, "subject": 1, "attempts": 1, "last_error": 1, "failed_at": 1, "candidate_id": 1, "job_id": 1},
+        ).sort("failed_at", -1).limit(limit).to_list(limit)
+
+    def stats(self) -> dict:
+        return {**self.counts, "api_calls": self.sender.calls}
+
+
+outbox = EmailOutbox(db.email_outbox, SendGridSender())
@@ -0,0 +1,104 @@
+import asyncio
+import os
+from typing import Dict, Iterable, Optional, Set
+
+from config import db
+from services.change_streams import watch
+
+SUBSCRIBER_QUEUE_SIZE = 256
+# With change streams on, every worker learns about every event from Mongo
+# (needs a replica set); otherwise events only reach this worker's clients.
+ACTIVITY_CHANGE_STREAM = os.getenv("ACTIVITY_CHANGE_STREAM", "0") == "1"
+
+
+class Subscription:
+    def __init__(self, hub: "EventHub", topics: Iterable[str]):
+        self.hub = hub
+        self.topics = list(topics)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def deliver(self, event: dict):
+        if self.queue.full():
+            # slow client: lose its oldest event rather than block the publisher
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        if not self.queue.empty():
+            return self.queue.get_nowait()  # no wait_for task when a backlog is ready
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.hub.unsubscribe(self)
+
+
+class EventHub:
+    """
+    In-process fan-out of activity events to live subscribers.
+
+    Subscribers pick topics: "all", or "job:<job_id>" for one job. publish()
+    never awaits, so a write path is not slowed by how many dashboards are
+    open.
+    """
+
+    def __init__(self):
+        self.topics: Dict[str, Set[Subscription]] = {}
+        self.published = 0
+
+    def subscribe(self, job_id: Optional[str] = None) -> Subscription:
+        sub = Subscription(self, [f"job:{job_id}" if job_id else "all"])
+        for topic in sub.topics:
+            self.topics.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        for topic in sub.topics:
+            subs = self.topics.get(topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self.topics[topic]
+
+    def publish(self, event: dict):
+        self.published += 1
+        targets = set(self.topics.get("all", ()))
+        if event.get("job_id"):
+            targets.update(self.topics.get(f"job:{event['job_id']}", ()))
+        for sub in targets:
+            sub.deliver(event)
+
+    def stats(self) -> dict:
+        subs = {s for group in self.topics.values() for s in group}
+        return {
+            "subscribers": len(subs),
+            "published": self.published,
+            "dropped": sum(s.dropped for s in subs),
+            "change_stream": ACTIVITY_CHANGE_STREAM,
+        }
+
+
+hub = EventHub()
+
+
+def publish_local(event: dict):
+    """Publish from the write path unless the change stream will deliver it."""
+    if not ACTIVITY_CHANGE_STREAM:
+        hub.publish(event)
+
+
+async def run_change_stream(to_event):
+    """Tail inserts into activity_events and publish them on this worker."""
+    await watch(
+        db.activity_events,
+        [{"$match": {"operationType": "insert"}}],
+        lambda change: hub.publish(to_event(change["fullDocument"])),
+        "Activity",
+    )
@@ -0,0 +1,298 @@
+import asyncio
+import hashlib
+import heapq
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from pymongo import UpdateOne
+
+from config import db
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "../data/data_science_full_flashcards.json")
+
+FLUSH_INTERVAL_SECONDS = float(os.getenv("FLASHCARD_FLUSH_INTERVAL", 5))
+FLUSH_BATCH_SIZE = int(os.getenv("FLASHCARD_FLUSH_BATCH", 500))
+MAX_LOADED_USERS = int(os.getenv("FLASHCARD_MAX_LOADED_USERS", 50000))
+
+RELEARN_MINUTES = 10
+DAY_MINUTES = 24 * 60
+DEFAULT_EASE = 250  # SM-2 ease factor x100
+
+# A card's state is packed into one int: due (32 bits, epoch minutes) |
+# interval (24 bits, minutes) | ease (10 bits, x100) | reps (8 bits).
+# Heap entries are due << 32 | generation << 16 | card index; the
+# generation changes on every review, so only a card's newest entry is live.
+_DUE_SHIFT = 42
+_CARD_BITS = 16
+_GEN_BITS = 16
+_ENTRY_DUE_SHIFT = _CARD_BITS + _GEN_BITS
+
+def _pack(due: int, interval: int, ease: int, reps: int) -> int:
+    return due << _DUE_SHIFT | min(interval, 0xFFFFFF) << 18 | ease << 8 | min(reps, 0xFF)
+
+
+def _unpack(state: int):
+    return (
+        state >> _DUE_SHIFT,
+        state >> 18 & 0xFFFFFF,
+        state >> 8 & 0x3FF,
+        state & 0xFF,
+    )
+
+
+def now_minutes() -> int:
+    return int(time.time() // 60)
+
+
+class FlashcardDeck:
+    """The data-science flashcards, loaded once and addressed by a stable card_id."""
+
+    def __init__(self, cards: List[dict]):
+        self.cards = []
+        self.index_of: Dict[str, int] = {}
+        for card in cards:
+            card_id = hashlib.sha1(card["question"].encode("utf-8")).hexdigest()[:12]
+            self.index_of[card_id] = len(self.cards)
+            self.cards.append({"card_id": card_id, **card})
+        self.categories = [c.get("category") for c in self.cards]
+
+    @classmethod
+    def from_file(cls, path: str = DATA_PATH) -> "FlashcardDeck":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def sample(self, category: Optional[str], limit: int) -> List[dict]:
+        pool = [c for c in self.cards if c.get("category") == category] if category else self.cards
+        return random.sample(pool, min(limit, len(pool)))
+
+
+class UserSchedule:
+    """One user's reviewed cards plus a min-heap of due dates per category (with lazy deletion)."""
+
+    __slots__ = ("cards", "gens", "heaps", "entries", "categories")
+
+    def __init__(self, categories: List[Optional[str]]):
+        self.cards: Dict[int, int] = {}
+        self.gens: Dict[int, int] = {}
+        self.heaps: Dict[Optional[str], List[int]] = {}
+        self.entries = 0
+        self.categories = categories  # the deck's, shared by every user
+
+    def _entry(self, idx: int) -> int:
+        return (self.cards[idx] >> _DUE_SHIFT) << _ENTRY_DUE_SHIFT | self.gens[idx] << _CARD_BITS | idx
+
+    def set(self, idx: int, state: int):
+        self.cards[idx] = state
+        self.gens[idx] = (self.gens.get(idx, 0) + 1) & 0xFFFF
+        heapq.heappush(self.heaps.setdefault(self.categories[idx], []), self._entry(idx))
+        self.entries += 1
+        # Drop stale heap entries once they outnumber the live ones
+        if self.entries > 2 * len(self.cards) + 16:
+            self.heaps = {}
+            for i in self.cards:
+                self.heaps.setdefault(self.categories[i], []).append(self._entry(i))
+            for heap in self.heaps.values():
+                heapq.heapify(heap)
+            self.entries = len(self.cards)
+
+    def _is_live(self, entry: int) -> bool:
+        return self.gens.get(entry & 0xFFFF) == entry >> _CARD_BITS & 0xFFFF
+
+    def due(self, k: int, now: int, category: Optional[str] = None) -> List[int]:
+        """
+        Pop up to k live entries due at `now` from the category's heap (or
+        the earliest across all heaps), then push them back: O(k log n).
+        """
+        heaps = [self.heaps.get(category, [])] if category else list(self.heaps.values())
+        heads = [(heap[0], i) for i, heap in enumerate(heaps) if heap]
+        heapq.heapify(heads)
+        taken = []
+        while heads and len(taken) < k and heads[0][0] >> _ENTRY_DUE_SHIFT <= now:
+            i = heads[0][1]
+            entry = heapq.heappop(heaps[i])
+            if self._is_live(entry):
+                taken.append((i, entry))
+            else:
+                self.entries -= 1
+            if heaps[i]:
+                heapq.heapreplace(heads, (heaps[i][0], i))
+            else:
+                heapq.heappop(heads)
+        for i, entry in taken:
+            heapq.heappush(heaps[i], entry)
+        return [entry & 0xFFFF for _, entry in taken]
+
+
+def review(state: Optional[int], grade: int, now: int) -> int:
+    """SM-2 update for a 0-5 recall grade; returns the new packed state."""
+    if state is None:
+        interval, ease, reps = 0, DEFAULT_EASE, 0
+    else:
+        _, interval, ease, reps = _unpack(state)
+
+    if grade < 3:
+        reps, interval = 0, RELEARN_MINUTES
+    else:
+        if reps == 0:
+            interval = DAY_MINUTES
+        elif reps == 1:
+            interval = 6 * DAY_MINUTES
+        else:
+            interval = int(interval * ease / 100)
+        reps += 1
+
+    miss = 5 - grade
+    ease = max(130, min(1000, ease + 10 - miss * (8 + miss * 2)))
+    return _pack(now + interval, interval, ease, reps)
+
+
+class FlashcardScheduler:
+    """
+    Per-user spaced-repetition state.
+
+    Users are loaded from Mongo on first access and kept in a bounded LRU.
+    Reviews only touch memory; changed cards are written back in batches by
+    `flush()`, which the background loop calls every FLUSH_INTERVAL_SECONDS
+    or as soon as FLUSH_BATCH_SIZE reviews are pending.
+    """
+
+    def __init__(self, deck: FlashcardDeck, collection=None):
+        self.deck = deck
+        self.collection = collection
+        self.users: "OrderedDict[str, UserSchedule]" = OrderedDict()
+        self.dirty: Dict[str, Set[int]] = {}
+        self.flushing: Set[str] = set()
+        self.pending = 0
+        self._flush_needed = asyncio.Event()
+
+    async def _schedule_for(self, user_id: str) -> UserSchedule:
+        schedule = self.users.get(user_id)
+        if schedule is not None:
+            self.users.move_to_end(user_id)
+            return schedule
+
+        docs = []
+        if self.collection is not None:
+            # HOT_QUERIES "flashcard schedule load" in services/indexes.py
+            docs = await self.collection.find({"user_id": user_id}).to_list(None)
+
+        schedule = self.users.get(user_id)
+        if schedule is None:
+            schedule = UserSchedule(self.deck.categories)
+            for doc in docs:
+                idx = self.deck.index_of.get(doc["card_id"])
+                if idx is not None:
+                    schedule.set(idx, _pack(doc["due"], doc["interval"], doc["ease"], doc["reps"]))
+            self.users[user_id] = schedule
+            self._evict()
+        return schedule
+
+    def _evict(self):
+        # Only users without unflushed or in-flight reviews can be dropped
+        if len(self.users) <= MAX_LOADED_USERS:
+            return
+        for user_id in list(self.users):
+            if len(self.users) <= MAX_LOADED_USERS:
+                break
+            if user_id not in self.dirty and user_id not in self.flushing:
+                del self.users[user_id]
+
+    async def record_review(self, user_id: str, card_id: str, grade: int, now: Optional[int] = None) -> dict:
+        idx = self.deck.index_of.get(card_id)
+        if idx is None:
+            raise KeyError(card_id)
+        now = now if now is not None else now_minutes()
+
+        schedule = await self._schedule_for(user_id)
+        state = review(schedule.cards.get(idx), grade, now)
+        schedule.set(idx, state)
+
+        self.dirty.setdefault(user_id, set()).add(idx)
+        self.pending += 1
+        if self.pending >= FLUSH_BATCH_SIZE:
+            self._flush_needed.set()
+
+        due, interval, _, _ = _unpack(state)
+        return {"card_id": card_id, "due_at": datetime.utcfromtimestamp(due * 60), "interval_minutes": interval}
+
+    async def next_due(self, user_id: str, k: int, category: Optional[str] = None, now: Optional[int] = None) -> List[dict]:
+        """Up to k cards whose review is due, topped up with never-seen cards in deck order."""
+        now = now if now is not None else now_minutes()
+        schedule = await self._schedule_for(user_id)
+
+        picked = schedule.due(k, now, category)
+        if len(picked) < k:
+            for idx, card_category in enumerate(self.deck.categories):
+                if idx in schedule.cards or (category and card_category != category):
+                    continue
+                picked.append(idx)
+                if len(picked) == k:
+                    break
+        return [self.deck.cards[idx] for idx in picked]
+
+    async def flush(self):
+        """Write every pending review to Mongo with one bulk_write."""
+        if not self.dirty:
+            return
+        dirty, self.dirty, self.pending = self.dirty, {}, 0
+        self._flush_needed.clear()
+        if self.collection is None:
+            return
+
+        ops = []
+        for user_id, indexes in dirty.items():
+            schedule = self.users.get(user_id)
+            if schedule is None:
+                continue
+            for idx in indexes:
+                due, interval, ease, reps = _unpack(schedule.cards[idx])
+                card_id = self.deck.cards[idx]["card_id"]
+                ops.append(UpdateOne(
+                    {"user_id": user_id, "card_id": card_id},
+                    {"$set": {"due": due, "interval": interval, "ease": ease, "reps": reps,
+                              "updated_at": datetime.utcnow()}},
+                    upsert=True,
+                ))
+        # pinned in memory until the write returns, so a retry can rebuild the ops
+        self.flushing.update(dirty)
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+        except Exception as e:
+            # Keep the reviews dirty so the next flush retries them
+            print("❌ Flashcard flush failed:", e)
+            for user_id, indexes in dirty.items():
+                self.dirty.setdefault(user_id, set()).update(indexes)
+                self.pending += len(indexes)
+        finally:
+            self.flushing.difference_update(dirty)
+
+    async def run_flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_needed.wait(), FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+
+_deck: Optional[FlashcardDeck] = None
+_scheduler: Optional[FlashcardScheduler] = None
+
+
+def get_deck() -> FlashcardDeck:
+    global _deck
+    if _deck is None:
+        _deck = FlashcardDeck.from_file()
+    return _deck
+
+
+def get_scheduler() -> FlashcardScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = FlashcardScheduler(get_deck(), db.flashcard_reviews)
+    return _scheduler
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from config import db
+from services.github_client import GitHubClient, GitHubError, RateLimited, Budget, github
+
+GITHUB_CACHE_TTL = float(os.getenv("GITHUB_CACHE_TTL", 6 * 3600))
+README_EXCERPT_CHARS = 500
+REPO_FIELDS = ("name", "description", "stargazers_count", "language", "topics")
+
+STATS = {"fresh_hits": 0, "revalidated": 0, "fetched": 0, "stale_served": 0}
+
+
+def _field(key: str) -> str:
+    # repo names may contain dots, which Mongo would read as a path
+    return key.replace(".", "%2E")
+
+
+def _trim_repos(repos: List[dict]) -> List[dict]:
+    return [{f: r.get(f) for f in REPO_FIELDS} for r in repos]
+
+
+class CachedGitHub:
+    """
+    One username's GitHub data, read through its github_cache document.
+
+    Each response (profile, repo list, each README) is an entry with its
+    ETag/Last-Modified. Entries younger than the TTL are served without a
+    call; older ones are revalidated with a conditional request, and a 304
+    does not count against the rate limit. If GitHub fails, the stale entry
+    is served instead: revalidation makes one attempt, without retries or
+    waiting for the rate limit, so an outage costs one call, not the backoff.
+    """
+
+    def __init__(self, client: GitHubClient, username: str, entries: Dict[str, dict], ttl: float):
+        self.client = client
+        self.username = username
+        self.entries = entries
+        self.ttl = ttl
+        self.changed = set()
+
+    async def fetch(self, key: str, path: str, budget: Budget, accept: Optional[str] = None,
+                    parse: Callable[[httpx.Response], Any] = lambda r: r.json()) -> Any:
+        field = _field(key)
+        entry = self.entries.get(field)
+        now = time.time()
+        if entry and now - entry["fetched_at"] < self.ttl:
+            STATS["fresh_hits"] += 1
+            return entry["body"]
+
+        validators = {}
+        if entry and entry.get("etag"):
+            validators["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            validators["If-Modified-Since"] = entry["last_modified"]
+        try:
+            if entry is None:
+                resp = await self.client.request(path, budget, accept=accept)
+            elif self.client.blocked_until > time.time():
+                raise RateLimited("GitHub rate limit exhausted")
+            else:
+                resp = await self.client.request(path, budget, accept=accept, headers=validators, retries=0)
+        except (GitHubError, httpx.HTTPError) as e:
+            if entry is None:
+                raise
+            STATS["stale_served"] += 1
+            print(f"GitHub {key} for {self.username} failed, serving cached copy: {e}")
+            return entry["body"]
+
+        if resp.status_code == 304 and entry:
+            STATS["revalidated"] += 1
+            entry["fetched_at"] = now
+        else:
+            STATS["fetched"] += 1
+            entry = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "body": parse(resp) if resp.status_code == 200 else None,
+                "fetched_at": now,
+            }
+            self.entries[field] = entry
+        self.changed.add(field)
+        return entry["body"]
+
+    async def profile(self, budget: Budget) -> Dict[str, Any]:
+        return await self.fetch("profile", f"/users/{self.username}", budget) or {}
+
+    async def repos(self, budget: Budget) -> List[Dict[str, Any]]:
+        return await self.fetch(
+            "repos", f"/users/{self.username}/repos?sort=updated&per_page=20", budget,
+            parse=lambda r: _trim_repos(r.json()),
+        ) or []
+
+    async def readme(self, repo: str, budget: Budget) -> str:
+        """README excerpt in one call (raw media type), or "" if there is none."""
+        return await self.fetch(
+            f"readme:{repo}", f"/repos/{self.username}/{repo}/readme", budget,
+            accept="application/vnd.github.raw", parse=lambda r: r.text[:README_EXCERPT_CHARS],
+        ) or ""
+
+    async def readmes(self, repos: List[str], budget: Budget) -> List[str]:
+        """READMEs for several repos, at most `concurrency` in flight; failures give ""."""
+        gate = asyncio.Semaphore(self.client.concurrency)
+
+        async def one(repo: str) -> str:
+            async with gate:
+                try:
+                    return await self.readme(repo, budget)
+                except (GitHubError, httpx.HTTPError) as e:
+                    print(f"GitHub README fetch failed for {self.username}/{repo}: {e}")
+                    return ""
+
+        return await asyncio.gather(*(one(r) for r in repos))
+
+
+class GitHubCache:
+    """Loads and saves CachedGitHub views, one Mongo document per username."""
+
+    def __init__(self, client: GitHubClient, collection, ttl: float = GITHUB_CACHE_TTL):
+        self.client = client
+        self.collection = collection
+        self.ttl = ttl
+
+    async def open(self, username: str) -> CachedGitHub:
+        try:
+            doc = await self.collection.find_one({"_id": username.lower()}, {"entries": 1})
+        except Exception as e:
+            print(f"❌ GitHub cache read failed for {username}: {e}")
+            doc = None
+        return CachedGitHub(self.client, username, (doc or {}).get("entries", {}), self.ttl)
+
+    async def save(self, view: CachedGitHub):
+        if not view.changed:
+            return
+        update = {f"entries.{field}": view.entries[field] for field in view.changed}
+        update["updated_at"] = datetime.utcnow()
+        try:
+            await self.collection.update_one({"_id": view.username.lower()}, {"$set": update}, upsert=True)
+        except Exception as e:
+            print(f"❌ GitHub cache write failed for {view.username}: {e}")
+        view.changed.clear()
+
+    def stats(self) -> dict:
+        lookups = sum(STATS.values())
+        return {
+            **STATS,
+            "ttl_seconds": self.ttl,
+            "hit_rate": round((STATS["fresh_hits"] + STATS["revalidated"]) / lookups, 3) if lookups else 0.0,
+            # fresh hits skip the call; 304s make one that is free of quota
+            "api_calls_avoided": STATS["fresh_hits"],
+            "rate_limit_saved": STATS["fresh_hits"] + STATS["revalidated"],
+        }
+
+
+github_cache = GitHubCache(github, db.github_cache)
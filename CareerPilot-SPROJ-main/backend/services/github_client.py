@@ -0,0 +1,130 @@
+import asyncio
+import os
+import time
+from typing import Dict, Optional
+
+import httpx
+
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+GITHUB_CONCURRENCY = int(os.getenv("GITHUB_CONCURRENCY", 5))
+GITHUB_CALL_TIMEOUT = float(os.getenv("GITHUB_CALL_TIMEOUT", 5))
+GITHUB_TIME_BUDGET = float(os.getenv("GITHUB_TIME_BUDGET", 10))  # per resume
+MAX_RETRIES = 2
+
+
+class GitHubError(Exception):
+    pass
+
+
+class RateLimited(GitHubError):
+    pass
+
+
+class BudgetExceeded(GitHubError):
+    pass
+
+
+class Budget:
+    """Wall-clock allowance shared by every call made for one resume."""
+
+    def __init__(self, seconds: float):
+        self.deadline = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def timeout(self, per_call: float) -> float:
+        left = self.remaining()
+        if left <= 0:
+            raise BudgetExceeded("GitHub time budget exhausted")
+        return min(per_call, left)
+
+
+class GitHubClient:
+    """
+    Async GitHub REST client on one pooled httpx.AsyncClient.
+
+    Tracks X-RateLimit-Remaining/Reset from every response: once the quota
+    is spent, calls wait for the reset if it fits in the caller's budget
+    and fail fast with RateLimited otherwise. 5xx and secondary rate limits
+    are retried with exponential backoff, also within the budget.
+    """
+
+    def __init__(self, base_url: str = GITHUB_API_URL, token: Optional[str] = GITHUB_TOKEN,
+                 concurrency: int = GITHUB_CONCURRENCY, client: Optional[httpx.AsyncClient] = None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Accept": "application/vnd.github+json"}
+        if token:
+            self.headers["Authorization"] = f"token {token}"
+        self.concurrency = concurrency
+        self.client = client
+        self.blocked_until = 0.0  # time.time() when the rate limit resets
+        self.calls = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                follow_redirects=True,
+            )
+        return self.client
+
+    async def _wait_for_quota(self, budget: Budget):
+        wait = self.blocked_until - time.time()
+        if wait <= 0:
+            return
+        if wait >= budget.remaining():
+            raise RateLimited(f"GitHub rate limit resets in {wait:.0f}s")
+        await asyncio.sleep(wait)
+
+    def _note_rate_limit(self, resp: httpx.Response):
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset = resp.headers.get("X-RateLimit-Reset")
+        if remaining == "0" and reset:
+            self.blocked_until = max(self.blocked_until, float(reset))
+
+    async def request(self, path: str, budget: Budget, accept: Optional[str] = None,
+                      headers: Optional[Dict[str, str]] = None, retries: int = MAX_RETRIES) -> httpx.Response:
+        """
+        GET with rate-limit handling and up to `retries` retries. Returns 2xx,
+        304 (for conditional requests) and 404 responses; raises for anything else.
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        headers = {**self.headers, **({"Accept": accept} if accept else {}), **(headers or {})}
+
+        for attempt in range(retries + 1):
+            await self._wait_for_quota(budget)
+            self.calls += 1
+            try:
+                resp = await self._client().get(url, headers=headers, timeout=budget.timeout(GITHUB_CALL_TIMEOUT))
+            except httpx.TimeoutException:
+                if budget.remaining() <= 0:
+                    raise BudgetExceeded(f"GitHub call timed out: {path}")
+                raise
+            self._note_rate_limit(resp)
+
+            retry_after = resp.headers.get("Retry-After")
+            limited = resp.status_code in (403, 429) and (retry_after or resp.headers.get("X-RateLimit-Remaining") == "0")
+            if limited or resp.status_code >= 500:
+                if attempt == retries:
+                    break
+                delay = float(retry_after) if retry_after else 0.5 * 2 ** attempt
+                if limited and not retry_after:
+                    delay = max(self.blocked_until - time.time(), 0)
+                if delay >= budget.remaining():
+                    raise RateLimited(f"GitHub asked to wait {delay:.0f}s") if limited else BudgetExceeded(path)
+                await asyncio.sleep(delay)
+                continue
+            break
+
+        if resp.status_code not in (304, 404):
+            resp.raise_for_status()
+        return resp
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+
+
+github = GitHubClient()
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+import httpx
+
+from config import db
+from routes.github_analysis import build_github_summary, extract_github_username
+from services.github_client import GitHubError, github
+
+GITHUB_ENRICH_WORKERS = int(os.getenv("GITHUB_ENRICH_WORKERS", 2))
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 15  # seconds, doubled on every attempt
+
+# resumes.github_status
+PENDING, READY, FAILED = "pending", "ready", "failed"
+
+
+def github_username(url: Optional[str]) -> Optional[str]:
+    """Normalized username for a GitHub URL, or None if it isn't one."""
+    username = extract_github_username(url) if url else None
+    return username.lower() if username else None
+
+
+class GitHubEnricher:
+    """
+    Fills in resumes.github_summary after the upload has returned.
+
+    Jobs are keyed by GitHub username: while one is queued or running,
+    uploads for the same username just join it and get the same result.
+    GitHub failures are retried with backoff (waiting out the rate limit
+    when that is the reason); after MAX_ATTEMPTS the resumes are marked
+    failed. Resumes still pending at shutdown are picked up again at
+    startup by requeue_pending().
+    """
+
+    def __init__(self, collection, workers: int = GITHUB_ENRICH_WORKERS):
+        self.collection = collection
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.waiting: Dict[str, Set] = {}  # username -> user_ids of pending resumes
+        self.tasks = []
+        self.counts = {"enqueued": 0, "joined": 0, "ready": 0, "failed": 0, "retries": 0}
+
+    def enqueue(self, user_id, url: str) -> bool:
+        """Queue enrichment for one resume; False if the URL has no username."""
+        username = github_username(url)
+        if not username:
+            return False
+        if username in self.waiting:
+            self.waiting[username].add(user_id)
+            self.counts["joined"] += 1
+            return True
+        self.waiting[username] = {user_id}
+        self.queue.put_nowait((username, 0))
+        self.counts["enqueued"] += 1
+        return True
+
+    def _retry_later(self, username: str, attempt: int):
+        delay = max(RETRY_DELAY * 2 ** attempt, github.blocked_until - time.time())
+        self.counts["retries"] += 1
+        asyncio.get_running_loop().call_later(delay, self.queue.put_nowait, (username, attempt + 1))
+
+    async def _process(self, username: str, attempt: int):
+        try:
+            summary = await build_github_summary(f"https://github.com/{username}")
+            status, error = READY, None
+        except (GitHubError, httpx.HTTPError) as e:
+            if attempt + 1 < MAX_ATTEMPTS:
+                print(f"GitHub enrichment for {username} failed (attempt {attempt + 1}), retrying: {e}")
+                self._retry_later(username, attempt)
+                return
+            summary, status, error = None, FAILED, str(e) or type(e).__name__
+
+        user_ids = list(self.waiting.pop(username, ()))
+        self.counts[status] += 1
+        # only resumes that still point at this username and weren't re-uploaded meanwhile
+        await self.collection.update_many(
+            {"user_id": {"$in": user_ids}, "github_username": username, "github_status": PENDING},
+            {"$set": {
+                "github_summary": summary,
+                "github_status": status,
+                "github_error": error,
+                "github_updated_at": datetime.utcnow(),
+            }},
+        )
+
+    async def _worker(self):
+        while True:
+            username, attempt = await self.queue.get()
+            try:
+                await self._process(username, attempt)
+            except Exception as e:
+                # leave the resumes pending; the next startup re-queues them
+                self.waiting.pop(username, None)
+                print(f"❌ GitHub enrichment for {username} crashed: {e}")
+            finally:
+                self.queue.task_done()
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    async def requeue_pending(self) -> int:
+        """Queue every resume left pending by a previous run."""
+        queued = 0
+        # HOT_QUERIES "pending GitHub enrichment" in services/indexes.py
+        cursor = self.collection.find(
+            {"github_status": PENDING},
+            {"user_id": 1, "github_username": 1},
+        )
+        async for doc in cursor:
+            if self.enqueue(doc["user_id"], f"https://github.com/{doc.get('github_username', '')}"):
+                queued += 1
+        return queued
+
+    def stats(self) -> dict:
+        return {**self.counts, "queued": self.queue.qsize(), "usernames_waiting": len(self.waiting)}
+
+
+enricher = GitHubEnricher(db.resumes)
@@ -0,0 +1,153 @@
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from config import db
+from services.candidate_listing import STATUS_EXPR
+from services.parse_cache import PARSER_VERSION
+
+# collection -> indexes it must have. Applied at startup; creating an index
+# that already exists with the same spec is a no-op.
+INDEXES = {
+    "candidates": [
+        # job listings, status counts, counter rebuilds
+        IndexModel([("job_id", ASCENDING), ("uploaded_at", DESCENDING), ("_id", DESCENDING)], name="job_uploaded"),
+        # ranker catch-up sync
+        IndexModel([("job_id", ASCENDING), ("updated_at", ASCENDING)], name="job_updated"),
+        # all-candidates listing
+        IndexModel([("uploaded_at", DESCENDING), ("_id", DESCENDING)], name="uploaded"),
+        # search index catch-up sync
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+        # interview webhook
+        IndexModel([("temp_username", ASCENDING)], name="temp_username"),
+        # magic-link interview login
+        IndexModel([("magic_token", ASCENDING)], name="magic_token"),
+    ],
+    "users": [
+        # get_current_user on every authenticated request
+        IndexModel([("clerk_id", ASCENDING)], name="clerk_id", unique=True),
+    ],
+    "resumes": [
+        IndexModel([("user_id", ASCENDING)], name="user_id", unique=True),
+        # GitHub enrichment re-queue at startup; only pending resumes are indexed
+        IndexModel([("github_status", ASCENDING)], name="github_pending",
+                   partialFilterExpression={"github_status": "pending"}),
+    ],
+    "flashcard_reviews": [
+        IndexModel([("user_id", ASCENDING), ("card_id", ASCENDING)], name="user_card", unique=True),
+    ],
+    "activity_events": [
+        # per-job feed and SSE replay; the unfiltered feed uses _id
+        IndexModel([("job_id", ASCENDING), ("_id", DESCENDING)], name="job_feed"),
+    ],
+    "metrics_rollups": [
+        IndexModel([("granularity", ASCENDING), ("start", ASCENDING)], name="granularity_start"),
+    ],
+    "email_outbox": [
+        # delivery worker: due messages in order, status counts
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_due"),
+        IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)], name="status_lease"),
+        IndexModel([("claim", ASCENDING)], name="claim", sparse=True),
+        IndexModel([("status", ASCENDING), ("failed_at", DESCENDING)], name="status_failed"),
+        # delivered mail is kept for a month
+        IndexModel([("sent_at", ASCENDING)], name="sent_ttl", expireAfterSeconds=30 * 24 * 3600),
+    ],
+    "clerk_account_pool": [
+        # claim the oldest available account
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created"),
+    ],
+    "webhook_events": [
+        # _id is the dedup key; replays within this window are rejected
+        IndexModel([("received_at", ASCENDING)], name="dedup_window", expireAfterSeconds=30 * 24 * 3600),
+        IndexModel([("batch_id", ASCENDING)], name="batch_id"),
+        IndexModel([("status", ASCENDING)], name="queued",
+                   partialFilterExpression={"status": "queued"}),
+    ],
+    "webhook_batches": [
+        IndexModel([("received_at", ASCENDING)], name="report_ttl", expireAfterSeconds=30 * 24 * 3600),
+    ],
+    "resume_parse_cache": [
+        IndexModel([("parser_version", ASCENDING)], name="parser_version"),
+    ],
+}
+
+_ID = ObjectId("000000000000000000000000")
+_T = datetime(2024, 1, 1)
+
+# The filters and sorts the routes actually send, with placeholder values;
+# each call site has a comment naming its entry here. Aggregations are
+# listed with their pipeline instead of a filter. scripts/check_query_plans.py
+# explains each of these.
+#
+# Not listed because they read the whole collection by design: the
+# all-candidates status counts, the jobs list and
+# metrics_rollup.rebuild_rollups. The magic-link lookup is sent by the
+# interview service.
+HOT_QUERIES = [
+    {"name": "list_candidates_for_job", "collection": "candidates", "filter": {"job_id": "job"},
+     "sort": {"uploaded_at": -1, "_id": -1}, "limit": 51},
+    {"name": "list_candidates_for_job (next page)", "collection": "candidates",
+     "filter": {"$and": [{"job_id": "job"}, {"$or": [
+         {"uploaded_at": {"$lt": _T}}, {"uploaded_at": _T, "_id": {"$lt": _ID}}, {"uploaded_at": None}]}]},
+     "sort": {"uploaded_at": -1, "_id": -1}, "limit": 51},
+    {"name": "list_candidates", "collection": "candidates", "filter": {},
+     "sort": {"uploaded_at": -1, "_id": -1}, "limit": 51},
+    {"name": "status_counts", "collection": "candidates", "pipeline": [
+        {"$match": {"job_id": "job"}},
+        {"$facet": {"by_status": [{"$group": {"_id": STATUS_EXPR, "n": {"$sum": 1}}}], "total": [{"$count": "n"}]}},
+    ]},
+    {"name": "bulk invite selection", "collection": "candidates",
+     "filter": {"job_id": "job", "invite_sent": {"$ne": True}}},
+    {"name": "ranker sync", "collection": "candidates", "filter": {"job_id": "job", "updated_at": {"$gte": _T}}},
+    {"name": "search index sync", "collection": "candidates", "filter": {"updated_at": {"$gte": _T}}},
+    {"name": "interview webhook", "collection": "candidates", "filter": {"temp_username": {"$in": ["cand"]}}},
+    {"name": "magic link", "collection": "candidates", "filter": {"magic_token": "token"}},
+    {"name": "get_current_user", "collection": "users", "filter": {"clerk_id": "user"}},
+    {"name": "resume by user", "collection": "resumes", "filter": {"user_id": _ID}},
+    {"name": "pending GitHub enrichment", "collection": "resumes", "filter": {"github_status": "pending"}},
+    {"name": "flashcard schedule load", "collection": "flashcard_reviews", "filter": {"user_id": "user"}},
+    {"name": "activity feed", "collection": "activity_events", "filter": {"_id": {"$lt": _ID}},
+     "sort": {"_id": -1}, "limit": 6},
+    {"name": "activity feed for job", "collection": "activity_events", "filter": {"job_id": "job"},
+     "sort": {"_id": -1}, "limit": 6},
+    {"name": "metrics trend", "collection": "metrics_rollups",
+     "filter": {"granularity": "day", "start": {"$gte": _T, "$lte": _T}}},
+    {"name": "outbox due", "collection": "email_outbox",
+     "filter": {"status": "queued", "next_attempt_at": {"$lte": _T}}, "sort": {"next_attempt_at": 1}, "limit": 1000},
+    {"name": "outbox expired leases", "collection": "email_outbox",
+     "filter": {"status": "sending", "lease_until": {"$lt": _T}}},
+    {"name": "outbox claim", "collection": "email_outbox", "filter": {"claim": _ID}},
+    {"name": "outbox failures", "collection": "email_outbox", "filter": {"status": "failed"},
+     "sort": {"failed_at": -1}, "limit": 20},
+    {"name": "clerk pool claim", "collection": "clerk_account_pool", "filter": {"status": "available"},
+     "sort": {"created_at": 1}, "limit": 1},
+    {"name": "webhook events applied", "collection": "webhook_events",
+     "filter": {"status": "queued", "batch_id": {"$in": [_ID]}}},
+    {"name": "webhook re-queue", "collection": "webhook_events", "filter": {"status": "queued"}},
+    {"name": "webhook sweep", "collection": "webhook_events",
+     "filter": {"status": "queued", "received_at": {"$lt": _T}}},
+    {"name": "job counter rebuild", "collection": "candidates", "pipeline": [
+        {"$match": {"job_id": {"$in": ["job"]}}},
+        {"$group": {"_id": "$job_id", "resumes": {"$sum": 1}}},
+    ]},
+    {"name": "parse cache stats", "collection": "resume_parse_cache", "pipeline": [
+        {"$match": {"parser_version": PARSER_VERSION}},
+        {"$group": {"_id": None, "entries": {"$sum": 1}, "hits": {"$sum": "$hits"}}},
+    ]},
+]
+
+
+async def ensure_indexes():
+    """Create every registered index. A conflicting index is reported, not fatal."""
+    created = failed = 0
+    for collection, models in INDEXES.items():
+        for model in models:
+            try:
+                await db[collection].create_indexes([model])
+                created += 1
+            except OperationFailure as e:
+                failed += 1
+                print(f"❌ Index {collection}.{model.document['name']} not created: {e}")
+    print(f"✅ Indexes ensured: {created} ok, {failed} failed")
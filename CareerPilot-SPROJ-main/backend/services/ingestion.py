@@ -0,0 +1,79 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import UploadFile
+
+from config import db
+from utils import save_upload, extract_email_from_text
+from services.pdf_extract import extract_text
+from routes.resume import parse_resume_regex
+from services.skill_matcher import match_skills
+from services.clerk_pool import clerk_pool
+from services.write_batcher import WriteBatcher
+
+# Bounded concurrency per stage. Parsing is CPU-bound and runs on a process
+# pool; Mongo is network-bound and runs on the event loop, with candidate
+# inserts from concurrent uploads batched into one insert_many. Clerk
+# accounts come pre-created from services.clerk_pool.
+INGEST_PROCESSES = int(os.getenv("INGEST_PROCESSES", os.cpu_count() or 1))
+SAVE_CONCURRENCY = int(os.getenv("INGEST_SAVE_CONCURRENCY", 8))
+
+_save_slots = asyncio.Semaphore(SAVE_CONCURRENCY)
+_parse_slots = asyncio.Semaphore(INGEST_PROCESSES)
+
+_pool: Optional[ProcessPoolExecutor] = None
+candidate_writes = WriteBatcher(db.candidates, "candidates")
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=INGEST_PROCESSES)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def extract_and_parse(path: str) -> dict:
+    """
+    Runs in a worker process: PDF text extraction, regex parsing and email
+    detection. Only the small parsed result travels back to the event loop.
+    """
+    try:
+        text = extract_text(path)
+    except Exception as e:
+        print(f"❌ Failed to read PDF {path}: {e}")
+        text = ""
+    return {
+        "text": text,
+        "parsed": parse_resume_regex(text),
+        "email": extract_email_from_text(text),
+        "skill_match": match_skills(text),
+    }
+
+
+async def save_stage(file: UploadFile) -> tuple:
+    async with _save_slots:
+        return await save_upload(file)
+
+
+async def parse_stage(path: str) -> dict:
+    async with _parse_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_pool(), extract_and_parse, path)
+
+
+async def provision_stage(full_name: str) -> dict:
+    # Clerk is only called here if the account pool has run dry
+    return await clerk_pool.claim(full_name)
+
+
+async def insert_stage(candidate_doc: dict):
+    return await candidate_writes.insert_one(candidate_doc)
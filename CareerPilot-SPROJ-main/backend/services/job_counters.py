@@ -0,0 +1,82 @@
+from typing import Iterable, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+
+from config import db
+
+COUNTER_FIELDS = ("resumes", "invited", "interviewed", "shortlisted", "completed")
+
+# How each counter is derived from a candidate document (used by rebuild)
+COUNTER_RULES = {
+    "resumes": True,
+    "invited": {"$eq": ["$invite_sent", True]},
+    "interviewed": {"$eq": ["$status", "Interviewed"]},
+    "shortlisted": {"$eq": ["$status", "Shortlisted"]},
+    "completed": {"$eq": ["$interview_completed", True]},
+}
+
+
+def _job_oid(job_id) -> Optional[ObjectId]:
+    if isinstance(job_id, ObjectId):
+        return job_id
+    try:
+        return ObjectId(job_id) if job_id else None
+    except (InvalidId, TypeError):
+        return None
+
+
+async def bump(job_id, **deltas: int):
+    """Atomically $inc the job's pipeline counters, e.g. bump(job_id, invited=1)."""
+    oid = _job_oid(job_id)
+    inc = {f"counters.{name}": n for name, n in deltas.items() if n}
+    if oid is None or not inc:
+        return
+    await db.jobs.update_one({"_id": oid}, {"$inc": inc})
+
+
+def read_counters(job: dict) -> dict:
+    stored = job.get("counters") or {}
+    return {name: stored.get(name, 0) for name in COUNTER_FIELDS}
+
+
+def empty_counters() -> dict:
+    return dict.fromkeys(COUNTER_FIELDS, 0)
+
+
+async def rebuild_counters(job_ids: Optional[Iterable[str]] = None, job_filter: Optional[dict] = None) -> int:
+    """
+    Recompute counters from the candidates collection and overwrite them.
+    Jobs without candidates are reset to zero. Returns the number of jobs written.
+    """
+    job_filter = dict(job_filter or {})
+    if job_ids is not None:
+        job_filter["_id"] = {"$in": [oid for oid in map(_job_oid, job_ids) if oid]}
+    jobs = [str(j["_id"]) async for j in db.jobs.find(job_filter, {"_id": 1})]
+
+    group = {"_id": "$job_id"}
+    for name, rule in COUNTER_RULES.items():
+        group[name] = {"$sum": 1 if rule is True else {"$cond": [rule, 1, 0]}}
+    pipeline = [{"$match": {"job_id": {"$in": jobs}}}, {"$group": group}]
+    # HOT_QUERIES "job counter rebuild" in services/indexes.py
+    totals = {row["_id"]: row async for row in db.candidates.aggregate(pipeline)}
+
+    ops = []
+    for job_id in jobs:
+        row = totals.get(job_id, {})
+        counters = {name: row.get(name, 0) for name in COUNTER_FIELDS}
+        ops.append(UpdateOne({"_id": ObjectId(job_id)}, {"$set": {"counters": counters}}))
+    if ops:
+        await db.jobs.bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def backfill_counters() -> int:
+    """
+    Rebuild only jobs created before counters existed (startup). Jobs that
+    already have counters are not checked, so counters that drifted (e.g.
+    after a candidate was edited or deleted by hand) stay wrong until
+    scripts/rebuild_job_counters.py is run.
+    """
+    return await rebuild_counters(job_filter={"counters": {"$exists": False}})
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import Dict, Optional
+
+import httpx
+import jwt
+from fastapi import HTTPException
+
+from services.ttl_cache import TTLCache
+
+JWKS_URL = os.getenv("CLERK_JWKS_URL", "https://stable-turkey-86.clerk.accounts.dev/.well-known/jwks.json")
+JWKS_TTL = float(os.getenv("JWKS_TTL", 300))
+JWKS_REFRESH_MARGIN = 60          # refresh this long before the keys expire
+UNKNOWN_KID_COOLDOWN = 30         # at most one forced refresh per this many seconds
+VERIFIED_TOKEN_TTL = float(os.getenv("VERIFIED_TOKEN_TTL", 60))
+VERIFIED_TOKEN_CACHE_SIZE = 10_000
+
+
+class JWKSKeyManager:
+    """
+    Clerk signing keys, parsed once and looked up by kid.
+
+    Keys are refreshed in the background before they expire. An unknown
+    kid (key rotation) triggers one shared fetch no matter how many
+    requests are waiting on it. If Clerk is unreachable the last good keys
+    keep serving (stale-while-revalidate). Verified tokens are remembered
+    for a short time, so repeat requests skip the RSA check entirely.
+    """
+
+    def __init__(self, url: str = JWKS_URL, client: Optional[httpx.AsyncClient] = None, ttl: float = JWKS_TTL):
+        self.url = url
+        self.ttl = ttl
+        self.client = client
+        self.keys: Dict[str, object] = {}
+        self.fetched_at = 0.0
+        self.last_forced = 0.0
+        self.fetches = 0
+        self.fetch_failures = 0
+        self._inflight: Optional[asyncio.Task] = None
+        self.verified = TTLCache(ttl=VERIFIED_TOKEN_TTL, maxsize=VERIFIED_TOKEN_CACHE_SIZE)
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(timeout=5.0)
+        return self.client
+
+    async def _fetch(self):
+        self.fetches += 1
+        try:
+            resp = await self._client().get(self.url)
+            resp.raise_for_status()
+            keys = {}
+            for key_data in resp.json().get("keys", []):
+                if key_data.get("kid") and key_data.get("kty") == "RSA":
+                    keys[key_data["kid"]] = jwt.algorithms.RSAAlgorithm.from_jwk(key_data)
+        except Exception as e:
+            self.fetch_failures += 1
+            print(f"❌ JWKS refresh failed{', serving stale keys' if self.keys else ''}: {e}")
+            return
+        self.keys = keys
+        self.fetched_at = time.monotonic()
+
+    def refresh(self) -> asyncio.Task:
+        """Start a fetch, or join the one already running."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch())
+        return self._inflight
+
+    async def get_key(self, kid: str):
+        age = time.monotonic() - self.fetched_at
+        key = self.keys.get(kid)
+        if key is not None:
+            if age > self.ttl:
+                self.refresh()  # serve the stale key, revalidate in the background
+            return key
+
+        # Unknown kid: first load, rotation, or a forged header. Join a fetch
+        # already in flight; start a new one at most once per cooldown.
+        now = time.monotonic()
+        if self._inflight is not None and not self._inflight.done():
+            await asyncio.shield(self._inflight)
+        elif not self.keys or now - self.last_forced > UNKNOWN_KID_COOLDOWN:
+            self.last_forced = now
+            await asyncio.shield(self.refresh())
+        if not self.keys:
+            raise HTTPException(status_code=500, detail="Failed to fetch Clerk keys")
+        key = self.keys.get(kid)
+        if key is None:
+            raise HTTPException(status_code=401, detail="Matching key not found in JWKS")
+        return key
+
+    async def verify(self, token: str) -> dict:
+        """Return the token's claims, or raise 401."""
+        cache_key = hashlib.sha256(token.encode()).digest()
+        payload = self.verified.get(cache_key)
+        if payload is not None and payload.get("exp", 0) > time.time():
+            self.verified.hits += 1
+            return payload
+        self.verified.misses += 1
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            if not kid:
+                raise HTTPException(status_code=401, detail="JWT missing kid header")
+            payload = jwt.decode(
+                token,
+                await self.get_key(kid),
+                algorithms=["RS256"],
+                options={"verify_aud": False}  # Clerk doesn't require audience check
+            )
+        except jwt.PyJWTError as e:
+            raise HTTPException(status_code=401, detail=f"Invalid or expired Clerk token: {str(e)}")
+
+        self.verified.set(cache_key, payload)
+        return payload
+
+    async def run_refresh_loop(self):
+        """Keep keys fresh so requests never wait on Clerk."""
+        while True:
+            await self.refresh()
+            delay = self.ttl - JWKS_REFRESH_MARGIN if self.keys else 30
+            await asyncio.sleep(max(delay, 1))
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self.keys),
+            "age_seconds": round(time.monotonic() - self.fetched_at, 1) if self.keys else None,
+            "fetches": self.fetches,
+            "fetch_failures": self.fetch_failures,
+            "verified_tokens": self.verified.stats(),
+        }
+
+
+key_manager = JWKSKeyManager()
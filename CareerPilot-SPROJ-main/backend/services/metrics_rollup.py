@@ -0,0 +1,176 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from config import db
+from services.indexes import INDEXES
+from services.ttl_cache import TTLCache
+
+METRICS_CACHE_TTL = float(os.getenv("METRICS_CACHE_TTL", 5))
+MAX_TREND_BUCKETS = 24 * 31
+
+COUNTERS = ("uploads", "invites", "completions", "score_sum", "score_count")
+TOTALS_ID = "totals"
+
+metrics_cache = TTLCache(ttl=METRICS_CACHE_TTL, maxsize=64)
+
+
+def bucket_start(at: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return at.replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_id(start: datetime, granularity: str) -> str:
+    return f"{granularity}:{start.strftime('%Y-%m-%dT%H' if granularity == 'hour' else '%Y-%m-%d')}"
+
+
+def interview_score(technical, behavioural) -> Optional[float]:
+    """Mean of the scores that are present, like Mongo's $avg; None if neither is."""
+    scores = [s for s in (technical, behavioural) if isinstance(s, (int, float))]
+    return sum(scores) / len(scores) if scores else None
+
+
+async def record(uploads: int = 0, invites: int = 0, completions: int = 0,
+                 score: Optional[float] = None, at: Optional[datetime] = None, score_count: int = 1):
+    """
+    Add events to the hour bucket, the day bucket and the running totals in
+    one unordered bulk write. Called from the write paths; never raises.
+    For batches, score is the sum of score_count scores.
+    """
+    inc = {"uploads": uploads, "invites": invites, "completions": completions}
+    if score is not None and score_count:
+        inc.update(score_sum=score, score_count=score_count)
+    inc = {k: v for k, v in inc.items() if v}
+    if not inc:
+        return
+
+    at = at or datetime.utcnow()
+    ops = [UpdateOne({"_id": TOTALS_ID}, {"$inc": inc}, upsert=True)]
+    for granularity in ("hour", "day"):
+        start = bucket_start(at, granularity)
+        ops.append(UpdateOne(
+            {"_id": bucket_id(start, granularity)},
+            {"$inc": inc, "$setOnInsert": {"granularity": granularity, "start": start}},
+            upsert=True,
+        ))
+    try:
+        await db.metrics_rollups.bulk_write(ops, ordered=False)
+    except Exception as e:
+        print(f"❌ Metrics rollup write failed: {e}")
+    metrics_cache.invalidate()
+
+
+def _summary(doc: dict) -> dict:
+    total = doc.get("uploads", 0)
+    completed = doc.get("completions", 0)
+    count = doc.get("score_count", 0)
+    return {
+        "total_candidates": total,
+        "completed_interviews": completed,
+        "pending_interviews": total - completed,
+        "average_score": round(doc.get("score_sum", 0) / count, 2) if count else 0.0,
+    }
+
+
+async def _load_totals() -> dict:
+    doc = await db.metrics_rollups.find_one({"_id": TOTALS_ID}) or {}
+    return _summary(doc)
+
+
+async def get_totals() -> dict:
+    """Dashboard headline numbers, served from one document through a short TTL cache."""
+    return await metrics_cache.get_or_load(TOTALS_ID, _load_totals)
+
+
+async def _load_trend(start: datetime, end: datetime, granularity: str) -> List[dict]:
+    first, last = bucket_start(start, granularity), bucket_start(end, granularity)
+    # HOT_QUERIES "metrics trend" in services/indexes.py
+    rows = await db.metrics_rollups.find(
+        {"granularity": granularity, "start": {"$gte": first, "$lte": last}}
+    ).to_list(MAX_TREND_BUCKETS)
+    by_start = {r["start"]: r for r in rows}
+
+    step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+    out = []
+    cursor = first
+    while cursor <= last and len(out) < MAX_TREND_BUCKETS:
+        doc = by_start.get(cursor, {})
+        count = doc.get("score_count", 0)
+        out.append({
+            "start": cursor,
+            "uploads": doc.get("uploads", 0),
+            "invites": doc.get("invites", 0),
+            "completions": doc.get("completions", 0),
+            "average_score": round(doc.get("score_sum", 0) / count, 2) if count else None,
+        })
+        cursor += step
+    return out
+
+
+async def get_trend(start: datetime, end: datetime, granularity: str = "day") -> List[dict]:
+    """Per-bucket counts between start and end, with empty buckets filled in."""
+    key = ("trend", granularity, bucket_start(start, granularity), bucket_start(end, granularity))
+    return await metrics_cache.get_or_load(key, lambda: _load_trend(start, end, granularity))
+
+
+async def rebuild_rollups() -> int:
+    """
+    Recompute every bucket and the totals from the candidates collection,
+    replacing what is stored. Returns the number of documents written.
+    """
+    events = {
+        "uploads": ("$uploaded_at", {}),
+        "invites": ({"$ifNull": ["$invited_at", "$uploaded_at"]}, {"invite_sent": True}),
+        "completions": ({"$ifNull": ["$interview_completed_at", "$updated_at"]}, {"interview_completed": True}),
+    }
+    buckets = {}
+    totals = dict.fromkeys(COUNTERS, 0)
+
+    for counter, (time_expr, match) in events.items():
+        group = {"_id": {"$dateToString": {"format": "%Y-%m-%dT%H", "date": time_expr}}, "n": {"$sum": 1}}
+        if counter == "completions":
+            score = {"$avg": ["$technical_score", "$behavioural_score"]}
+            group["score_sum"] = {"$sum": score}
+            group["score_count"] = {"$sum": {"$cond": [{"$eq": [score, None]}, 0, 1]}}
+        async for row in db.candidates.aggregate([{"$match": match}, {"$group": group}]):
+            if row["_id"] is None:
+                continue
+            hour = datetime.strptime(row["_id"], "%Y-%m-%dT%H")
+            inc = {counter: row["n"]}
+            if counter == "completions":
+                inc.update(score_sum=row["score_sum"], score_count=row["score_count"])
+            for granularity in ("hour", "day"):
+                start = bucket_start(hour, granularity)
+                doc = buckets.setdefault(bucket_id(start, granularity), {
+                    "granularity": granularity, "start": start, **dict.fromkeys(COUNTERS, 0)
+                })
+                for k, v in inc.items():
+                    doc[k] += v
+            for k, v in inc.items():
+                totals[k] += v
+
+    # Build into a collection of our own and swap it in with one rename, so
+    # workers rebuilding at the same time never see each other's half-written
+    # or wiped buckets; the last rename wins with a complete set.
+    docs = [{"_id": TOTALS_ID, **totals}] + [{"_id": _id, **doc} for _id, doc in buckets.items()]
+    staging = db[f"metrics_rollups_build_{ObjectId()}"]
+    try:
+        await staging.insert_many(docs)
+        await staging.create_indexes(INDEXES["metrics_rollups"])
+        await staging.rename("metrics_rollups", dropTarget=True)
+    except Exception:
+        await staging.drop()
+        raise
+    metrics_cache.invalidate()
+    return len(docs)
+
+
+async def backfill_rollups() -> int:
+    """Build the rollups once if this database has never had them (startup)."""
+    if await db.metrics_rollups.find_one({"_id": TOTALS_ID}, {"_id": 1}):
+        return 0
+    return await rebuild_rollups()
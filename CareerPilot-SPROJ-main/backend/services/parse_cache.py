@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from config import db
+from services.pdf_extract import PDF_BACKEND
+
+# Bump whenever extraction or parse_resume_regex output changes, so stale
+# cache entries are ignored instead of served.
+PARSER_VERSION = f"3-{PDF_BACKEND}"
+
+STATS = {"hits": 0, "misses": 0}
+
+
+def cache_key(sha256: str) -> str:
+    return f"{sha256}:{PARSER_VERSION}"
+
+
+async def get_cached_parse(sha256: str) -> Optional[dict]:
+    """
+    Return the cached {"text", "parsed", "email", "skill_match"} for a resume
+    hash, or None.
+    """
+    doc = await db.resume_parse_cache.find_one_and_update(
+        {"_id": cache_key(sha256)},
+        {"$inc": {"hits": 1}, "$set": {"last_hit_at": datetime.utcnow()}},
+        projection={"text": 1, "parsed": 1, "email": 1, "skill_match": 1},
+    )
+    if doc is None:
+        STATS["misses"] += 1
+        return None
+    STATS["hits"] += 1
+    return doc
+
+
+async def store_parse(sha256: str, result: dict):
+    try:
+        await db.resume_parse_cache.insert_one({
+            "_id": cache_key(sha256),
+            "sha256": sha256,
+            "parser_version": PARSER_VERSION,
+            "text": result["text"],
+            "parsed": result["parsed"],
+            "email": result["email"],
+            "skill_match": result["skill_match"],
+            "hits": 0,
+            "created_at": datetime.utcnow(),
+        })
+    except DuplicateKeyError:
+        # Same file parsed concurrently by another upload
+        pass
+
+
+async def parse_cache_stats() -> dict:
+    """Hit rate for this worker since startup, plus lifetime totals from Mongo."""
+    lookups = STATS["hits"] + STATS["misses"]
+    # HOT_QUERIES "parse cache stats" in services/indexes.py
+    totals = await db.resume_parse_cache.aggregate([
+        {"$match": {"parser_version": PARSER_VERSION}},
+        {"$group": {"_id": None, "entries": {"$sum": 1}, "hits": {"$sum": "$hits"}}},
+    ]).to_list(1)
+    totals = totals[0] if totals else {"entries": 0, "hits": 0}
+    return {
+        "parser_version": PARSER_VERSION,
+        "hits": STATS["hits"],
+        "misses": STATS["misses"],
+        "hit_rate": round(STATS["hits"] / lookups, 3) if lookups else 0.0,
+        "cached_resumes": totals["entries"],
+        "lifetime_hits": totals["hits"],
+        # every entry was one miss, so lifetime hit rate = hits / (hits + entries)
+        "lifetime_hit_rate": round(totals["hits"] / (totals["hits"] + totals["entries"]), 3)
+        if totals["entries"] else 0.0,
+    }
@@ -0,0 +1,75 @@
+import io
+import os
+import time
+from typing import Iterator, List, Optional, Union
+
+import pypdfium2
+from PyPDF2 import PdfReader
+
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pypdfium2")
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 10))
+PDF_TIME_LIMIT = float(os.getenv("PDF_TIME_LIMIT", 5.0))  # seconds per document
+
+Source = Union[bytes, str]
+
+
+def _pages_pypdfium2(source: Source) -> Iterator[str]:
+    pdf = pypdfium2.PdfDocument(source)
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_bounded()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _pages_pypdf2(source: Source) -> Iterator[str]:
+    if isinstance(source, bytes):
+        reader = PdfReader(io.BytesIO(source))
+        for page in reader.pages:
+            yield page.extract_text() or ""
+    else:
+        with open(source, "rb") as fh:
+            reader = PdfReader(fh)
+            for page in reader.pages:
+                yield page.extract_text() or ""
+
+
+BACKENDS = {
+    "pypdfium2": _pages_pypdfium2,
+    "pypdf2": _pages_pypdf2,
+}
+
+
+def extract_pages(
+    source: Source,
+    backend: Optional[str] = None,
+    max_pages: Optional[int] = PDF_MAX_PAGES,
+    time_limit: Optional[float] = PDF_TIME_LIMIT,
+) -> List[str]:
+    """
+    Extract text page by page from a PDF given as bytes or a path.
+
+    Stops after `max_pages`, or once `time_limit` seconds have been spent
+    (checked between pages).
+    """
+    pages = []
+    started = time.perf_counter()
+    for text in BACKENDS[backend or PDF_BACKEND](source):
+        pages.append(text)
+        if max_pages and len(pages) >= max_pages:
+            break
+        if time_limit and time.perf_counter() - started > time_limit:
+            print(f"⏱️ PDF extraction stopped after {len(pages)} pages (time limit)")
+            break
+    return pages
+
+
+def extract_text(source: Source, **kwargs) -> str:
+    """Concatenated text of the non-empty pages; see extract_pages for options."""
+    return "\n".join(p for p in extract_pages(source, **kwargs) if p)
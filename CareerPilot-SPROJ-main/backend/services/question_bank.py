@@ -0,0 +1,111 @@
+import json
+import os
+import random
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "../data/software_questions.json")
+
+# How long a default (server-chosen) shuffle order stays stable.
+# Clients that pass back the returned `seed` get a stable order forever.
+SEED_RANGE = 2 ** 31  # fits a JS number and a Query(int)
+PERMUTATION_CACHE_SIZE = 256
+
+
+class QuestionBank:
+    """
+    In-memory practice question bank.
+
+    Questions are loaded once and indexed by difficulty and topic. Each index
+    entry is a Python int used as a bitset over question positions, so a
+    multi-difficulty + topic query is an OR over difficulties followed by an
+    AND with the topic bitset.
+    """
+
+    def __init__(self, questions: List[dict]):
+        self.questions = questions
+        self.all_bits = (1 << len(questions)) - 1
+        self.by_difficulty: Dict[str, int] = {}
+        self.by_topic: Dict[str, int] = {}
+
+        for i, q in enumerate(questions):
+            bit = 1 << i
+            diff = q["difficulty"].lower()
+            self.by_difficulty[diff] = self.by_difficulty.get(diff, 0) | bit
+            for topic in q.get("topics", []):
+                self.by_topic[topic] = self.by_topic.get(topic, 0) | bit
+
+        # (difficulties, topic, seed) -> shuffled list of question positions
+        self._permutations: "OrderedDict[Tuple, List[int]]" = OrderedDict()
+
+    @classmethod
+    def from_file(cls, path: str = DATA_PATH) -> "QuestionBank":
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    def _filter_bits(self, difficulties: Tuple[str, ...], topic: str) -> int:
+        if "all" in difficulties:
+            bits = self.all_bits
+        else:
+            bits = 0
+            for d in difficulties:
+                bits |= self.by_difficulty.get(d, 0)
+
+        if topic != "all":
+            bits &= self.by_topic.get(topic, 0)
+        return bits
+
+    def _permutation(self, difficulties: Tuple[str, ...], topic: str, seed: int) -> List[int]:
+        key = (difficulties, topic, seed)
+        order = self._permutations.get(key)
+        if order is not None:
+            self._permutations.move_to_end(key)
+            return order
+
+        bits = self._filter_bits(difficulties, topic)
+        order = [i for i, b in enumerate(reversed(bin(bits)[2:])) if b == "1"]
+        random.Random(seed).shuffle(order)
+
+        self._permutations[key] = order
+        if len(self._permutations) > PERMUTATION_CACHE_SIZE:
+            self._permutations.popitem(last=False)
+        return order
+
+    def page(
+        self,
+        difficulty: List[str],
+        topic: str = "all",
+        page: int = 1,
+        limit: int = 20,
+        seed: Optional[int] = None,
+    ) -> dict:
+        """
+        Return one page of questions in a seeded shuffle order.
+        The same (filters, seed) always yields the same order, so consecutive
+        pages never repeat or skip a question. Without a seed a fresh one is
+        drawn for this request and returned; the client sends it back for
+        the following pages.
+        """
+        if seed is None:
+            seed = random.randrange(SEED_RANGE)
+
+        difficulties = tuple(sorted({d.lower() for d in difficulty}))
+        order = self._permutation(difficulties, topic, seed)
+
+        start = max(page - 1, 0) * limit
+        return {
+            "questions": [self.questions[i] for i in order[start:start + limit]],
+            "totalCount": len(order),
+            "seed": seed,
+        }
+
+
+_bank: Optional[QuestionBank] = None
+
+
+def get_question_bank() -> QuestionBank:
+    """Return the shared question bank, loading it on first use."""
+    global _bank
+    if _bank is None:
+        _bank = QuestionBank.from_file()
+    return _bank
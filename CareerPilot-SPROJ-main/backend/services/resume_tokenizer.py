@@ -0,0 +1,73 @@
+import re
+
+HEADER_LINES = 4
+
+EDU_HINT_RE = re.compile(r"education|school|academic|degree|bachelor|master|university")
+# Anchored on the literal host so the regex engine can skip ahead; the
+# optional scheme is re-attached by hand in find_github_urls.
+GITHUB_RE = re.compile(r"github\.com/[^\s•]+")
+
+# section -> (keyword that opens it, keywords that close it)
+SECTIONS = {
+    "education": ("education", ("skills", "projects", "experience")),
+    "skills": ("skills", ("education", "projects", "experience")),
+    "projects": ("project", ("education", "skills", "experience")),
+    "experience": ("experience", ("education", "skills", "projects")),
+}
+KEYWORDS = sorted({kw for start, stops in SECTIONS.values() for kw in (start, *stops)})
+
+
+def find_github_urls(text: str) -> list:
+    """Same matches as the old (?:https?://)?github.com/... findall, but faster."""
+    urls = []
+    for m in GITHUB_RE.finditer(text):
+        start = m.start()
+        for scheme in ("https://", "http://"):
+            if start >= len(scheme) and text.startswith(scheme, start - len(scheme)):
+                start -= len(scheme)
+                break
+        urls.append(text[start:m.end()])
+    return urls
+
+
+def tokenize_resume(text: str) -> dict:
+    """
+    Split resume text into a section map in a single pass over the lines.
+
+    Each section behaves like an independent capture window: a line holding
+    one of its stop keywords closes it, a line holding its own keyword opens
+    it (and is itself skipped). Windows may overlap, exactly as the old
+    per-section scans did.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    sections = {name: [] for name in SECTIONS}
+    capturing = dict.fromkeys(SECTIONS, False)
+    education_hints = []
+
+    for line in lines:
+        low = line.lower()
+        found = {kw for kw in KEYWORDS if kw in low}
+        if EDU_HINT_RE.search(low):
+            education_hints.append(line)
+
+        if not found:
+            for name, on in capturing.items():
+                if on:
+                    sections[name].append(line)
+            continue
+
+        for name, (start, stops) in SECTIONS.items():
+            if any(kw in found for kw in stops):
+                capturing[name] = False
+            if start in found:
+                capturing[name] = True
+            elif capturing[name]:
+                sections[name].append(line)
+
+    return {
+        "lines": lines,
+        "header": lines[:HEADER_LINES],
+        "education_hints": education_hints,
+        "github": find_github_urls(text),
+        **sections,
+    }
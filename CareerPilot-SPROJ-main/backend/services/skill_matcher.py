@@ -0,0 +1,135 @@
+import json
+import os
+from collections import deque
+from typing import Dict, List, Optional
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "../data/skill_taxonomy.json")
+
+# A single skill can't dominate the domain score by being repeated
+MAX_COUNT_PER_SKILL = 3
+
+# Characters that continue a token: "java" must not match inside
+# "javascript", and "c" must not match inside "c++" or "c#".
+WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#")
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every skill name and alias in the taxonomy.
+
+    The goto/fail links are folded into a full transition table at build
+    time, so scanning is one dict lookup per character of the resume text.
+    Matches only count when they sit on token boundaries.
+    """
+
+    def __init__(self, taxonomy: List[dict]):
+        self.skills = [t["skill"] for t in taxonomy]
+        self.domains = [t["domain"] for t in taxonomy]
+        self.weights = [t.get("weight", 1.0) for t in taxonomy]
+
+        self.alias_index: Dict[str, int] = {}
+        goto: List[Dict[str, int]] = [{}]
+        self.out: List[list] = [[]]
+        for skill_idx, entry in enumerate(taxonomy):
+            for pattern in {entry["skill"].lower(), *(a.lower() for a in entry.get("aliases", []))}:
+                self.alias_index[pattern] = skill_idx
+                state = 0
+                for ch in pattern:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        self.out.append([])
+                    state = nxt
+                self.out[state].append((len(pattern), skill_idx))
+
+        # BFS: fail links + complete transition table
+        fail = [0] * len(goto)
+        self.delta: List[Dict[str, int]] = [dict(goto[0])]
+        self.delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = self.delta[fail[state]]
+            self.delta[state] = {**fallback, **goto[state]}
+            # longest first: "tailwind css" wins over the "css" ending at the same spot
+            self.out[state] = sorted(self.out[state] + self.out[fail[state]], reverse=True)
+            for ch, nxt in goto[state].items():
+                fail[nxt] = fallback.get(ch, 0)
+                queue.append(nxt)
+
+    def scan(self, text: str) -> Dict[int, int]:
+        """
+        Return {skill index: occurrences} for one pass over the text.
+        Overlapping hits resolve leftmost-longest, so "Tailwind CSS" counts
+        once and not also as "Tailwind" and "CSS".
+        """
+        low = text.lower()
+        n = len(low)
+        delta, out = self.delta, self.out
+        hits = []
+        state = 0
+        for i, ch in enumerate(low):
+            state = delta[state].get(ch, 0)
+            if not out[state]:
+                continue
+            if i + 1 < n and low[i + 1] in WORD_CHARS and ch in WORD_CHARS:
+                continue
+            for length, skill_idx in out[state]:
+                start = i - length + 1
+                if start > 0 and low[start - 1] in WORD_CHARS and low[start] in WORD_CHARS:
+                    continue
+                hits.append((start, -length, skill_idx))
+                break
+
+        counts: Dict[int, int] = {}
+        covered = 0
+        for start, neg_length, skill_idx in sorted(hits):
+            if start < covered:
+                continue
+            covered = start - neg_length
+            counts[skill_idx] = counts.get(skill_idx, 0) + 1
+        return counts
+
+    def normalize(self, skill: str) -> str:
+        """Canonical name for a known skill or alias, else the lowercased input."""
+        key = skill.strip().lower()
+        idx = self.alias_index.get(key)
+        return self.skills[idx] if idx is not None else key
+
+    def match(self, text: str) -> dict:
+        """
+        Normalized skills (most mentioned first), per-skill counts and weighted
+        domain scores. `domain` is the top-scoring domain, or "Other".
+        """
+        counts = self.scan(text)
+        ranked = sorted(counts, key=lambda idx: (-counts[idx], idx))
+
+        domain_scores: Dict[str, float] = {}
+        for idx, count in counts.items():
+            score = self.weights[idx] * min(count, MAX_COUNT_PER_SKILL)
+            domain_scores[self.domains[idx]] = domain_scores.get(self.domains[idx], 0.0) + score
+
+        domain = max(domain_scores, key=domain_scores.get) if domain_scores else "Other"
+        return {
+            "skills": [self.skills[idx] for idx in ranked],
+            "skill_counts": {self.skills[idx]: counts[idx] for idx in ranked},
+            "domain_scores": {d: round(s, 2) for d, s in sorted(domain_scores.items(), key=lambda kv: -kv[1])},
+            "domain": domain,
+        }
+
+
+_matcher: Optional[SkillMatcher] = None
+
+
+def get_matcher() -> SkillMatcher:
+    global _matcher
+    if _matcher is None:
+        with open(TAXONOMY_PATH, "r", encoding="utf-8") as f:
+            _matcher = SkillMatcher(json.load(f))
+    return _matcher
+
+
+def match_skills(text: str) -> dict:
+    return get_matcher().match(text)
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class TTLCache:
+    """
+    Small in-process LRU whose entries expire after `ttl` seconds.
+
+    get_or_load() is single-flight: while a key is being loaded, concurrent
+    callers await the same load instead of all hitting the database.
+    invalidate() also detaches loads in flight, so a read that started
+    before a write doesn't put the old value back when it finishes.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return default
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one key, or everything when no key is given."""
+        if key is None:
+            self.entries.clear()
+            self.inflight.clear()
+        else:
+            self.entries.pop(key, None)
+            self.inflight.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[1]
+
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # the leading load was cancelled, not us: load it ourselves
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.get_or_load(key, loader)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            if self.inflight.get(key) is future:  # not invalidated meanwhile
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.ttl,
+        }
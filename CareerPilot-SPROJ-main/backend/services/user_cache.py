@@ -0,0 +1,50 @@
+import os
+from typing import Optional
+
+from config import db
+from services.change_streams import watch
+from services.ttl_cache import TTLCache
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 30))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10_000))
+# Invalidate on writes made by other workers too (needs a replica set);
+# without it, another worker's edit is visible after at most USER_CACHE_TTL.
+USER_CACHE_CHANGE_STREAM = os.getenv("USER_CACHE_CHANGE_STREAM", "0") == "1"
+
+user_cache = TTLCache(ttl=USER_CACHE_TTL, maxsize=USER_CACHE_SIZE)
+
+
+async def get_user(clerk_id: str) -> Optional[dict]:
+    """
+    User document for an authenticated request, from cache when possible.
+    Unknown users are not cached, so a just-created account works at once.
+    """
+    # HOT_QUERIES "get_current_user" in services/indexes.py
+    user = await user_cache.get_or_load(clerk_id, lambda: db.users.find_one({"clerk_id": clerk_id}))
+    if user is None:
+        user_cache.invalidate(clerk_id)
+        return None
+    return dict(user)  # callers may modify their copy
+
+
+def invalidate_user(clerk_id: Optional[str]):
+    if clerk_id:
+        user_cache.invalidate(clerk_id)
+
+
+def _on_user_change(change: dict):
+    doc = change.get("fullDocument")
+    if doc and doc.get("clerk_id"):
+        invalidate_user(doc["clerk_id"])
+    else:
+        user_cache.invalidate()  # deletes only carry _id
+
+
+async def run_user_change_stream():
+    await watch(
+        db.users,
+        [{"$match": {"operationType": {"$in": ["update", "replace", "delete"]}}}],
+        _on_user_change,
+        "User cache",
+        full_document="updateLookup",
+    )
@@ -0,0 +1,283 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config import db
+from services.activity_log import event_doc, log_events
+from services.candidate_search import search_index
+from services.job_counters import bump
+from services.metrics_rollup import record, interview_score
+
+APPLY_MAX_EVENTS = 1000   # events coalesced into one round of writes
+APPLY_WINDOW = 0.02       # seconds to wait for more batches before applying
+APPLY_RETRY_DELAY = 30    # seconds before a failed round is tried again
+SWEEP_INTERVAL = 60       # seconds between sweeps for stranded events
+SWEEP_AGE = 300           # queued this long and not in this process's queue: re-queue
+
+# webhook_events.status / webhook_batches.status
+QUEUED, APPLIED = "queued", "applied"
+# per-event outcome in the batch report
+DUPLICATE, NOT_FOUND, SUPERSEDED = "duplicate", "not_found", "superseded"
+
+RESULT_FIELDS = ("technical_score", "behavioural_score", "report_url", "completed_at")
+
+
+def event_key(event: dict, idempotency_key: Optional[str], index: int, batch_size: int) -> str:
+    """Dedup key: the provider's event_id, else the Idempotency-Key header, else the payload hash."""
+    if event.get("event_id"):
+        return f"id:{event['event_id']}"
+    if idempotency_key:
+        return f"key:{idempotency_key}" if batch_size == 1 else f"key:{idempotency_key}:{index}"
+    body = json.dumps(event, sort_keys=True, default=str)
+    return "sha256:" + hashlib.sha256(body.encode()).hexdigest()
+
+
+class WebhookIngest:
+    """
+    Interview-completion callbacks: accept fast, apply in bulk.
+
+    accept() stores each event in webhook_events under its dedup key as
+    _id, so a replayed event is rejected by the unique index and reported
+    as a duplicate. It writes a webhook_batches report and queues the
+    rest. The worker coalesces queued batches (up to APPLY_MAX_EVENTS), and
+    for all of them does:
+      - one find for the candidates,
+      - one bulk_write for their results (last event per candidate wins),
+      - one find to see which completions this worker counted first,
+      - then one counter bump per job, one rollup write and one
+        activity insert.
+    Events still queued at shutdown are re-queued at startup; events left
+    queued by a failed request or another instance are picked up by the
+    periodic sweep.
+    """
+
+    def __init__(self, events, batches, candidates):
+        self.events = events
+        self.batches = batches
+        self.candidates = candidates
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.active = set()  # batch ids queued or being applied in this process
+        self.counts = {"accepted": 0, "duplicates": 0, "applied": 0, "not_found": 0, "rounds": 0}
+
+    async def accept(self, events: List[dict], idempotency_key: Optional[str] = None) -> dict:
+        batch_id = ObjectId()
+        now = datetime.utcnow()
+        keys = [event_key(e, idempotency_key, i, len(events)) for i, e in enumerate(events)]
+        docs = [
+            {"_id": key, "batch_id": batch_id, "index": i, "event": e, "status": QUEUED, "received_at": now}
+            for i, (key, e) in enumerate(zip(keys, events))
+        ]
+        duplicates, failed = set(), set()
+        try:
+            await self.events.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for err in e.details.get("writeErrors", []):
+                (duplicates if err.get("code") == 11000 else failed).add(err["index"])
+            if failed:
+                # apply what was stored; the provider's retry sees those as duplicates
+                self._queue(batch_id, events, duplicates | failed)
+                raise
+
+        results = [{"key": k, "temp_username": e["temp_username"], "status": DUPLICATE if i in duplicates else QUEUED}
+                   for i, (k, e) in enumerate(zip(keys, events))]
+        accepted = len(events) - len(duplicates)
+        try:
+            await self.batches.insert_one({
+                "_id": batch_id,
+                "received_at": now,
+                "status": QUEUED if accepted else APPLIED,
+                "counts": {"received": len(events), "duplicates": len(duplicates), "accepted": accepted,
+                           "applied": 0, "not_found": 0},
+                "results": results,
+            })
+        finally:
+            # the events are stored either way; without a report they still get applied
+            self._queue(batch_id, events, duplicates)
+        self.counts["accepted"] += accepted
+        self.counts["duplicates"] += len(duplicates)
+        return {"batch_id": str(batch_id), "received": len(events), "accepted": accepted,
+                "duplicates": len(duplicates)}
+
+    def _queue(self, batch_id: ObjectId, events: List[dict], skip=()):
+        items = [(i, e) for i, e in enumerate(events) if i not in skip]
+        if items:
+            self.active.add(batch_id)
+            self.queue.put_nowait((batch_id, items))
+
+    async def report(self, batch_id: str) -> Optional[dict]:
+        try:
+            oid = ObjectId(batch_id)
+        except Exception:
+            return None
+        doc = await self.batches.find_one({"_id": oid})
+        if doc:
+            doc["batch_id"] = str(doc.pop("_id"))
+        return doc
+
+    async def _next_round(self) -> List[Tuple[ObjectId, List[Tuple[int, dict]]]]:
+        """Wait for one batch, then take whatever else arrives within APPLY_WINDOW."""
+        batches = [await self.queue.get()]
+        size = len(batches[0][1])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + APPLY_WINDOW
+        while size < APPLY_MAX_EVENTS:
+            if self.queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self.queue.get_nowait()
+            batches.append(item)
+            size += len(item[1])
+        return batches
+
+    async def apply(self, batches: List[Tuple[ObjectId, List[Tuple[int, dict]]]]):
+        now = datetime.utcnow()
+        # last event per candidate wins; earlier ones are reported as superseded
+        latest: Dict[str, Tuple[ObjectId, int, dict]] = {}
+        outcome: Dict[ObjectId, Dict[int, str]] = {batch_id: {} for batch_id, _ in batches}
+        for batch_id, items in batches:
+            for index, event in items:
+                previous = latest.get(event["temp_username"])
+                if previous:
+                    outcome[previous[0]][previous[1]] = SUPERSEDED
+                latest[event["temp_username"]] = (batch_id, index, event)
+
+        # HOT_QUERIES "interview webhook" in services/indexes.py
+        found = await self.candidates.find(
+            {"temp_username": {"$in": list(latest)}},
+            {"temp_username": 1, "job_id": 1, "email": 1, "interview_completed": 1},
+        ).to_list(None)
+        by_username = {c["temp_username"]: c for c in found}
+
+        ops, first_ids, marker = [], [], ObjectId()
+        for username, (batch_id, index, event) in latest.items():
+            cand = by_username.get(username)
+            if cand is None:
+                outcome[batch_id][index] = NOT_FOUND
+                continue
+            outcome[batch_id][index] = APPLIED
+            fields = {f: event.get(f) for f in RESULT_FIELDS}
+            fields["updated_at"] = now
+            if cand.get("interview_completed"):
+                # a re-scored interview: update the results, don't count it again
+                ops.append(UpdateOne({"_id": cand["_id"]}, {"$set": fields}))
+            else:
+                first_ids.append(cand["_id"])
+                ops.append(UpdateOne(
+                    # another worker may complete it first; the marker shows who won
+                    {"_id": cand["_id"], "interview_completed": {"$ne": True}},
+                    {"$set": {**fields, "interview_completed": True, "completion_marker": marker},
+                     "$min": {"interview_completed_at": now}},
+                ))
+        if ops:
+            await self.candidates.bulk_write(ops, ordered=False)
+
+        counted = []
+        if first_ids:
+            won = await self.candidates.find(
+                {"_id": {"$in": first_ids}, "completion_marker": marker}, {"_id": 1}
+            ).to_list(None)
+            won_ids = {w["_id"] for w in won}
+            counted = [c for c in found if c["_id"] in won_ids]
+        for cand in found:
+            search_index.update(str(cand["_id"]), {"status": "Completed"})
+
+        if counted:
+            per_job: Dict[Optional[str], int] = {}
+            scores, activity = [], []
+            for cand in counted:
+                event = latest[cand["temp_username"]][2]
+                score = interview_score(event.get("technical_score"), event.get("behavioural_score"))
+                if score is not None:
+                    scores.append(score)
+                per_job[cand.get("job_id")] = per_job.get(cand.get("job_id"), 0) + 1
+                activity.append(event_doc("completed", cand["_id"], cand.get("email", ""), cand.get("job_id"),
+                                          score=score, at=now))
+            for job_id, n in per_job.items():
+                await bump(job_id, completed=n)
+            await record(completions=len(counted), score=sum(scores) if scores else None,
+                         score_count=len(scores), at=now)
+            await log_events(activity)
+
+        await self._report(batches, outcome, now)
+        self.counts["rounds"] += 1
+
+    async def _report(self, batches, outcome: Dict[ObjectId, Dict[int, str]], now: datetime):
+        report_ops = []
+        for batch_id, _ in batches:
+            statuses = outcome[batch_id]
+            applied = sum(s == APPLIED for s in statuses.values())
+            not_found = sum(s == NOT_FOUND for s in statuses.values())
+            self.counts["applied"] += applied
+            self.counts["not_found"] += not_found
+            report_ops.append(UpdateOne(
+                {"_id": batch_id},
+                {"$set": {"status": APPLIED, "applied_at": now,
+                          **{f"results.{i}.status": s for i, s in statuses.items()}},
+                 "$inc": {"counts.applied": applied, "counts.not_found": not_found}},
+            ))
+        await self.batches.bulk_write(report_ops, ordered=False)
+        # HOT_QUERIES "webhook events applied" in services/indexes.py
+        await self.events.update_many(
+            {"status": QUEUED, "batch_id": {"$in": [b for b, _ in batches]}},
+            {"$set": {"status": APPLIED, "applied_at": now}},
+        )
+
+    async def run(self):
+        await asyncio.gather(self._apply_loop(), self._sweep_loop())
+
+    async def _apply_loop(self):
+        while True:
+            batches = await self._next_round()
+            try:
+                await self.apply(batches)
+            except Exception as e:
+                # applying twice is safe: results are $set and counting is guarded
+                print(f"❌ Webhook apply failed for {len(batches)} batch(es), retrying: {e}")
+                loop = asyncio.get_running_loop()
+                for item in batches:
+                    loop.call_later(APPLY_RETRY_DELAY, self.queue.put_nowait, item)
+            else:
+                self.active.difference_update(b for b, _ in batches)
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            try:
+                queued = await self.requeue_pending(datetime.utcnow() - timedelta(seconds=SWEEP_AGE))
+                if queued:
+                    print(f"✅ Re-queued {queued} stranded interview webhook event(s)")
+            except Exception as e:
+                print("❌ Webhook sweep failed:", e)
+
+    async def requeue_pending(self, received_before: Optional[datetime] = None) -> int:
+        """Queue events accepted but not applied (at startup: by a previous run)."""
+        query = {"status": QUEUED}
+        if received_before is not None:
+            query["received_at"] = {"$lt": received_before}
+        pending: Dict[ObjectId, List[Tuple[int, dict]]] = {}
+        # HOT_QUERIES "webhook re-queue" and "webhook sweep" in services/indexes.py
+        async for doc in self.events.find(query, {"batch_id": 1, "index": 1, "event": 1}):
+            if doc["batch_id"] not in self.active:
+                pending.setdefault(doc["batch_id"], []).append((doc["index"], doc["event"]))
+        for batch_id, items in pending.items():
+            self.active.add(batch_id)
+            self.queue.put_nowait((batch_id, items))
+        return sum(len(items) for items in pending.values())
+
+    def stats(self) -> dict:
+        return {**self.counts, "queued_batches": self.queue.qsize()}
+
+
+webhooks = WebhookIngest(db.webhook_events, db.webhook_batches, db.candidates)
@@ -0,0 +1,120 @@
+import asyncio
+import os
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, WriteError
+from pymongo.results import InsertOneResult
+
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", 100))
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", 2))
+
+# every batcher, so shutdown can flush them all
+BATCHERS: List["WriteBatcher"] = []
+
+
+class WriteBatcher:
+    """
+    Write-behind buffer for one collection's hot inserts.
+
+    insert_one() queues the document and waits; the queue is written with
+    one insert_many(ordered=False). When nothing is being written the
+    queue goes out on the next loop pass, so a lone insert doesn't wait.
+    While a batch is in flight the next one fills until that write
+    returns, max_items is reached or max_delay passes. Each caller gets
+    its own InsertOneResult, or its own WriteError (e.g. duplicate key)
+    if only its document failed. _ids are assigned at enqueue time, so they
+    still follow call order. After close() inserts go straight through.
+    """
+
+    def __init__(self, collection, label: str, max_items: int = WRITE_BATCH_SIZE,
+                 max_delay_ms: float = WRITE_BATCH_WINDOW_MS):
+        self.collection = collection
+        self.label = label
+        self.max_items = max_items
+        self.max_delay = max_delay_ms / 1000
+        self.pending: List[Tuple[dict, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.inflight = set()
+        self.writing = 0
+        self.closed = False
+        self.counts = {"inserted": 0, "failed": 0, "batches": 0}
+        BATCHERS.append(self)
+
+    async def insert_one(self, doc: dict) -> InsertOneResult:
+        if self.closed:
+            return await self.collection.insert_one(doc)
+        doc.setdefault("_id", ObjectId())
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((doc, future))
+        if len(self.pending) >= self.max_items:
+            self.flush()
+        elif self.timer is None:
+            delay = self.max_delay if self.writing else 0
+            self.timer = asyncio.get_running_loop().call_later(delay, self.flush)
+        return await future
+
+    def flush(self):
+        """Start writing whatever is queued."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        self.writing += 1
+        task = asyncio.create_task(self._write(batch))
+        self.inflight.add(task)
+        task.add_done_callback(self.inflight.discard)
+
+    async def _write(self, batch: List[Tuple[dict, asyncio.Future]]):
+        self.counts["batches"] += 1
+        errors, failure = {}, None
+        try:
+            await self.collection.insert_many([doc for doc, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            errors = {err["index"]: err for err in e.details.get("writeErrors", [])}
+            if not errors:
+                # e.g. a write concern error: nothing says which documents made it
+                errors = {i: {"errmsg": str(e), "code": e.code} for i in range(len(batch))}
+        except Exception as e:
+            failure = e
+        finally:
+            self.writing -= 1
+            # whatever queued up meanwhile goes out now
+            if not self.writing and self.pending:
+                self.flush()
+
+        if failure is not None:
+            self.counts["failed"] += len(batch)
+            print(f"❌ Batched {self.label} insert of {len(batch)} failed: {failure}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(failure)
+            return
+
+        self.counts["inserted"] += len(batch) - len(errors)
+        self.counts["failed"] += len(errors)
+        for i, (doc, future) in enumerate(batch):
+            if future.done():  # caller went away; the document is written anyway
+                continue
+            err = errors.get(i)
+            if err is None:
+                future.set_result(InsertOneResult(doc["_id"], acknowledged=True))
+            else:
+                future.set_exception(WriteError(err.get("errmsg"), err.get("code"), err))
+
+    async def close(self):
+        """Write everything still queued or in flight; later inserts bypass the buffer."""
+        self.closed = True
+        self.flush()
+        if self.inflight:
+            await asyncio.gather(*self.inflight, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {**self.counts, "queued": len(self.pending), "batches_in_flight": len(self.inflight)}
+
+
+async def close_all():
+    for batcher in BATCHERS:
+        await batcher.close()
@@ -0,0 +1,284 @@
+"""
+In-process stand-ins for the external services and Mongo collections the
+tests talk to. The benchmarks drive the same fakes.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from itertools import count
+from types import SimpleNamespace
+
+import requests
+from bson import ObjectId
+
+from emailer import INTERVIEW_INVITE, INTERVIEW_INVITE_SUBJECT, interview_invite_context
+from services.email_outbox import EmailOutbox
+
+LOCK = threading.Lock()
+
+REPOS = [{"name": f"repo{i}", "description": "demo", "stargazers_count": i, "language": "Python", "topics": []}
+         for i in range(8)]
+GITHUB = {"latency": 0.05, "calls": 0, "limited_until": 0.0, "down": False}
+ETAG = '"v1"'
+
+
+class MemoryGitHubCache:
+    """Just enough of a motor collection for GitHubCache."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.setdefault(query["_id"], {"_id": query["_id"]})
+        for path, value in update["$set"].items():
+            *parents, leaf = path.split(".")
+            target = doc
+            for p in parents:
+                target = target.setdefault(p, {})
+            target[leaf] = value
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def send(self, status: int, body, content_type="application/json", headers=None):
+        data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if status == 200:
+            self.send_header("ETag", ETAG)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        GITHUB["calls"] += 1
+        time.sleep(GITHUB["latency"])
+        if GITHUB["down"]:
+            return self.send(502, {"message": "Bad Gateway"})
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if time.time() < GITHUB["limited_until"]:
+            return self.send(403, {"message": "API rate limit exceeded"}, headers={
+                "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(GITHUB["limited_until"])})
+
+        path = self.path.split("?")[0]
+        host = f"http://{self.headers['Host']}"
+        if path.startswith("/raw/"):
+            return self.send(200, "# README\n" + "text " * 400, "text/plain")
+        parts = path.strip("/").split("/")
+        if parts[0] == "users" and len(parts) == 2:
+            return self.send(200, {"login": parts[1], "name": "Demo User", "public_repos": len(REPOS)})
+        if parts[0] == "users" and parts[2] == "repos":
+            return self.send(200, REPOS)
+        if parts[0] == "repos" and parts[-1] == "readme":
+            if "raw" in self.headers.get("Accept", ""):
+                return self.send(200, "# README\n" + "text " * 400, "text/plain")
+            return self.send(200, {"download_url": f"{host}/raw/{parts[1]}/{parts[2]}"})
+        self.send(404, {"message": "Not Found"})
+
+
+def legacy_github_summary(base: str, username: str) -> dict:
+    """The old routes/github_analysis.py flow, pointed at the stub."""
+    profile = requests.get(f"{base}/users/{username}").json()
+    repos = requests.get(f"{base}/users/{username}/repos?sort=updated&per_page=20").json()
+    top = []
+    for repo in sorted(repos, key=lambda r: r["stargazers_count"], reverse=True)[:5]:
+        meta = requests.get(f"{base}/repos/{username}/{repo['name']}/readme")
+        text = requests.get(meta.json()["download_url"]).text if meta.status_code == 200 else ""
+        top.append({"name": repo["name"], "readme_excerpt": text[:500]})
+    return {"profile": profile, "top_repos": top}
+
+
+SENDGRID = {"latency": 0.03, "calls": 0, "recipients": 0, "fail_next": 0}
+
+
+class StubSendGrid(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status: int, body: str = ""):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-Message-Id", "stub-message")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(SENDGRID["latency"])
+        with LOCK:
+            SENDGRID["calls"] += 1
+            if SENDGRID["fail_next"]:
+                SENDGRID["fail_next"] -= 1
+                return self.reply(503, '{"errors": [{"message": "unavailable"}]}')
+        personalizations = body["personalizations"]
+        if len(personalizations) > 1000:
+            return self.reply(400, '{"errors": [{"message": "too many personalizations"}]}')
+        if any(p["to"][0]["email"].startswith("bad@") for p in personalizations):
+            return self.reply(400, '{"errors": [{"message": "invalid email"}]}')
+        with LOCK:
+            SENDGRID["recipients"] += len(personalizations)
+        self.reply(202)
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    for key, cond in query.items():
+        value = doc.get(key)
+        if isinstance(cond, dict):
+            for op, arg in cond.items():
+                if op == "$in" and value not in arg:
+                    return False
+                if op == "$lte" and not (value is not None and value <= arg):
+                    return False
+                if op == "$lt" and not (value is not None and value < arg):
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+def _apply(doc: dict, update: dict):
+    doc.update(update.get("$set", {}))
+    for key in update.get("$unset", {}):
+        doc.pop(key, None)
+    for key, n in update.get("$inc", {}).items():
+        doc[key] = doc.get(key, 0) + n
+
+
+class MemoryCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs.sort(key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length=None):
+        return [dict(d) for d in self.docs]
+
+    def __aiter__(self):
+        async def gen():
+            for d in self.docs:
+                yield dict(d)
+        return gen()
+
+
+class MemoryOutbox:
+    """Just enough of a motor collection for EmailOutbox."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def insert_one(self, doc):
+        doc.setdefault("_id", ObjectId())
+        self.docs[doc["_id"]] = doc
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def insert_many(self, docs, ordered=True):
+        return SimpleNamespace(inserted_ids=[(await self.insert_one(d)).inserted_id for d in docs])
+
+    def find(self, query, projection=None):
+        return MemoryCursor([d for d in self.docs.values() if _matches(d, query)])
+
+    async def update_many(self, query, update):
+        for d in self.docs.values():
+            if _matches(d, query):
+                _apply(d, update)
+
+    async def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            await self.update_many(op._filter, op._doc)
+
+
+def invite(i: int, to: str = None) -> dict:
+    context = interview_invite_context(f"Candidate {i}", f"http://localhost:5173/interview/magic/t{i}",
+                                       f"cand{i}@placeholder.ai", "pw", "Backend Engineer", "Senior")
+    return EmailOutbox.message(to or f"cand{i}@example.com", INTERVIEW_INVITE_SUBJECT, INTERVIEW_INVITE, context)
+
+
+CLERK = {"latency": 0.2, "created": 0, "renamed": 0}
+IDS = count()
+
+
+def fake_user(user_id: str, body: dict) -> dict:
+    return {
+        "id": user_id, "object": "user", "external_id": None, "primary_email_address_id": None,
+        "primary_phone_number_id": None, "primary_web3_wallet_id": None, "username": None,
+        "first_name": body.get("first_name"), "last_name": body.get("last_name"), "has_image": False,
+        "public_metadata": {}, "email_addresses": [], "phone_numbers": [], "web3_wallets": [], "passkeys": [],
+        "password_enabled": True, "two_factor_enabled": False, "totp_enabled": False,
+        "backup_code_enabled": False, "mfa_enabled_at": None, "mfa_disabled_at": None,
+        "external_accounts": [], "saml_accounts": [], "enterprise_accounts": [], "last_sign_in_at": None,
+        "banned": False, "locked": False, "lockout_expires_in_seconds": None,
+        "verification_attempts_remaining": None, "updated_at": 0, "created_at": 0,
+        "delete_self_enabled": False, "create_organization_enabled": False, "last_active_at": None,
+        "legal_accepted_at": None,
+    }
+
+
+class FakeClerk(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def reply(self, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def body(self) -> dict:
+        return json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+    def do_POST(self):
+        body = self.body()
+        time.sleep(CLERK["latency"])
+        with LOCK:
+            CLERK["created"] += 1
+        self.reply(fake_user(f"user_{next(IDS)}", body))
+
+    def do_PATCH(self):
+        body = self.body()
+        time.sleep(CLERK["latency"])
+        with LOCK:
+            CLERK["renamed"] += 1
+        self.reply(fake_user(self.path.rsplit("/", 1)[-1], body))
+
+
+class MemoryPool:
+    """Just enough of a motor collection for ClerkAccountPool."""
+
+    def __init__(self):
+        self.docs = []
+
+    async def find_one_and_update(self, query, update, projection=None, sort=None):
+        for doc in sorted(self.docs, key=lambda d: d["created_at"]):
+            if doc["status"] == query["status"]:
+                before = dict(doc)
+                doc.update(update["$set"])
+                return before
+        return None
+
+    async def count_documents(self, query):
+        return sum(d["status"] == query["status"] for d in self.docs)
+
+    async def insert_many(self, docs, ordered=True):
+        for doc in docs:
+            self.docs.append({"_id": ObjectId(), **doc})
@@ -0,0 +1,68 @@
+"""
+The resume parser as it was before the single-pass tokenizer: the golden
+reference for tests/test_resume_tokenizer.py and the baseline for
+benchmarks/bench_resume_parser.py.
+"""
+import re
+
+
+def legacy_extract_name(lines):
+    for line in lines[:4]:
+        if re.search(r"\d", line) or "@" in line or "http" in line.lower():
+            continue
+        if re.match(r"^[A-Za-z\s\-]{2,50}$", line):
+            return line.strip()
+    return "Unknown"
+
+
+def legacy_extract_section(lines, section_keyword, stop_keywords):
+    capture = False
+    results = []
+    section_keyword_lower = section_keyword.lower()
+    stop_keywords_lower = [k.lower() for k in stop_keywords]
+    for line in lines:
+        line_lower = line.lower()
+        if any(k in line_lower for k in stop_keywords_lower):
+            capture = False
+        if section_keyword_lower in line_lower:
+            capture = True
+            continue
+        if capture and line.strip():
+            results.append(line.strip())
+    return results
+
+
+def legacy_parse(text):
+    """parse_resume_regex as it was before the tokenizer."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    name = legacy_extract_name(lines)
+    edu_keywords = ["education", "school", "academic", "degree", "bachelor", "master", "university"]
+    education = legacy_extract_section(lines, "education", stop_keywords=["skills", "projects", "experience"])
+    if not education:
+        education = [line for line in lines if any(k.lower() in line.lower() for k in edu_keywords)]
+    skills_lines = legacy_extract_section(lines, "skills", stop_keywords=["education", "projects", "experience"])
+    skills = []
+    for line in skills_lines:
+        for part in re.split(r"[,;•\-]", line):
+            part_clean = part.strip()
+            if part_clean and part_clean not in skills:
+                skills.append(part_clean)
+    projects = legacy_extract_section(lines, "project", stop_keywords=["education", "skills", "experience"])
+    github = re.findall(r"(?:https?://)?github\.com/[^\s•]+", text)
+    work_experience = legacy_extract_section(lines, "experience", stop_keywords=["education", "skills", "projects"])
+    return {"name": name, "education": education, "skills": skills, "projects": projects,
+            "github": github, "work_experience": work_experience}
+
+
+# Overlapping headings, keywords inside body lines and no education section
+SYNTHETIC = """Jane Doe
+jane@example.com | github.com/janedoe
+Skills & Projects
+Python, SQL; Docker - Python
+Experience with ML projects
+Research Project: Graph search
+Worked at a school as TA
+Experience
+Software Engineer, Acme (Bachelor programme sponsor)
+Technical Skills: Go, Rust
+"""
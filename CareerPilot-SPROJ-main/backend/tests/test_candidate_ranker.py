@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import services.candidate_ranker as candidate_ranker
+from services.candidate_ranker import CandidateRanker
+
+pytestmark = pytest.mark.anyio
+
+
+class Candidates:
+    """The find/count_documents subset the ranker's sync uses."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def _matching(self, query):
+        for doc in self.docs.values():
+            if doc["job_id"] != query["job_id"]:
+                continue
+            since = query.get("updated_at", {}).get("$gte")
+            if since is None or doc["updated_at"] >= since:
+                yield doc
+
+    async def _iter(self, docs):
+        for doc in docs:
+            yield doc
+
+    def find(self, query, projection=None):
+        return self._iter([dict(d) for d in self._matching(query)])
+
+    async def count_documents(self, query):
+        return sum(1 for _ in self._matching(query))
+
+
+@pytest.fixture
+def candidates(monkeypatch):
+    collection = Candidates()
+    monkeypatch.setattr(candidate_ranker, "db", SimpleNamespace(candidates=collection))
+    return collection
+
+
+def put(candidates, cid, job_id, skills, updated_at):
+    candidates.docs[cid] = {"_id": cid, "job_id": job_id, "skills": skills, "updated_at": updated_at}
+
+
+async def test_sync_picks_up_late_commits_edits_and_deletes(candidates):
+    ranker = CandidateRanker()
+    past = datetime.utcnow() - timedelta(minutes=5)
+    put(candidates, "a", "job", ["Python"], past)
+    put(candidates, "b", "job", ["Java"], past)
+    put(candidates, "c", "job", ["Go"], past)
+    assert (await ranker.rank("job", ["Python"], 5))["total"] == 3
+
+    # a write-behind batch committing after the watermark moved: stamped
+    # slightly before the last sync, but not yet visible to it
+    put(candidates, "late", "job", ["Python"], datetime.utcnow() - timedelta(seconds=1))
+    put(candidates, "b", "job", ["Python"], datetime.utcnow())  # skills edited
+    del candidates.docs["c"]  # deleted
+    put(candidates, "a", "other", ["Python"], datetime.utcnow())  # moved to another job
+
+    result = await ranker.rank("job", ["Python"], 5)
+    assert result["total"] == 2
+    assert {r["id"] for r in result["ranked"]} == {"late", "b"}
+    assert all(r["score"] == 1.0 for r in result["ranked"])
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+import pytest
+from clerk_backend_api import Clerk
+
+import utils
+from services.clerk_pool import ClerkAccountPool, AVAILABLE
+from tests.fakes import CLERK, FakeClerk, MemoryPool
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingClerk(FakeClerk):
+    """FakeClerk that also records the most user creations in flight at once."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def do_POST(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            super().do_POST()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+@pytest.fixture
+def clerk(serve, monkeypatch):
+    monkeypatch.setitem(CLERK, "latency", 0.02)
+    monkeypatch.setitem(CLERK, "created", 0)
+    monkeypatch.setitem(CLERK, "renamed", 0)
+    CountingClerk.in_flight = CountingClerk.peak = 0
+    monkeypatch.setattr(utils, "clerk", Clerk(bearer_auth="fake", server_url=f"{serve(CountingClerk)}/v1"))
+    return CLERK
+
+
+async def test_claims_come_from_the_pool_and_are_renamed_later(clerk):
+    pool = ClerkAccountPool(MemoryPool(), low_water=10, target=10)
+    assert await pool.top_up() == 10
+    clerk["created"] = 0
+
+    accounts = await asyncio.gather(*(pool.claim(f"Candidate Number{i}") for i in range(10)))
+    assert clerk["created"] == 0
+    assert all(a["email"].endswith("@placeholder.ai") and a["password"] for a in accounts)
+    assert len({a["clerk_user_id"] for a in accounts}) == 10
+
+    await asyncio.gather(*pool.renames)
+    assert clerk["renamed"] == 10
+
+
+async def test_drained_pool_falls_back_inline_and_refills(clerk):
+    pool = ClerkAccountPool(MemoryPool(), low_water=5, target=10)
+    await pool.top_up()
+    refill = asyncio.create_task(pool.run_refill_loop())
+    try:
+        for i in range(15):
+            account = await pool.claim(f"Candidate Number{i}")
+            assert account["clerk_user_id"]
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if await pool.collection.count_documents({"status": AVAILABLE}) >= pool.low_water:
+                break
+    finally:
+        refill.cancel()
+    assert pool.counts["fallback"] > 0
+    assert await pool.collection.count_documents({"status": AVAILABLE}) >= pool.low_water
+
+
+async def test_inline_fallback_respects_the_concurrency_bound(clerk):
+    pool = ClerkAccountPool(MemoryPool(), low_water=0, target=0, concurrency=2)
+    accounts = await asyncio.gather(*(pool.claim(f"Candidate Number{i}") for i in range(8)))
+    assert len(accounts) == 8
+    assert pool.counts["fallback"] == 8
+    assert CountingClerk.peak <= 2
@@ -0,0 +1,53 @@
+import pytest
+
+from services import email_outbox
+from services.email_outbox import EmailOutbox, SendGridSender, FAILED, SENT
+from tests.fakes import SENDGRID, MemoryOutbox, StubSendGrid, invite
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def outbox(serve, monkeypatch):
+    monkeypatch.setitem(SENDGRID, "latency", 0)
+    monkeypatch.setitem(SENDGRID, "fail_next", 0)
+    monkeypatch.setattr(email_outbox, "RETRY_BASE", 0)
+    sender = SendGridSender(api_key="stub-key", host=serve(StubSendGrid), from_email="hr@careerpilot.test")
+    yield EmailOutbox(MemoryOutbox(), sender)
+    await sender.close()
+
+
+def statuses(outbox: EmailOutbox) -> dict:
+    counts = {}
+    for doc in outbox.collection.docs.values():
+        counts[doc["status"]] = counts.get(doc["status"], 0) + 1
+    return counts
+
+
+async def test_batch_goes_out_in_one_call(outbox):
+    await outbox.enqueue_many([invite(i) for i in range(50)])
+    SENDGRID["calls"] = SENDGRID["recipients"] = 0
+    while await outbox.drain_once():
+        pass
+    assert SENDGRID["calls"] == 1
+    assert SENDGRID["recipients"] == 50
+    assert statuses(outbox) == {SENT: 50}
+
+
+async def test_503_is_retried_not_lost(outbox):
+    await outbox.enqueue_many([invite(i) for i in range(10)])
+    SENDGRID["fail_next"] = 1
+    await outbox.drain_once()
+    assert SENT not in statuses(outbox)
+    await outbox.drain_once()
+    docs = list(outbox.collection.docs.values())
+    assert all(d["status"] == SENT and d["attempts"] == 2 for d in docs)
+
+
+async def test_rejected_batch_is_split_so_only_the_bad_address_fails(outbox):
+    await outbox.enqueue_many([invite(i) for i in range(5)] + [invite(5, "bad@example")])
+    SENDGRID["calls"] = 0
+    await outbox.drain_once()
+    assert statuses(outbox) == {SENT: 5, FAILED: 1}
+    failed = next(d for d in outbox.collection.docs.values() if d["status"] == FAILED)
+    assert failed["to"] == "bad@example"
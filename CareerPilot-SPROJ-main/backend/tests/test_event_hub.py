@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from routes import dashboard
+from services.event_hub import EventHub, hub
+
+pytestmark = pytest.mark.anyio
+
+JOBS = ["job0", "job1", "job2"]
+
+
+def event(i: int, job_id: str = None, event_id: ObjectId = None) -> dict:
+    return {"id": str(event_id or ObjectId()), "type": "upload", "job_id": job_id or JOBS[i % len(JOBS)],
+            "email": f"cand{i}@example.com", "score": None, "seq": i}
+
+
+async def received(sub, n: int) -> list:
+    events = []
+    for _ in range(n):
+        e = await sub.get(timeout=1)
+        assert e is not None, f"subscriber stalled after {len(events)} of {n}"
+        events.append(e)
+    return events
+
+
+async def test_all_subscriber_sees_every_event_in_order():
+    local = EventHub()
+    sub = local.subscribe()
+    for i in range(30):
+        local.publish(event(i))
+    assert [e["seq"] for e in await received(sub, 30)] == list(range(30))
+    assert sub.dropped == 0
+
+
+async def test_job_subscriber_only_sees_its_job():
+    local = EventHub()
+    sub = local.subscribe("job1")
+    for i in range(30):
+        local.publish(event(i))
+    events = await received(sub, 10)
+    assert {e["job_id"] for e in events} == {"job1"}
+    assert await sub.get(timeout=0.05) is None
+
+
+class FakeRequest:
+    def __init__(self):
+        self.closed = False
+
+    async def is_disconnected(self):
+        return self.closed
+
+
+async def test_sse_framing_job_filter_and_disconnect_cleanup():
+    request = FakeRequest()
+    response = await dashboard.activity_stream(request, job_id="job1", last_event_id=None)
+    body = response.body_iterator
+
+    assert (await body.__anext__()).startswith("retry:")
+    hub.publish(event(0, "job0"))
+    hub.publish(event(1, "job1"))
+    frame = await body.__anext__()
+    assert frame.startswith("id: ") and "event: upload" in frame and '"job_id": "job1"' in frame
+    request.closed = True  # checked before the next wait
+    with pytest.raises(StopAsyncIteration):
+        await body.__anext__()
+    assert hub.stats()["subscribers"] == 0
+
+
+async def test_reconnect_replay_is_not_resent_from_the_live_queue(monkeypatch):
+    ids = sorted(ObjectId() for _ in range(3))
+    replay = [event(0, "job1", ids[0]), event(1, "job1", ids[1])]
+
+    async def events_after(after, job_id=None):
+        # published after subscribing, before the replay query: in both
+        hub.publish(replay[1])
+        return replay
+
+    monkeypatch.setattr(dashboard, "events_after", events_after)
+    request = FakeRequest()
+    response = await dashboard.activity_stream(request, job_id="job1", last_event_id=str(ObjectId()))
+    body = response.body_iterator
+
+    frames = [await body.__anext__() for _ in range(3)]
+    assert [f.split("\n")[0] for f in frames[:2]] == [f"id: {ids[0]}", f"id: {ids[1]}"]
+    hub.publish(event(2, "job1", ids[2]))
+    frame = await asyncio.wait_for(body.__anext__(), 1)
+    assert frame.startswith(f"id: {ids[2]}")
+    request.closed = True
+    with pytest.raises(StopAsyncIteration):
+        await body.__anext__()
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from routes import github_analysis
+from services.github_cache import GitHubCache
+from services.github_client import Budget, BudgetExceeded, GitHubClient, RateLimited
+from tests.fakes import GITHUB, MemoryGitHubCache, StubGitHub, legacy_github_summary
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(serve, monkeypatch):
+    monkeypatch.setitem(GITHUB, "latency", 0.005)
+    monkeypatch.setitem(GITHUB, "limited_until", 0.0)
+    monkeypatch.setitem(GITHUB, "down", False)
+    client = GitHubClient(base_url=serve(StubGitHub), token=None)
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def cache(client, monkeypatch):
+    cache = GitHubCache(client, MemoryGitHubCache(), ttl=3600)
+    monkeypatch.setattr(github_analysis, "github_cache", cache)
+    return cache
+
+
+async def test_summary_matches_legacy_flow(client, cache):
+    summary = await github_analysis.build_github_summary("https://github.com/demo")
+    legacy = legacy_github_summary(client.base_url, "demo")
+    assert [r["readme_excerpt"] for r in summary["top_repos"]] == [r["readme_excerpt"] for r in legacy["top_repos"]]
+
+
+async def test_cache_within_ttl_makes_no_calls(client, cache):
+    await github_analysis.build_github_summary("https://github.com/demo")
+    GITHUB["calls"] = 0
+    await github_analysis.build_github_summary("https://github.com/demo")
+    assert GITHUB["calls"] == 0
+    assert cache.stats()["fresh_hits"] > 0
+
+
+async def test_stale_copy_served_when_github_is_down(client, cache):
+    fresh = await github_analysis.build_github_summary("https://github.com/demo")
+    cache.ttl = 0
+    GITHUB["down"] = True
+    GITHUB["calls"] = 0
+    start = time.perf_counter()
+    stale = await github_analysis.build_github_summary("https://github.com/demo")
+    assert stale["top_repos"] == fresh["top_repos"]
+    # one attempt per entry, no retry backoff
+    assert GITHUB["calls"] == 7
+    assert time.perf_counter() - start < 0.5
+
+
+async def test_waits_for_rate_limit_reset_within_budget(client):
+    GITHUB["limited_until"] = time.time() + 0.3
+    start = time.perf_counter()
+    resp = await client.request("/users/demo", Budget(5))
+    assert resp.json()["login"] == "demo"
+    assert time.perf_counter() - start >= 0.25
+
+
+async def test_reset_beyond_budget_fails_fast(client):
+    GITHUB["limited_until"] = client.blocked_until = time.time() + 30
+    GITHUB["calls"] = 0
+    with pytest.raises(RateLimited):
+        await client.request("/users/demo", Budget(2))
+    assert GITHUB["calls"] == 0
+
+
+async def test_budget_exhausted_raises(client):
+    with pytest.raises(BudgetExceeded):
+        await client.request("/users/demo", Budget(0))
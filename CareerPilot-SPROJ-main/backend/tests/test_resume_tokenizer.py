@@ -0,0 +1,23 @@
+import glob
+import os
+
+import pytest
+
+from routes.resume import parse_resume_regex, summarize_resume
+from services.pdf_extract import BACKENDS, extract_text
+from tests.legacy_resume_parser import SYNTHETIC, legacy_parse
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "uploads", "resumes")
+SAMPLES = [pytest.param(None, None, id="synthetic")] + [
+    pytest.param(path, backend, id=f"{os.path.basename(path)[:8]}-{backend}")
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))
+    for backend in BACKENDS
+]
+
+
+@pytest.mark.parametrize("path, backend", SAMPLES)
+def test_tokenizer_matches_legacy_parser(path, backend):
+    text = SYNTHETIC if path is None else extract_text(path, backend=backend)
+    new, old = parse_resume_regex(text), legacy_parse(text)
+    assert new == old
+    assert summarize_resume(new) == summarize_resume(old)
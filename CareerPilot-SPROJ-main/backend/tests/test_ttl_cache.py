@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from services.ttl_cache import TTLCache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_invalidate_during_load_does_not_cache_the_old_value():
+    cache = TTLCache(ttl=60)
+    db = {"user": "old"}
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_find():
+        value = db["user"]  # read before the write lands
+        started.set()
+        await release.wait()
+        return value
+
+    load = asyncio.create_task(cache.get_or_load("user", slow_find))
+    await started.wait()
+    db["user"] = "new"
+    cache.invalidate("user")
+    release.set()
+    assert await load == "old"  # that caller started before the write
+
+    async def find():
+        return db["user"]
+
+    assert await asyncio.wait_for(cache.get_or_load("user", find), 1) == "new"
+
+
+async def test_load_started_after_invalidate_is_not_joined_to_the_old_one():
+    cache = TTLCache(ttl=60)
+    release = asyncio.Event()
+
+    async def stale():
+        await release.wait()
+        return "old"
+
+    async def fresh():
+        return "new"
+
+    first = asyncio.create_task(cache.get_or_load("k", stale))
+    await asyncio.sleep(0)
+    cache.invalidate()
+    assert await asyncio.wait_for(cache.get_or_load("k", fresh), 1) == "new"
+    release.set()
+    assert await first == "old"
+    assert cache.get("k") == "new"
+
+
+async def test_cancelled_leader_releases_waiters():
+    cache = TTLCache(ttl=60)
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def fast():
+        return 2
+
+    leader = asyncio.create_task(cache.get_or_load("k", slow))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("k", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await asyncio.wait_for(waiter, 1) == 2
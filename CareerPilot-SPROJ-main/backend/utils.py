@@ -1,6 +1,5 @@
-import uuid, random, string, re, aiofiles, os
+import uuid, random, string, re, aiofiles, os, hashlib
 from pathlib import Path
-from PyPDF2 import PdfReader
 from typing import Optional
 from config import UPLOAD_FOLDER
 import random
@@ -18,22 +17,32 @@ def random_string(k: int = 8) -> str:
     """Random alpha-numeric string."""
     return ''.join(random.choices(string.ascii_letters + string.digits, k=k))
 
-async def save_upload(file) -> str:
+async def save_upload(file) -> tuple:
     """
-    Save uploaded file and return the full path on disk.
+    Save uploaded file under its SHA-256 content hash.
+    Returns (full path on disk, hex digest). Re-uploading the same bytes
+    reuses the existing file instead of writing a duplicate.
     Accepts any extension (caller is responsible to validate).
     """
     ext = file.filename.split(".")[-1].lower()
-    fname = f"{uuid.uuid4().hex}.{ext}"
-    dest = Path(UPLOAD_FOLDER) / fname
+    tmp = Path(UPLOAD_FOLDER) / f".{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
 
-    # write file asynchronously
-    async with aiofiles.open(dest, "wb") as out:
+    # write file asynchronously, hashing while streaming
+    async with aiofiles.open(tmp, "wb") as out:
         # rewind file (UploadFile might be reused)
         await file.seek(0)
         while chunk := await file.read(1024 * 1024):
+            digest.update(chunk)
             await out.write(chunk)
-    return str(dest)
+
+    sha256 = digest.hexdigest()
+    dest = Path(UPLOAD_FOLDER) / f"{sha256}.{ext}"
+    if dest.exists():
+        tmp.unlink()
+    else:
+        os.replace(tmp, dest)
+    return str(dest), sha256
 
 IGNORE_PATTERNS = [
     r"support@", r"info@", r"admin@", r"noreply@", r"github\.com", r"linkedin\.com"
@@ -91,25 +100,6 @@ def extract_email_from_text(text: str, top_chars: int = 500) -> Optional[str]:
     return filtered_emails[0].lower()
 
 
-def get_text_from_pdf(path: str) -> str:
-    """
-    Synchronous PDF text extraction using PyPDF2.
-    Returns concatenated text of all pages.
-    """
-    try:
-        with open(path, "rb") as fh:
-            reader = PdfReader(fh)
-            text = []
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text.append(page_text)
-            return "\n".join(text)
-    except Exception:
-        return ""
-
-
-
 def create_clerk_user(full_name: str = None):
     # Generate random email & password
     random_email = f"{''.join(random.choices(string.ascii_lowercase+string.digits, k=10))}@placeholder.ai"
@@ -134,4 +124,13 @@ def create_clerk_user(full_name: str = None):
         "clerk_user_id": user.id,
         "email": random_email,
         "password": random_password
-    }
\ No newline at end of file
+    }
+
+def rename_clerk_user(clerk_user_id: str, full_name: str):
+    """Put the candidate's name on an account created without one."""
+    parts = full_name.split()
+    clerk.users.update(
+        user_id=clerk_user_id,
+        first_name=parts[0],
+        last_name=" ".join(parts[1:]) if len(parts) > 1 else None
+    )
\ No newline at end of file
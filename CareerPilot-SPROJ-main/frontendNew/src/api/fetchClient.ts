@@ -19,3 +19,22 @@ export async function apiFetch(endpoint: string, options: RequestInit = {}) {
   return await res.json();
 }
 
+
+// Follows next_cursor until the last page; returns the merged `key` rows
+// together with the first page's other fields (e.g. server-side counts).
+export async function apiFetchAll(endpoint: string, key: string, pageSize = 500) {
+  const sep = endpoint.includes("?") ? "&" : "?";
+  let first: any = null;
+  let rows: any[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const params = `limit=${pageSize}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : "");
+    const page = await apiFetch(`${endpoint}${sep}${params}`);
+    first = first ?? page;
+    rows = rows.concat(page[key] || []);
+    cursor = page.next_cursor ?? null;
+  } while (cursor);
+
+  return { ...first, [key]: rows, next_cursor: null };
+}
@@ -116,6 +116,7 @@ export default function PracticeLibrary() {
   const [questions, setQuestions] = useState<Question[]>([]);
   const [totalCount, setTotalCount] = useState(0);
   const [page, setPage] = useState(1);
+  const [seed, setSeed] = useState<number | null>(null);
   const pageSize = 20;
   const BACKEND_URL = "https://career-pilot-s24d.onrender.com";
   const [loading, setLoading] = useState(false);
@@ -155,6 +156,7 @@ export default function PracticeLibrary() {
       if (topic !== "all") query.append("topic", topic);
       query.append("page", pageNumber.toString());
       query.append("limit", pageSize.toString());
+      if (pageNumber > 1 && seed !== null) query.append("seed", seed.toString());
 
       const res = await fetch(
         `${BACKEND_URL}/api/practice/software?${query.toString()}`
@@ -164,6 +166,7 @@ export default function PracticeLibrary() {
       const data = await res.json();
 
       if (pageNumber === 1) {
+        setSeed(data.seed ?? null);
         setQuestions(data.questions || []);
       } else {
         setQuestions((prev) => [...prev, ...(data.questions || [])]);
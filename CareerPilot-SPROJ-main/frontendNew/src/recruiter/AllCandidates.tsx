@@ -12,7 +12,7 @@ import {
 } from "../components/ui/select";
 import { Sheet, SheetContent } from "../components/ui/sheet";
 import { CandidateProfileModal } from "./CandidateProfileModal";
-import { apiFetch } from "../api/fetchClient";
+import { apiFetchAll } from "../api/fetchClient";
 
 interface Candidate {
   id: string;
@@ -40,7 +40,7 @@ export function AllCandidates() {
     const fetchCandidates = async () => {
       setLoading(true);
       try {
-        const data = await apiFetch("/api/recruiter/candidates/candidates");
+        const data = await apiFetchAll("/api/recruiter/candidates/candidates", "candidates");
 
         const mappedCandidates = (data.candidates || []).map((c: any) => ({
           id: c.id,
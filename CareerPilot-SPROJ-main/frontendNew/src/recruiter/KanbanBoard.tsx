@@ -2,7 +2,7 @@ import { useState, useEffect } from "react";
 import { Badge } from "../components/ui/badge";
 import { Button } from "../components/ui/button";
 import { Eye } from "lucide-react";
-import { apiFetch } from "../api/fetchClient";
+import { apiFetchAll } from "../api/fetchClient";
 
 interface Candidate {
   id: string;
@@ -33,7 +33,7 @@ export function KanbanBoard({ jobId }: KanbanBoardProps) {
 
     const fetchCandidates = async () => {
       try {
-        const data = await apiFetch(`/api/jobs/${jobId}/candidates`);
+        const data = await apiFetchAll(`/api/jobs/${jobId}/candidates`, "candidates");
         setCandidates(data.candidates || []);
       } catch (err) {
         console.error("Failed to fetch candidates:", err);